@@ -35,7 +35,7 @@ echo.
 
 :: === Step 6: Build project ===
 echo [INFO] Building the project...
-python -m build
+python -m build --no-isolation
 if %errorlevel% neq 0 (
     echo [ERROR] Build failed!
     exit /b %errorlevel%
@@ -0,0 +1,10 @@
+"""
+demo 公共启动模块：在导入时将项目根目录注册到 sys.path（仅执行一次）
+"""
+import site
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+site.addsitedir(str(PROJECT_ROOT))
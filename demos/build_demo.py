@@ -1,11 +1,12 @@
-import subprocess
+import runpy
+import sys
 from pathlib import Path
 
 LOCAL_DIR = Path(__file__).parent
 
 
 if __name__ == "__main__":
-    # Execute in cmd
-    command = ["python", str(LOCAL_DIR.joinpath("build_demo_exec.py")), "build_ext", "--inplace"]
-    process = subprocess.Popen(command)
-    process.wait()
+    # Execute build script inside current interpreter instead of spawning a new python process
+    script = str(LOCAL_DIR.joinpath("build_demo_exec.py"))
+    sys.argv = [script, "build_ext", "--inplace"]
+    runpy.run_path(script, run_name="__main__")
@@ -1,9 +1,4 @@
-from pathlib import Path
-import sys
-
-sys.path.append(str(Path(__file__).parent.parent))
-
-
+import _bootstrap  # noqa: F401
 
 from logixbase.compiler import BuildProject
 
@@ -1,13 +1,27 @@
 import time
 import random
-from pathlib import Path
-import sys
 
-sys.path.append(str(Path(__file__).parent.parent))
+import numpy as np
+
+import _bootstrap  # noqa: F401
 
 from logixbase.executor import MultiTaskExecutor
 from logixbase.logger import LogManager
 
+
+# 各模式下的常驻执行器：多次运行demo时复用同一进程池，避免重复创建进程
+_EXECUTORS = {}
+
+
+def get_executor(mode):
+    if mode not in _EXECUTORS:
+        kwargs = {"maxtasksperchild": None} if mode == "pool" else {}
+        _EXECUTORS[mode] = MultiTaskExecutor(mode=mode, **kwargs)
+    executor = _EXECUTORS[mode]
+    executor.reset()
+    return executor
+
+
 # 示例函数（测试：参数组合、异常、内存返回）
 def example_task(x, y, delay=0.1, logger=None):
     time.sleep(delay + random.uniform(0, 0.3))
@@ -18,6 +32,11 @@ def example_task(x, y, delay=0.1, logger=None):
     return {"input": (x, y), "output": output, "memory_usage": random.uniform(10, 50)}
 
 
+# 向量化示例函数：一次处理一整个参数分块
+def example_task_vec(xs, ys, logger=None):
+    return np.asarray(xs) ** 2 + np.asarray(ys)
+
+
 def generate_param_combinations():
     param_set = []
     for x in range(-1, 5):     # 包含一个错误任务（x = -1）
@@ -32,12 +51,12 @@ def run_executor_demo(mode='process'):
     loger = LogManager.get_instance(use_mp=True if mode in ("process", "pool") else False,
                                     log_path=r'd:\logs')
 
-    executor = MultiTaskExecutor(mode=mode)
+    executor = get_executor(mode)
     executor.bind_share(logger=loger)
 
-    # 多任务组合参数测试
-    for x, y in generate_param_combinations():
-        executor.submit(example_task, x, y, delay=0.1, group='combi', tags=[f"x={x}", f"y={y}"], task_name=f"task_{x}_{y}")
+    # 多任务组合参数测试：一次性批量提交所有参数组合，任务名称与标签按每组参数生成
+    executor.submit_many(example_task, generate_param_combinations(), delay=0.1, group='combi',
+                         tags=lambda x, y: [f"x={x}", f"y={y}"], task_name=lambda x, y: f"task_{x}_{y}")
 
     # 执行任务
     executor.start()
@@ -61,7 +80,19 @@ def run_executor_demo(mode='process'):
     executor.cancel_task(any_id)
     executor.rerun_cancelled()
 
+def run_vectorized_demo(mode='process'):
+    print(f"\n==== Running {mode.upper()} mode vectorized demo ====")
+    executor = get_executor(mode)
+
+    # 全部参数组合按工作进程数分块，每个分块只发生一次任务调度
+    xs, ys = map(np.array, zip(*generate_param_combinations()))
+    outputs = executor.map_numpy(example_task_vec, xs, ys, group='vec')
+    for x, y, output in zip(xs, ys, outputs):
+        print(f"Task input: x={x}, y={y} -> output={output}")
+
+
 if __name__ == "__main__":
     run_executor_demo('thread')
     # run_executor_demo('pool')
     # run_executor_demo('process')
+    # run_vectorized_demo('process')
@@ -1,15 +1,22 @@
 import multiprocessing
-import time
+import signal
+import threading
 from pathlib import Path
-import sys
 
-sys.path.append(str(Path(__file__).parent.parent.joinpath('logixbase')))
+import _bootstrap  # noqa: F401
 
-from configer.loader import ConfigLoader
-from configer.schema import AppConfig  # 假设你已经在 schema.py 中定义好 AppConfig 结构
+from logixbase.configer.loader import ConfigLoader
+from logixbase.configer.schema import AppConfig  # 假设你已经在 schema.py 中定义好 AppConfig 结构
 
 CONFIG_PATH = Path(".\configs")  # 所有配置文件目录，需自行准备
 
+
+def wait_for_interrupt():
+    """阻塞当前进程直至收到 Ctrl+C (SIGINT)，等待期间不占用CPU"""
+    interrupted = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: interrupted.set())
+    interrupted.wait()
+
 def test_1_load_single_path_all_formats():
     print("\n--- Test 1: 加载多格式文件（无热更新） ---")
     loader = ConfigLoader(CONFIG_PATH)
@@ -48,20 +55,16 @@ def test_4_single_proc_hot_reload():
 
     loader.register_callback(on_change)
 
-    try:
-        while True:
-            time.sleep(2)
-    except KeyboardInterrupt:
-        loader.stop()
-        print("已停止热更新")
+    wait_for_interrupt()
+    loader.stop()
+    print("已停止热更新")
 
 def worker_proc(loader: ConfigLoader):
     def on_child_update():
         print(f"[子进程] 配置已更新：当前SMTP = {loader.config.mail.host}")
     loader.register_mp_proxy()
     loader.register_proxy_callback(on_child_update)
-    while True:
-        time.sleep(2)
+    wait_for_interrupt()
 
 def test_5_multi_proc_hot_reload():
     print("\n--- Test 5: 多进程热更新测试（请手动修改配置文件观察） ---")
@@ -79,16 +82,13 @@ def test_5_multi_proc_hot_reload():
         print("[主进程] 配置已更新：当前数据库地址 =", loader.config.database.host)
 
     loader.register_callback(on_main_update)
-    loader.start(CONFIG_PATH)
-
-    try:
-        while True:
-            time.sleep(2)
-    except KeyboardInterrupt:
-        for p in processes:
-            p.terminate()
-        loader.stop()
-        print("已终止所有子进程与热更新")
+    loader.start()
+
+    wait_for_interrupt()
+    for p in processes:
+        p.terminate()
+    loader.stop()
+    print("已终止所有子进程与热更新")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,6 @@
 import time
-import sys
-from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401
 
 from logixbase.logger import LogManager
 from logixbase.executor import Coordinator
@@ -23,11 +21,12 @@ def hybrid_task(prefix, from_upstream, logger=None):
 def loop_task(name, req_queue=None, pub_queue=None, stop_event=None, logger=None):
     """Loop 模式任务：持续监听 req_queue 并将处理结果推入 pub_queue。"""
     logger.INFO(f"[LOOP] {name} listening...")
-    while not stop_event.is_set():
+    while True:
         try:
+            # 阻塞等待上游数据，Coordinator.stop() 会推送 None 作为结束信号
             upstream = req_queue.get()
             if upstream is None:
-                continue
+                break
 
             logger.INFO(f"[LOOP] {name} got {upstream}")
             pub_queue.put(f"{name}-{upstream}")
@@ -1,8 +1,6 @@
-import sys
-from pathlib import Path
-from multiprocessing import Queue
+import queue
 
-sys.path.append(str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401
 
 from logixbase.gateway import ctp
 from logixbase.logger import LogManager
@@ -13,12 +11,15 @@ class Test:
 
     def __init__(self):
         super().__init__()
-        self.q = Queue()
+        # 行情回调与消费方同进程，使用单槽线程队列即可，无需跨进程管道与feeder线程
+        self.q = queue.Queue(maxsize=1)
 
     def on_tick(self, tick):
-        """"""
-        if self.q.empty():
-            self.q.put(tick)
+        """仅保留第一笔tick：队列已满时直接丢弃，避免 empty()/put() 之间的竞态"""
+        try:
+            self.q.put_nowait(tick)
+        except queue.Full:
+            pass
 
 
 if __name__ == "__main__":
@@ -36,8 +37,11 @@ if __name__ == "__main__":
     # tick = spi.qry_depth_market_data("rb2410")
     # td_code = spi.qry_trading_code("SHFE")
 
-    if not callback.q.empty():
-        tick = callback.q.get()
+    # 阻塞等待首笔行情推送，超时未收到则放弃
+    try:
+        tick = callback.q.get(timeout=5)
+    except queue.Empty:
+        tick = None
 
     # self = ctp.CtpTickClean()
     # for k, v in info.items():
@@ -1,6 +1,6 @@
-import sys
 import pandas as pd
-sys.path.append(r'D:\licx\codes\logixbase')
+
+import _bootstrap  # noqa: F401
 
 from logixbase.feeder import TinysoftFeeder, TinysoftConfig, TQSDKConfig
 from logixbase.configer import load_schema, read_config
@@ -54,10 +54,13 @@ def sql_demo():
     self.asset_info("future", "TRADE", ticker=["CFFEX.IF.2505", "CZCE.MA.HOT", "SHFE.rb"], use_schema=True)
     # info = self.asset_info("future", "basic", use_schema=True)
     # info = self.asset_info("future", "basic", product=["CFFEX.IF"], use_schema=True)
-    info = self.asset_info("future", "basic", ticker=["CFFEX.IF.2505", "CZCE.MA.HOT", "SHFE.rb"], use_schema=True)
-    info = self.asset_info("stock", "basic", ticker=['SSE.SH600520', 'SZSE.002520', 'SSE.STK.603009'], use_schema=True)
-    info = self.asset_info("etf", "basic", ticker=['SSE.ETF.159001', 'SZSE.ETF.510050'], use_schema=True)
-    info = self.asset_info("index", "basic", ticker=["SSE.IDX.SH000001", "SZSE.IDX.SZ399001"], use_schema=True)
+    # 批量查询：同类资产信息的多组请求合并为一次查询
+    future_info, stock_info, etf_info, index_info = self.asset_info_many([
+        ("future", "basic", ["CFFEX.IF.2505", "CZCE.MA.HOT", "SHFE.rb"]),
+        ("stock", "basic", ['SSE.SH600520', 'SZSE.002520', 'SSE.STK.603009']),
+        ("etf", "basic", ['SSE.ETF.159001', 'SZSE.ETF.510050']),
+        ("index", "basic", ["SSE.IDX.SH000001", "SZSE.IDX.SZ399001"]),
+    ], use_schema=True)
 
     # self.asset_main_ticker("future", "2025-04-01", "2025-04-10")
     # self.asset_main_ticker("future", "2025-04-01", "2025-04-10", ['CFFEX.IF.2505', 'CZCE.MA.HOT', 'SHFE.rb.00', 'DCE.i'])
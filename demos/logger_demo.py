@@ -1,13 +1,16 @@
 import time
-import threading
 import multiprocessing
-import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 
-sys.path.append(str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401
 # 导入 Logger 模块
-from logixbase.logger import LogManager, auto_log
+from logixbase.logger import LogManager, auto_log, INFO, DEBUG
+
+LOG_PATH = r'd:\logs'
+
+# 演示用常驻线程池：多次调用时复用线程，避免反复创建
+_DEMO_POOL = ThreadPoolExecutor(max_workers=8)
 
 # ---------------------------
 # 示例：使用装饰器自动记录函数执行日志
@@ -27,12 +30,11 @@ def sample_function(x, y):
 # ---------------------------
 def demo_single_thread_logging():
     """演示在单线程环境下记录日志"""
-    logger = LogManager.get_instance(use_mp=False, log_path=r'd:\logs')
-    logger.INFO("【Single Thread Demo】开始单线程日志记录。")
+    INFO("【Single Thread Demo】开始单线程日志记录。")
     for i in range(3):
-        logger.DEBUG(f"单线程记录调试信息 {i}")
+        DEBUG(f"单线程记录调试信息 {i}")
         time.sleep(0.3)
-    logger.INFO("【Single Thread Demo】单线程日志记录结束。")
+    INFO("【Single Thread Demo】单线程日志记录结束。")
 
 
 # ---------------------------
@@ -40,20 +42,16 @@ def demo_single_thread_logging():
 # ---------------------------
 def demo_multithread_logging():
     """演示在多线程环境下记录日志"""
-    logger = LogManager.get_instance(use_mp=False, log_path=r'd:\logs')
-    logger.INFO("【Multithread Demo】开始多线程日志记录。")
+    INFO("【Multithread Demo】开始多线程日志记录。")
 
     def worker(thread_id):
+        debug = DEBUG
         for i in range(3):
-            logger.DEBUG(f"线程 {thread_id} 记录调试信息 {i}")
+            debug(f"线程 {thread_id} 记录调试信息 {i}")
             time.sleep(0.3)
 
-    threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
-    logger.INFO("【Multithread Demo】多线程日志记录结束。")
+    list(_DEMO_POOL.map(worker, range(3)))
+    INFO("【Multithread Demo】多线程日志记录结束。")
 
 
 # ---------------------------
@@ -61,19 +59,20 @@ def demo_multithread_logging():
 # ---------------------------
 def process_worker(logger, proc_id):
     """模拟多进程日志记录"""
+    info = logger.INFO
     for i in range(3):
         # 将日志消息放入共享队列，由主进程统一写入日志
-        logger.INFO(f"[子进程 {proc_id}] 记录日志消息 {i}")
+        info(f"[子进程 {proc_id}] 记录日志消息 {i}")
         time.sleep(0.3)
 
 
 class MultiprocessLogger:
-    def __init__(self, use_mp=True):
-        # 每次初始化时都动态创建 LogManager 实例，确保 use_mp 参数正确
-        self.logger = LogManager.get_instance(use_mp=use_mp, log_path=r'd:\logs')
+    def __init__(self):
+        # 复用入口处已初始化的 LogManager 单例
+        self.logger = LogManager.get_instance()
 
         # 确保只有在多进程模式下才尝试访问 mp_queue
-        if self.logger.use_mp:
+        if self.logger.config.multiprocess:
             self.shared_queue = self.logger.log_writer.log_queue  # 获取共享队列
         else:
             self.shared_queue = None
@@ -107,34 +106,33 @@ class MultiprocessLogger:
 # ---------------------------
 def demo_logger_usage(use_mp=False):
     """综合演示 Logger 的常用用法，包括直接日志调用、装饰器、以及多线程、多进程场景"""
+    # 仅在入口处初始化一次日志管理器，其余位置直接复用单例
+    logger = LogManager.get_instance({"log_path": LOG_PATH, "multiprocess": use_mp})
     if use_mp:
         # 多进程模式
         print("\n执行多进程版本的日志记录...")
-        mp_logger = MultiprocessLogger(use_mp=True)
+        mp_logger = MultiprocessLogger()
         mp_logger.demo_multiprocess_logging()
     else:
         # 单进程模式
         print("\n执行单进程版本的日志记录...")
         # 单线程模式
-        logger_single_thread = LogManager.get_instance(use_mp=False, log_path=r'd:\logs')
-        logger_single_thread.INFO("【Single Thread Demo】开始演示单线程日志记录。")
+        INFO("【Single Thread Demo】开始演示单线程日志记录。")
         demo_single_thread_logging()
 
         # 多线程模式
-        logger_multithread = LogManager.get_instance(use_mp=False, log_path=r'd:\logs')
-        logger_multithread.INFO("【Multithread Demo】开始演示多线程日志记录。")
+        INFO("【Multithread Demo】开始演示多线程日志记录。")
         demo_multithread_logging()
 
         # 演示装饰器：调用被 @auto_log 装饰的 sample_function
         result = sample_function(5, 7)
-        LogManager.get_instance().INFO(f"sample_function(5, 7) 返回结果：{result}")
+        INFO(f"sample_function(5, 7) 返回结果：{result}")
 
     # 等待一段时间确保所有异步日志都写入（可根据实际情况调整时间）
     time.sleep(5)
-    LogManager.get_instance().stop()
+    logger.stop()
     print("Logger demo 执行完毕，日志已写入至日志目录。")
-    log_path = LogManager.get_instance().config.get("log_path", "./logs")
-    print(f"请查看日志文件（目录：{log_path}）以验证输出。")
+    print(f"请查看日志文件（目录：{logger.config.log_path}）以验证输出。")
 
 
 # ---------------------------
@@ -1,29 +1,36 @@
 import time
 import threading
-import sys
+from collections import deque
 from pathlib import Path
+from typing import ClassVar
 
-sys.path.append(str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401
 from logixbase.engine import BaseEngine, ProcessManager, BaseComponent
 from logixbase.plugin.log_monitor import LogMonitorPlugin
 from logixbase.plugin.progress import ProgressPlugin
 from logixbase.logger import LogManager
 
 
+# 引擎配置文件路径，模块导入时解析一次
+_CONFIG_PATH = str(Path(__file__).resolve().parent / "configs" / "logixbase.yaml")
+
+
 class DataCollectionComponent(BaseComponent):
     """数据采集组件"""
     
-    def __init__(self, component_id, data_source, interval=1, **kwargs):
+    def __init__(self, component_id, data_source, interval=1, max_items=10_000, **kwargs):
         super().__init__(component_id, **kwargs)
         self.data_source = data_source
         self.interval = interval
-        self.data = []
-        self._running = False
+        # 仅保留最近 max_items 条数据，长时间采集时内存占用保持恒定
+        self.data = deque(maxlen=max_items)
+        self.total_count = 0
+        self._stop_event = threading.Event()
         self._thread = None
         
     def _execute(self):
         """执行数据采集"""
-        self._running = True
+        self._stop_event.clear()
         self._thread = threading.Thread(target=self._collection_task)
         self._thread.daemon = True
         self._thread.start()
@@ -33,20 +40,22 @@ class DataCollectionComponent(BaseComponent):
         self.logger.INFO(f"Starting data collection from {self.data_source}")
         
         counter = 0
-        while self._running:
+        while not self._stop_event.is_set():
             # 模拟数据采集
             counter += 1
             data_item = f"Data {counter} from {self.data_source} at {time.time()}"
             self.data.append(data_item)
+            self.total_count = counter
             
             if self.logger and counter % 10 == 0:
-                self.logger.INFO(f"Collected {len(self.data)} items from {self.data_source}")
+                self.logger.INFO(f"Collected {counter} items from {self.data_source}")
                 
-            time.sleep(self.interval)
+            # 以事件等待代替sleep：停止时立即唤醒退出
+            self._stop_event.wait(timeout=self.interval)
             
     def _stop_execution(self):
         """停止数据采集"""
-        self._running = False
+        self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=2)
         self.logger.INFO(f"Stopped data collection from {self.data_source}")
@@ -56,19 +65,20 @@ class DataCollectionComponent(BaseComponent):
         status = super().get_status()
         status.update({
             "data_source": self.data_source,
-            "data_count": len(self.data),
-            "running": self._running
+            "data_count": self.total_count,
+            "latest_data": self.data[-1] if self.data else None,
+            "running": not self._stop_event.is_set()
         })
         return status
 
 
 class DataEngine(BaseEngine):
     """数据引擎"""
+    CONFIG_PATH: ClassVar[str] = _CONFIG_PATH
     
     def __init__(self):
         """初始化DataEngine，指定配置文件路径"""
-        config_path = Path(__file__).parent / "configs" / "logixbase.yaml"
-        super().__init__(config_path=str(config_path))
+        super().__init__(config_path=self.CONFIG_PATH)
     
     def on_init(self):
         """初始化引擎"""
@@ -96,11 +106,12 @@ class DataEngine(BaseEngine):
 
 class AnalysisEngine(BaseEngine):
     """分析引擎"""
+    CONFIG_PATH: ClassVar[str] = _CONFIG_PATH
     
     def __init__(self):
         """初始化AnalysisEngine，指定配置文件路径"""
-        config_path = Path(__file__).parent / "configs" / "logixbase.yaml"
-        super().__init__(config_path=str(config_path))
+        super().__init__(config_path=self.CONFIG_PATH)
+        self._stop_event = threading.Event()
     
     def on_init(self):
         """初始化引擎"""
@@ -124,10 +135,17 @@ class AnalysisEngine(BaseEngine):
         if progress_plugin:
             for i in range(1, 101):
                 progress_plugin.update_progress("analysis", current=i, message=f"Analyzing data step {i}")
-                time.sleep(0.1)
+                if self._stop_event.wait(timeout=0.1):
+                    self.logger.INFO("AnalysisEngine analysis interrupted")
+                    return
                 
         self.logger.INFO("AnalysisEngine analysis completed")
 
+    def on_stop(self):
+        """停止引擎：由 ProcessManager.stop 调用时唤醒仍在运行的分析循环，随后执行常规收尾"""
+        self._stop_event.set()
+        super().on_stop()
+
 
 def main():
     """主函数"""
@@ -158,16 +176,18 @@ def main():
     for component_id, status in manager.get_component_status("data").items():
         print(f"{component_id}: {status}")
     
-    # 启动分析引擎
+    # 启动分析引擎：ProcessManager.start 会阻塞至 on_start 返回，在后台线程中运行以便随后中断分析
     print("\nStarting analysis engine...")
-    manager.start("analysis")
+    analysis_thread = threading.Thread(target=manager.start, args=("analysis",), daemon=True)
+    analysis_thread.start()
     
     # 等待分析完成
     time.sleep(2)
     
-    # 停止所有引擎
+    # 停止所有引擎：AnalysisEngine.on_stop 设置停止事件，正在等待中的分析循环立即退出
     print("\nStopping all engines...")
     manager.stop_all()
+    analysis_thread.join()
     
     print("\nFinal status of all engines:")
     print(manager.get_status())
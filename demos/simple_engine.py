@@ -1,8 +1,8 @@
 import time
-import sys
 from pathlib import Path
+from typing import ClassVar
 
-sys.path.append(str(Path(__file__).parent.parent))
+import _bootstrap  # noqa: F401
 
 from logixbase.engine import BaseEngine, BaseComponent
 from logixbase.plugin.log_monitor import LogMonitorPlugin
@@ -10,6 +10,10 @@ from logixbase.plugin.progress import ProgressPlugin
 from logixbase.logger import LogManager
 
 
+# 引擎配置文件路径，模块导入时解析一次
+_CONFIG_PATH = str(Path(__file__).resolve().parent / "configs" / "logixbase.yaml")
+
+
 class SimpleDataComponent(BaseComponent):
     """简单的数据组件示例"""
     
@@ -46,11 +50,11 @@ class SimpleDataComponent(BaseComponent):
 
 class SimpleEngine(BaseEngine):
     """简单的引擎示例"""
+    CONFIG_PATH: ClassVar[str] = _CONFIG_PATH
     
     def __init__(self):
         """初始化SimpleEngine，指定配置文件路径"""
-        config_path = Path(__file__).parent / "configs" / "logixbase.yaml"
-        super().__init__(config_path=str(config_path))
+        super().__init__(config_path=self.CONFIG_PATH)
     
     def on_init(self):
         """初始化引擎"""
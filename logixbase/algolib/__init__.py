@@ -54,19 +54,20 @@ weights = min_variance(returns)
 """
 # 从basestat导入函数
 from .basestat import (
-    corr, corr_adj, cov, rank_corr, skew, sorted_rank,
+    corr, corr_adj, corr_zeromean, corr_matrix, corr_cross, cov, rank_corr, skew, sorted_rank,
     outlier_iqr, outlier_sig, eu_distance, cosine,
-    approximate_entropy, min_max, uniform_weighting, corr_prob
+    approximate_entropy, min_max, min_max_inplace, uniform_weighting, corr_prob
 )
 
 # 导入其他模块的函数和类
 from .chart import ChartWizard
-from .fin import info_increment
-from .matops import splmtset, array_shift, inverse_matrix
+from .fin import info_increment, info_increment_batch
+from .matops import splmtset, array_shift, array_shift_view, inverse_matrix
 from .optimization import (
     min_variance, max_sharpe, risk_parity, equal_weight,
     equal_risk_contribution, max_diversification, mean_cvar,
-    black_litterman, hierarchical_risk_parity
+    black_litterman, hierarchical_risk_parity, RollingCov,
+    min_variance_batch, risk_parity_batch
 )
 from .regression import (
     regress, regress_nointercept, regress_full,
@@ -87,22 +88,27 @@ from .timeseries import (
 )
 from .utils import cumsum, normal_pdf, digit_num
 
+# 存在预编译扩展（_algolib_native）时，以AOT版本替换对应的jit函数
+from ._algolib_aot import load_native
+globals().update(load_native())
+
 # 定义__all__变量
 __all__ = [
     # basestat
-    'corr', 'corr_adj', 'cov', 'rank_corr', 'skew', 'sorted_rank',
+    'corr', 'corr_adj', 'corr_zeromean', 'corr_matrix', 'corr_cross', 'cov', 'rank_corr', 'skew', 'sorted_rank',
     'outlier_iqr', 'outlier_sig', 'eu_distance', 'cosine',
-    'approximate_entropy', 'min_max', 'uniform_weighting', 'corr_prob',
+    'approximate_entropy', 'min_max', 'min_max_inplace', 'uniform_weighting', 'corr_prob',
     # chart
     'ChartWizard',
     # fin
-    'info_increment',
+    'info_increment', 'info_increment_batch',
     # matops
-    'splmtset', 'array_shift', 'inverse_matrix',
+    'splmtset', 'array_shift', 'array_shift_view', 'inverse_matrix',
     # optimization
     'min_variance', 'max_sharpe', 'risk_parity', 'equal_weight',
     'equal_risk_contribution', 'max_diversification', 'mean_cvar',
-    'black_litterman', 'hierarchical_risk_parity',
+    'black_litterman', 'hierarchical_risk_parity', 'RollingCov',
+    'min_variance_batch', 'risk_parity_batch',
     # regression
     'regress', 'regress_nointercept', 'regress_full',
     'r_square', 'f_stat', 'f_pvalue', 'mse', 'ivxlh',
@@ -0,0 +1,95 @@
+# AOT编译模块
+"""
+本模块负责algolib数值内核的预编译（AOT）与加载。
+1. build_cc: 基于 numba.pycc 按固定签名将内核编译为扩展模块 _algolib_native，在打包（build_ext）时执行
+2. load_native: 导入预编译扩展，返回以原生版本替换jit版本的函数映射；扩展不存在时返回空字典
+
+预编译函数仅在参数完全符合签名（float64数组、完整参数）时调用，其他输入自动退回jit版本。
+jit内核之间的相互调用不受影响，仍使用jit版本。
+
+手动编译：python -m logixbase.algolib._algolib_aot
+"""
+import functools
+import importlib
+import inspect
+import numpy as np
+
+from . import basestat, matops, regression
+
+
+NATIVE_MODULE = "_algolib_native"
+
+# 导出函数、编译签名及前置数组参数的维度
+EXPORTS = {
+    "corr": (basestat.corr, "f8(f8[:], f8[:])", (1, 1)),
+    "corr_adj": (basestat.corr_adj, "f8(f8[:], f8[:], f8, f8)", (1, 1)),
+    "corr_zeromean": (basestat.corr_zeromean, "f8(f8[:], f8[:])", (1, 1)),
+    "cov": (basestat.cov, "f8(f8[:], f8[:])", (1, 1)),
+    "rank_corr": (basestat.rank_corr, "f8(f8[:], f8[:])", (1, 1)),
+    "skew": (basestat.skew, "f8(f8[:])", (1,)),
+    "sorted_rank": (basestat.sorted_rank, "f8[:](f8[:], b1)", (1,)),
+    "outlier_iqr": (basestat.outlier_iqr, "UniTuple(f8, 2)(f8[:])", (1,)),
+    "outlier_sig": (basestat.outlier_sig, "UniTuple(f8, 2)(f8[:])", (1,)),
+    "eu_distance": (basestat.eu_distance, "f8(f8[:], f8[:])", (1, 1)),
+    "cosine": (basestat.cosine, "f8(f8[:], f8[:])", (1, 1)),
+    "min_max": (basestat.min_max, "f8[:](f8[:], f8, f8)", (1,)),
+    "uniform_weighting": (basestat.uniform_weighting, "f8[:](f8[:])", (1,)),
+    "corr_prob": (basestat.corr_prob, "f8(f8[:], f8[:], f8, f8)", (1, 1)),
+    "array_shift": (matops.array_shift, "f8[:](f8[:], i8)", (1,)),
+    "regress": (regression.regress, "Tuple((f8, f8, f8[:]))(f8[:], f8[:])", (1, 1)),
+    "regress_nointercept": (regression.regress_nointercept, "Tuple((f8, f8[:]))(f8[:], f8[:])", (1, 1)),
+    "regress_full": (regression.regress_full, "Tuple((UniTuple(f8, 2), UniTuple(f8, 2)))(f8[:], f8[:])", (1, 1)),
+    "r_square": (regression.r_square, "f8(f8[:], f8[:])", (1, 1)),
+    "f_stat": (regression.f_stat, "f8(f8[:], f8[:], i8)", (1, 1)),
+    "mse": (regression.mse, "f8(f8[:], f8[:])", (1, 1)),
+}
+
+
+def build_cc():
+    """
+    创建包含全部导出内核的 numba.pycc.CC 编译对象
+
+    Returns:
+        numba.pycc.CC: 编译对象，可调用 compile() 直接编译，或通过 distutils_extension() 接入 setup.py
+    """
+    from numba.pycc import CC
+
+    # 默认输出至本模块所在目录（logixbase/algolib）
+    cc = CC(NATIVE_MODULE)
+    for name, (func, signature, _) in EXPORTS.items():
+        cc.export(name, signature)(func.py_func)
+    return cc
+
+
+def _with_fallback(native, jitted, ndims: tuple):
+    """
+    优先调用预编译版本，参数不符合编译签名时退回jit版本。
+    预编译函数不会校验数组的dtype（int64数组会被按float64解释），因此需在调用前显式检查。
+    """
+    nargs = len(inspect.signature(jitted.py_func).parameters)
+
+    def func(*args, **kwargs):
+        if not kwargs and len(args) == nargs and all(type(arr) is np.ndarray and arr.dtype == np.float64 and arr.ndim == nd
+                                      for arr, nd in zip(args, ndims)):
+            return native(*args)
+        return jitted(*args, **kwargs)
+    return functools.update_wrapper(func, jitted.py_func)
+
+
+def load_native() -> dict:
+    """
+    加载预编译扩展
+
+    Returns:
+        dict: 函数名 -> 优先使用预编译版本的函数；扩展不存在时为空字典
+    """
+    try:
+        native = importlib.import_module(f".{NATIVE_MODULE}", __package__)
+    except ImportError:
+        return {}
+    return {name: _with_fallback(getattr(native, name), func, ndims)
+            for name, (func, _, ndims) in EXPORTS.items() if hasattr(native, name)}
+
+
+if __name__ == "__main__":
+    build_cc().compile()
@@ -11,10 +11,13 @@
 这些函数可以帮助进行基本的统计分析，计算各种统计量，并评估数据之间的关系。
 """
 import numpy as np
-from numba import njit
+from numba import njit, prange
+from scipy.spatial import cKDTree
 
+from .utils import _REDUCE_FASTMATH
 
-@njit
+
+@njit(cache=True)
 def corr(x, y):
     """
     计算两个数组之间的皮尔逊相关系数。
@@ -27,21 +30,23 @@ def corr(x, y):
         float: 皮尔逊相关系数。
 
     """
-    mu_x = np.nanmean(x)
-    mu_y = np.nanmean(y)
-    x_ = x - mu_x
-    y_ = y - mu_y
-    sum_x_2 = np.nansum(x_ ** 2)
-    sum_y_2 = np.nansum(y_ ** 2)
-    sum_x_y = np.nansum(x_ * y_)
-    divisor = np.sqrt(sum_x_2 * sum_y_2)
-    if divisor == 0:
+    # 第一遍：各自非NaN元素的均值
+    n = x.shape[0]
+    sum_x, sum_y = 0., 0.
+    n_x, n_y = 0, 0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            sum_x += x[i]
+            n_x += 1
+        if not np.isnan(y[i]):
+            sum_y += y[i]
+            n_y += 1
+    if n_x == 0 or n_y == 0:
         return np.nan
-    else:
-        return sum_x_y / divisor
+    return corr_adj(x, y, sum_x / n_x, sum_y / n_y)
 
 
-@njit
+@njit(cache=True)
 def corr_adj(x, y, mu_x, mu_y):
     """
     计算x和y在给定均值假设下的皮尔逊相关系数
@@ -56,12 +61,50 @@ def corr_adj(x, y, mu_x, mu_y):
         float: 调整后的相关系数
 
     """
-    x_ = x - mu_x
-    y_ = y - mu_y
+    # 单遍累加离差平方和及交叉积（跳过NaN），不构造中间数组
+    sum_x_2, sum_y_2, sum_x_y = 0., 0., 0.
+    for i in range(x.shape[0]):
+        dx = x[i] - mu_x
+        dy = y[i] - mu_y
+        x_valid = not np.isnan(dx)
+        y_valid = not np.isnan(dy)
+        if x_valid:
+            sum_x_2 += dx * dx
+        if y_valid:
+            sum_y_2 += dy * dy
+        if x_valid and y_valid:
+            sum_x_y += dx * dy
+
+    divisor = np.sqrt(sum_x_2 * sum_y_2)
+    if divisor == 0:
+        return np.nan
+    else:
+        return sum_x_y / divisor
 
-    sum_x_2 = np.nansum(x_ ** 2)
-    sum_y_2 = np.nansum(y_ ** 2)
-    sum_x_y = np.nansum(x_ * y_)
+
+@njit(fastmath=_REDUCE_FASTMATH, cache=True)
+def corr_zeromean(x, y):
+    """
+    均值已知为0（如去均值收益率）时的皮尔逊相关系数，等价于corr_adj(x, y, 0, 0)，省去中心化运算。
+
+    Args:
+        x (numpy.ndarray): 数组x
+        y (numpy.ndarray): 数组y
+
+    Returns:
+        float: 相关系数
+
+    """
+    # 单遍累加平方和及交叉积（跳过NaN），以条件选择代替分支以便向量化
+    sum_x_2, sum_y_2, sum_x_y = 0., 0., 0.
+    for i in range(x.shape[0]):
+        xi = x[i]
+        yi = y[i]
+        x_valid = xi == xi
+        y_valid = yi == yi
+        sum_x_2 += xi * xi if x_valid else 0.
+        sum_y_2 += yi * yi if y_valid else 0.
+        sum_x_y += xi * yi if x_valid and y_valid else 0.
 
     divisor = np.sqrt(sum_x_2 * sum_y_2)
     if divisor == 0:
@@ -70,7 +113,80 @@ def corr_adj(x, y, mu_x, mu_y):
         return sum_x_y / divisor
 
 
-@njit
+def corr_matrix(X: np.ndarray) -> np.ndarray:
+    """
+    计算矩阵各列两两之间的皮尔逊相关系数矩阵，等价于对每对列调用corr，但以一次矩阵乘法完成。
+
+    Args:
+        X (numpy.ndarray): 数据矩阵，形状为(样本数, 变量数)
+
+    Returns:
+        numpy.ndarray: 相关系数矩阵，形状为(变量数, 变量数)；标准差为0的列对应结果为NaN
+
+    Notes:
+        含NaN时按成对完整样本（pairwise complete）计算，与pandas.DataFrame.corr一致。
+    """
+    return corr_cross(X, X)
+
+
+def corr_cross(X: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """
+    计算矩阵X各列与矩阵Y各列之间的皮尔逊相关系数。
+
+    Args:
+        X (numpy.ndarray): 数据矩阵，形状为(样本数, 变量数p)
+        Y (numpy.ndarray): 数据矩阵，形状为(样本数, 变量数q)
+
+    Returns:
+        numpy.ndarray: 相关系数矩阵，形状为(p, q)；标准差为0的列对应结果为NaN
+
+    Raises:
+        ValueError: X与Y样本数不一致
+
+    Notes:
+        含NaN时按成对完整样本（pairwise complete）计算，与pandas.DataFrame.corr一致。
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[:, None]
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    if X.shape[0] != Y.shape[0]:
+        raise ValueError(f"样本数不一致: {X.shape[0]} != {Y.shape[0]}")
+
+    mask_x = np.isnan(X)
+    mask_y = np.isnan(Y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if not (mask_x.any() or mask_y.any()):
+            xc = X - X.mean(axis=0)
+            yc = Y - Y.mean(axis=0)
+            c = np.einsum("ij,ik->jk", xc, yc, optimize=True)
+            std_x = np.sqrt(np.einsum("ij,ij->j", xc, xc))
+            std_y = np.sqrt(np.einsum("ij,ij->j", yc, yc))
+            return c / (std_x[:, None] * std_y[None, :])
+
+        # 先按各列自身均值中心化以避免大数相消，再对成对有效样本用矩估计得到中心化统计量
+        valid_x = (~mask_x).astype(np.float64)
+        valid_y = (~mask_y).astype(np.float64)
+        xc = np.where(mask_x, 0., X - np.nanmean(X, axis=0))
+        yc = np.where(mask_y, 0., Y - np.nanmean(Y, axis=0))
+
+        n = valid_x.T @ valid_y
+        sum_x = xc.T @ valid_y
+        sum_y = valid_x.T @ yc
+        sum_xx = (xc * xc).T @ valid_y
+        sum_yy = valid_x.T @ (yc * yc)
+        sum_xy = xc.T @ yc
+
+        c = sum_xy - sum_x * sum_y / n
+        var_x = sum_xx - sum_x * sum_x / n
+        var_y = sum_yy - sum_y * sum_y / n
+        divisor = np.sqrt(var_x * var_y)
+        return np.where(divisor > 0, c / divisor, np.nan)
+
+
+@njit(cache=True)
 def cov(x, y):
     """
     计算x和y之间的协方差
@@ -83,15 +199,18 @@ def cov(x, y):
         float: 协方差
 
     """
+    n = x.shape[0]
     mu_x = np.mean(x)
     mu_y = np.mean(y)
-    x_ = x - mu_x
-    y_ = y - mu_y
 
-    return np.dot(x_, y_) / (len(x) - 1)
+    sum_x_y = 0.
+    for i in range(n):
+        sum_x_y += (x[i] - mu_x) * (y[i] - mu_y)
+
+    return sum_x_y / (n - 1)
 
 
-@njit
+@njit(cache=True)
 def rank_corr(x, y):
     """
     计算x和y之间的斯皮尔曼等级相关系数。
@@ -108,14 +227,18 @@ def rank_corr(x, y):
     y_ = sorted_rank(y)
 
     n = len(x_)
-    dd = np.nansum((x_ - y_) ** 2)
+    dd = 0.
+    for i in range(n):
+        d = x_[i] - y_[i]
+        if d == d:
+            dd += d * d
 
     nn = n * (n ** 2 - 1)
 
     return 1 - (6 * dd / nn)
 
 
-@njit
+@njit(fastmath=_REDUCE_FASTMATH, cache=True)
 def skew(x):
     """
     计算数组x的偏度（与pandas对齐）
@@ -128,17 +251,36 @@ def skew(x):
 
     """
     n = x.shape[0]
-    devi = x - np.mean(x)
-    div = np.sqrt(np.sum(devi ** 2) / (n - 1))
-    if (n <= 2) or (div == 0):
+    if n <= 2:
+        return np.nan
+    total = 0.
+    for i in range(n):
+        total += x[i]
+    mu = total / n
+
+    # 单遍累加一至三阶离差和；一阶离差和用于修正均值的舍入误差（平移矩公式，对任意平移量精确成立）
+    sum_1, sum_2, sum_3 = 0., 0., 0.
+    for i in range(n):
+        d = x[i] - mu
+        d2 = d * d
+        sum_1 += d
+        sum_2 += d2
+        sum_3 += d2 * d
+    m1 = sum_1 / n
+    sum_3 = sum_3 - 3 * m1 * sum_2 + 2 * sum_1 * m1 * m1
+    sum_2 = sum_2 - sum_1 * m1
+
+    div = np.sqrt(sum_2 / (n - 1))
+    if div == 0:
         return np.nan
     else:
-        return np.sum((devi / div) ** 3) * n / (n - 1) / (n - 2)
+        return sum_3 / div ** 3 * n / (n - 1) / (n - 2)
+
 
-@njit
+@njit(cache=True)
 def sorted_rank(arr: np.array, reverse=True):
     """
-    计算数组中每个值的排名。
+    计算数组中每个值的排名（相同值取并列最小名次，NaN保持为NaN）。
 
     Args:
         arr (np.array): 输入数组。
@@ -148,30 +290,127 @@ def sorted_rank(arr: np.array, reverse=True):
         np.array: 排名数组。
 
     """
-    idx = np.arange(arr[np.isfinite(arr)].shape[0]) + 1
-    sorted_args = np.argsort(arr)
-    rank = np.full(arr.shape, np.nan)
+    n = arr.shape[0]
+    rank = np.full(n, np.nan)
+    # 一次升序排序（NaN排在末尾），自大到小线性扫描，跳过NaN并处理并列
+    order = np.argsort(arr)
+
+    # 升序名次直接在扫描中写入（n - rank + 1），不再额外分配数组
+    rank_tmp = 0.
+    count = 0
+    prev = 0.
+    for k in range(n - 1, -1, -1):
+        loc = order[k]
+        value = arr[loc]
+        if np.isnan(value):
+            continue
+        count += 1
+        if count == 1 or value != prev:
+            rank_tmp = count
+        rank[loc] = rank_tmp if reverse else n - rank_tmp + 1
+        prev = value
 
-    n = 0
-    rank_tmp = idx[n]
-    for x in range(1, sorted_args.shape[0] + 1):
-        ix = -x
-        arr_loc = sorted_args[ix]
-        if not np.isnan(arr[arr_loc]):
-            if not (arr[arr_loc] == arr[sorted_args[ix + 1]]):
-                rank_tmp = idx[n]
-                rank[arr_loc] = rank_tmp
-            else:
-                rank[arr_loc] = rank_tmp
-            n += 1
+    return rank
 
-    if not reverse:
-        rank = arr.shape[0] - rank + 1
 
-    return rank
+@njit(cache=True)
+def _nan_mean(x: np.array):
+    """
+    跳过NaN的均值，单遍循环实现，不构造掩码数组。
 
+    Args:
+        x (np.array): 一维数据数组
+
+    Returns:
+        float: 非NaN元素的均值；全部为NaN时返回NaN
+    """
+    total = 0.
+    count = 0
+    for i in range(x.shape[0]):
+        v = x[i]
+        if v == v:
+            total += v
+            count += 1
+    return total / count if count > 0 else np.nan
+
+
+@njit(cache=True)
+def _drop_nan(x: np.array):
+    """
+    返回剔除NaN后的副本；不含NaN时直接复制，避免逐元素判断。
+
+    Args:
+        x (np.array): 一维数据数组
+
+    Returns:
+        np.array: 不含NaN的一维数组
+    """
+    if not np.isnan(np.sum(x)):
+        return x.copy()
+    out = np.empty(x.shape[0])
+    count = 0
+    for i in range(x.shape[0]):
+        v = x[i]
+        if v == v:
+            out[count] = v
+            count += 1
+    return out[:count]
+
+
+@njit(cache=True)
+def _select(a: np.array, k: int, lo: int, hi: int):
+    """
+    快速选择：就地重排a[lo:hi+1]，使a[k]为该区间内第k小的元素，其左侧均不大于、右侧均不小于a[k]。
 
-@njit
+    Args:
+        a (np.array): 不含NaN的一维数组，会被就地修改
+        k (int): 目标位置
+        lo (int): 区间起点
+        hi (int): 区间终点（包含）
+
+    Returns:
+        float: a[k]
+    """
+    while hi > lo:
+        # 三数取中作为枢轴
+        mid = (lo + hi) >> 1
+        if a[mid] < a[lo]:
+            a[mid], a[lo] = a[lo], a[mid]
+        if a[hi] < a[lo]:
+            a[hi], a[lo] = a[lo], a[hi]
+        if a[hi] < a[mid]:
+            a[hi], a[mid] = a[mid], a[hi]
+        pivot = a[mid]
+
+        i, j = lo, hi
+        while i <= j:
+            while a[i] < pivot:
+                i += 1
+            while a[j] > pivot:
+                j -= 1
+            if i <= j:
+                a[i], a[j] = a[j], a[i]
+                i += 1
+                j -= 1
+
+        if k <= j:
+            hi = j
+        elif k >= i:
+            lo = i
+        else:
+            break
+    return a[k]
+
+
+@njit(cache=True)
+def _lerp(lo: float, hi: float, t: float):
+    """线性插值，与numpy分位数的插值方式一致：t >= 0.5 时从上端回插，保证端点精确"""
+    if t >= 0.5:
+        return hi - (hi - lo) * (1 - t)
+    return lo + (hi - lo) * t
+
+
+@njit(cache=True)
 def outlier_iqr(data: np.array):
     """
     使用四分位距（IQR）方法计算异常值检测的上限和下限。
@@ -183,8 +422,24 @@ def outlier_iqr(data: np.array):
         Tuple[float, float]: 一个包含上限和下限的元组，用于检测异常值。
 
     """
-    q1 = np.nanquantile(data, 0.25)
-    q3 = np.nanquantile(data, 0.75)
+    # 剔除NaN后以快速选择取分位数，复杂度 O(n)
+    valid = _drop_nan(data)
+    n = valid.shape[0]
+    if n == 0:
+        return np.nan, np.nan
+
+    h3 = (n - 1) * 0.75
+    k3 = int(h3)
+    q3 = _select(valid, k3, 0, n - 1)
+    if k3 + 1 < n:
+        q3 = _lerp(q3, np.min(valid[k3 + 1:]), h3 - k3)
+
+    # 第一次选择后，前k3+1个元素即为最小的k3+1个，下四分位只需在其中选择
+    h1 = (n - 1) * 0.25
+    k1 = int(h1)
+    q1 = _select(valid, k1, 0, k3)
+    if k1 + 1 < n:
+        q1 = _lerp(q1, np.min(valid[k1 + 1:]), h1 - k1)
 
     lower = q1 - 1.5 * (q3 - q1)
     upper = q3 + 1.5 * (q3 - q1)
@@ -192,7 +447,7 @@ def outlier_iqr(data: np.array):
     return upper, lower
 
 
-@njit
+@njit(cache=True)
 def outlier_sig(data: np.array):
     """
     使用3.89个标准差的方法计算异常值检测的上下界
@@ -204,15 +459,24 @@ def outlier_sig(data: np.array):
         Tuple[float, float]: 浮点数的元组，包含上界和下界
     """
 
-    std = np.nanstd(data)
+    mean = _nan_mean(data)
+    # 均值只计算一次，离差平方和单遍累加（跳过NaN）
+    sum_2 = 0.
+    count = 0
+    for i in range(data.shape[0]):
+        d = data[i] - mean
+        if not np.isnan(d):
+            sum_2 += d * d
+            count += 1
+    std = np.sqrt(sum_2 / count) if count > 0 else np.nan
 
-    lower = np.nanmean(data) - 3.89 * std
-    upper = np.nanmean(data) + 3.89 * std
+    lower = mean - 3.89 * std
+    upper = mean + 3.89 * std
 
     return upper, lower
 
 
-@njit
+@njit(fastmath=_REDUCE_FASTMATH, cache=True)
 def eu_distance(y: np.array, x: np.array):
     """
     计算x和y之间分布的欧几里得距离值
@@ -225,10 +489,14 @@ def eu_distance(y: np.array, x: np.array):
         float: 欧几里得距离的浮点数
 
     """
-    return np.sqrt(np.sum(np.square(x - y)))
+    dist = 0.
+    for i in range(x.shape[0]):
+        d = x[i] - y[i]
+        dist += d * d
+    return np.sqrt(dist)
 
 
-@njit
+@njit(fastmath=_REDUCE_FASTMATH, cache=True)
 def cosine(y: np.array, x: np.array):
     """
     计算向量x和y之间的余弦相似度
@@ -241,21 +509,54 @@ def cosine(y: np.array, x: np.array):
         float: x和y之间的余弦相似度
 
     """
+    # 单遍同时累加内积与两个平方和
+    sum_x_y, sum_x_2, sum_y_2 = 0., 0., 0.
+    for i in range(x.shape[0]):
+        sum_x_y += x[i] * y[i]
+        sum_x_2 += x[i] * x[i]
+        sum_y_2 += y[i] * y[i]
 
-    linglg_x = np.linalg.norm(x)
-    linglg_y = np.linalg.norm(y)
-
-    if linglg_x * linglg_y != 0:
-        return np.dot(y, x) / (linglg_x * linglg_y)
+    divisor = np.sqrt(sum_x_2 * sum_y_2)
+    if divisor != 0:
+        return sum_x_y / divisor
     else:
         return np.nan
 
 
-@njit
+# 模板数量低于该阈值时使用jit逐对计数，否则使用kd树范围查询
+_PHI_KDTREE_MIN = 2048
+
+
 def _phi(arr: np.array, m: int, r: float):
     """
     计算给定数组在时间序列上的phi系数。
 
+    Args:
+        arr (np.array): 输入的时间序列数组。
+        m (int): 移动窗口的大小。
+        r (float): 用于计算距离的阈值倍数。
+
+    Returns:
+        float: 给定数组在时间序列上的phi系数。
+
+    """
+    size = arr.shape[0]
+    n = size - m + 1
+    if n < _PHI_KDTREE_MIN:
+        return _phi_brute(arr, m, r)
+
+    # 构造 (n, m) 的子序列矩阵，以切比雪夫距离做kd树范围计数（包含自身，多线程查询），复杂度 O(n·m·log n)
+    x = np.ascontiguousarray(np.lib.stride_tricks.sliding_window_view(arr, m), dtype=np.float64)
+    thres = np.std(arr) * r
+    counts = cKDTree(x, leafsize=16).query_ball_point(x, r=thres, p=np.inf, return_length=True, workers=-1)
+    return np.mean(np.log(counts / n))
+
+
+@njit(parallel=True, cache=True)
+def _phi_brute(arr: np.array, m: int, r: float):
+    """
+    phi系数的逐对计算版本，适用于序列较短的情形。
+
     Args:
         arr (np.array): 输入的时间序列数组。
         m (int): 移动窗口的大小。
@@ -273,19 +574,22 @@ def _phi(arr: np.array, m: int, r: float):
         x[:, i] = arr[i:(size + i - m + 1)]
 
     c_ = np.zeros(x.shape[0])
-    # Calculate distances of each sub-set
-    for i in np.arange(len(x)):
-        x_ = x[i]
+    # Calculate distances of each sub-set；各子序列计数相互独立，按行并行写入c_[i]
+    for i in prange(x.shape[0]):
         count = 0
-        for j in np.arange(len(x)):
-            y_ = x[j]
-            count += max(np.abs(x_ - y_)) <= thres
+        for j in range(x.shape[0]):
+            # 任一维度超过阈值即可判定，无需计算完整的最大距离
+            within = True
+            for k in range(m):
+                if np.abs(x[i, k] - x[j, k]) > thres:
+                    within = False
+                    break
+            count += within
 
         c_[i] = np.log(count / (size - m + 1))
     return 1 / (size - m + 1) * np.sum(c_)
 
 
-@njit
 def approximate_entropy(data: np.array, window: int, thres: float):
     """
     计算输入序列的近似熵
@@ -301,13 +605,13 @@ def approximate_entropy(data: np.array, window: int, thres: float):
     return np.abs(_phi(data, window + 1, thres) - _phi(data, window, thres))
 
 
-@njit
+@njit(cache=True)
 def min_max(arr: np.array, lower: int = 0, upper: int = 1):
     """
     对数组进行归一化处理，将其缩放到指定的范围[lower, upper]之间。
 
     Args:
-        arr (np.array): 需要进行归一化处理的数组。
+        arr (np.array): 需要进行归一化处理的数组，任意维度，按全部元素的最大值、最小值缩放。
         lower (int, optional): 归一化后的数组的最小值，默认为0。
         upper (int, optional): 归一化后的数组的最大值，默认为1。
 
@@ -315,16 +619,57 @@ def min_max(arr: np.array, lower: int = 0, upper: int = 1):
         np.array: 归一化后的数组。
 
     """
-    max_ = np.max(arr)
-    min_ = np.min(arr)
+    out = np.empty(arr.size)
+    min_max_inplace(arr.ravel(), out, lower, upper)
+    return out.reshape(arr.shape)
+
+
+@njit(cache=True)
+def min_max_inplace(arr: np.array, out: np.array, lower: float = 0., upper: float = 1.):
+    """
+    min_max的输出缓冲区版本：结果写入调用方提供的out，可重复使用同一缓冲区以避免分配。
+    仅支持一维数组，多维数组请使用min_max，或传入ravel()后的数组与等长的一维out。
 
-    if max_ == min_:
-        return np.ones(arr.shape) * upper
+    Args:
+        arr (np.array): 需要进行归一化处理的一维数组。
+        out (np.array): 输出数组，长度与arr一致，可以是arr本身。
+        lower (float, optional): 归一化后的数组的最小值，默认为0。
+        upper (float, optional): 归一化后的数组的最大值，默认为1。
+
+    Returns:
+        np.array: out，归一化后的数组；arr含NaN时全部为NaN。
+
+    """
+    n = arr.shape[0]
+    if n == 0:
+        return out
+
+    # 单遍同时求最大值、最小值
+    max_ = arr[0]
+    min_ = arr[0]
+    has_nan = False
+    for i in range(n):
+        v = arr[i]
+        if v > max_:
+            max_ = v
+        if v < min_:
+            min_ = v
+        has_nan |= v != v
+
+    if has_nan:
+        out[:] = np.nan
+    elif max_ == min_:
+        out[:] = upper
     else:
-        return (upper - lower) * (arr - min_) / (max_ - min_) + lower
+        # 保留逐元素除法而非乘以倒数，保证端点精确映射到lower/upper
+        span = upper - lower
+        width = max_ - min_
+        for i in range(n):
+            out[i] = span * (arr[i] - min_) / width + lower
+    return out
 
 
-@njit
+@njit(cache=True)
 def uniform_weighting(data: np.array) ->np.array:
     """
     对数组进行均匀加权处理。
@@ -336,12 +681,12 @@ def uniform_weighting(data: np.array) ->np.array:
         np.array: 经过均匀加权处理后的numpy数组。
 
     """
-    abs_sum = sum(abs(data))
-    result_ = abs(data)/abs_sum
+    abs_data = np.abs(data)
+    result_ = abs_data / np.sum(abs_data)
     return result_
 
 
-@njit
+@njit(cache=True)
 def corr_prob(x: np.array, y: np.array, mu_x: float, mu_y: float):
     """
     计算数组x和数组y中的元素与各自均值mu_x和mu_y相比，显示出相同方向的概率。
@@ -356,10 +701,14 @@ def corr_prob(x: np.array, y: np.array, mu_x: float, mu_y: float):
         float: x和y中元素相对于各自均值显示出相同方向的概率。
 
     """
-    ttl = x != mu_x
-    hit = ((x > mu_x) & (y > mu_y)) | ((x < mu_x) & (y < mu_y))
-
-    if np.sum(ttl) != 0:
-        return np.sum(hit) / np.sum(ttl) - 0.5
+    # 单遍无分支计数，不构造布尔掩码数组
+    ttl, hit = 0, 0
+    for i in range(x.shape[0]):
+        xi, yi = x[i], y[i]
+        ttl += xi != mu_x
+        hit += ((xi > mu_x) & (yi > mu_y)) | ((xi < mu_x) & (yi < mu_y))
+
+    if ttl != 0:
+        return hit / ttl - 0.5
     else:
         return 0
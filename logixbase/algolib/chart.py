@@ -67,20 +67,27 @@ class ChartWizard:
         返回:
             matplotlib.figure.Figure: 生成的热力图对象
         """
-        shape = (int(len(para_range[-2])), int(len(para_range[-1])))
-        sharps = pd.DataFrame()
+        rows = sorted(para_range[-2], reverse=True)
+        keys, index = [], []
         for x in product(*para_range[:-2]):
-            paras_ret = [input_ret[str(list(x)+[i, j])] for i in sorted(para_range[-2], reverse=True)
-                        for j in para_range[-1]]
-            paras_ret = [x[np.isfinite(x)] for x in paras_ret]
+            keys.extend(str(list(x) + [i, j]) for i in rows for j in para_range[-1])
+            index.extend(str(list(x) + [m]) for m in rows)
 
-            sharps_temp = [np.sum(data) / data.shape[0] * year_trade_date /
-                          np.sqrt(((data - np.mean(data)) ** 2).sum() / (len(data)-1)) /
-                          np.sqrt(year_trade_date) for data in paras_ret]
+        # 各参数组合的收益序列按行填入NaN补齐的矩阵，一次性向量化计算夏普比率
+        paras_ret = [np.asarray(input_ret[k], dtype=np.float64) for k in keys]
+        ret = np.full((len(paras_ret), max((len(r) for r in paras_ret), default=0)), np.nan)
+        for k, r in enumerate(paras_ret):
+            ret[k, :len(r)] = r
+        ret[~np.isfinite(ret)] = np.nan
 
-            index = [str(list(x)+[m]) for m in sorted(para_range[-2], reverse=True)]
-            sharps_temp = pd.DataFrame(np.array(sharps_temp).reshape(shape), columns=para_range[-1], index=index)
-            sharps = pd.concat([sharps, sharps_temp])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            counts = np.sum(~np.isnan(ret), axis=1)
+            means = np.nansum(ret, axis=1) / counts
+            stds = np.sqrt(np.nansum((ret - means[:, None]) ** 2, axis=1) / (counts - 1))
+            sharps = means * np.sqrt(year_trade_date) / stds
+
+        sharps = pd.DataFrame(sharps.reshape(len(index), len(para_range[-1])),
+                              columns=para_range[-1], index=index)
 
         cmap = sns.diverging_palette(220, 10, sep=10, as_cmap=True)
         fmt = '.0f' if max(abs(v_max), abs(v_min)) >= 20 else \
@@ -90,7 +97,7 @@ class ChartWizard:
                          robust=True, annot=True, annot_kws={'color': 'black'},
                          fmt=fmt, cmap=cmap)
         plt.title('夏普比率')
-        ax.tight_layout()
+        plt.tight_layout()
         return ax
 
     @staticmethod
@@ -1,10 +1,28 @@
 import numpy as np
-from numba import jit
-import scipy.stats as st
+from numba import njit
+from scipy.special import stdtr
 from .regression import regress_full
 
 
-@jit
+@njit(cache=True)
+def _info_tstat(ret_1, ret_2):
+    """
+    计算两个时间序列互相回归的t统计量（jit内核，不含scipy调用以便缓存编译结果）。
+
+    Args:
+        ret_1 (np.ndarray): 第一个时间序列数据。
+        ret_2 (np.ndarray): 第二个时间序列数据。
+
+    Returns:
+        tuple: (ret_2对ret_1回归的t值, ret_1对ret_2回归的t值)
+    """
+    # x: 1, y: 2
+    t0_1 = regress_full(ret_2, ret_1)[1][1]
+    # x: 2, y: 1
+    t0_2 = regress_full(ret_1, ret_2)[1][1]
+    return t0_1, t0_2
+
+
 def info_increment(ret_1, ret_2, thres: float = 0.05):
     """
     根据两个输入的时间序列数据，计算它们之间的增量信息。
@@ -20,12 +38,9 @@ def info_increment(ret_1, ret_2, thres: float = 0.05):
             - 第二个元素为1时表示ret_2对ret_1有显著的增量信息，为0时表示没有。
     """
     df = ret_1.shape[0] - 2
-    # x: 1, y: 2
-    t0_1 = regress_full(ret_2, ret_1)[1][1]
-    p1 = 2 * st.t.sf(abs(t0_1), df)
-    # x: 2, y: 1
-    t0_2 = regress_full(ret_1, ret_2)[1][1]
-    p2 = 2 * st.t.sf(abs(t0_2), df)
+    t0_1, t0_2 = _info_tstat(ret_1, ret_2)
+    # 双侧p值：直接调用t分布CDF的ufunc（stdtr），避免scipy.stats分布对象的参数检查开销
+    p1, p2 = 2 * stdtr(df, -np.abs(np.array([t0_1, t0_2])))
 
     if (p1 <= thres) and (p2 <= thres):
         return 1, 1
@@ -35,3 +50,44 @@ def info_increment(ret_1, ret_2, thres: float = 0.05):
         return 1, 0
     else:
         return 0, 0
+
+
+@njit(cache=True)
+def _info_tstat_matrix(series):
+    """
+    批量计算两两序列互相回归的t统计量（jit内核）。
+
+    Args:
+        series (np.ndarray): 形状为(变量数, 样本数)的序列矩阵，每行为一个时间序列。
+
+    Returns:
+        np.ndarray: 形状为(变量数, 变量数)的矩阵，[i, j]为判断序列i对序列j是否有增量信息所用的t值，对角线为0。
+    """
+    d = series.shape[0]
+    tmat = np.zeros((d, d))
+    for i in range(d):
+        for j in range(i + 1, d):
+            t0_1, t0_2 = _info_tstat(series[i], series[j])
+            tmat[i, j] = t0_2
+            tmat[j, i] = t0_1
+    return tmat
+
+
+def info_increment_batch(returns, thres: float = 0.05):
+    """
+    批量计算多个时间序列两两之间的增量信息，每对序列只回归一次。
+
+    Args:
+        returns (np.ndarray): 形状为(样本数, 变量数)的收益率矩阵，每列为一个时间序列。
+        thres (float, optional): 显著性水平阈值，默认值为0.05。
+
+    Returns:
+        np.ndarray: 形状为(变量数, 变量数)的int8矩阵，[i, j]为1表示第i列对第j列有显著的增量信息，为0时表示没有；
+            即 info_increment(returns[:, i], returns[:, j]) == (out[i, j], out[j, i])。对角线为0。
+    """
+    series = np.ascontiguousarray(np.asarray(returns, dtype=np.float64).T)
+    df = series.shape[1] - 2
+    tmat = _info_tstat_matrix(series)
+    out = (2 * stdtr(df, -np.abs(tmat)) <= thres).astype(np.int8)
+    np.fill_diagonal(out, 0)
+    return out
@@ -7,10 +7,11 @@
 这些函数可以帮助进行基本的矩阵和数组操作，特别是在处理不同形状的数组时。
 """
 import numpy as np
-from numba import jit, njit
+from numba import njit
+from scipy import linalg
+from scipy.linalg import lapack
 
 
-@jit
 def splmtset(x, y):
     """
     获取两个数组之间的补集
@@ -22,57 +23,67 @@ def splmtset(x, y):
     Returns:
         numpy.ndarray: 补集数组。
 
-    该函数使用jit加速，可以处理一维和多维数组。如果x和y都是一维数组，则函数将返回x中不在y中的元素；
+    Raises:
+        ValueError: x和y的形状无法求补集时抛出。
+
+    该函数按数组维度分派至jit加速的内核，可以处理一维和多维数组。如果x和y都是一维数组，则函数将返回x中不在y中的元素；
     如果x和y是形状相同的二维数组，则函数将返回x中不在y中的行；
     如果x和y的行数相同但列数不同，则函数将返回x中不在y中的列。
     如果x和y的形状不相同，函数将抛出异常。
     """
-    sup = 0
-    if len(x.shape) == 1:
-        par = x if len(x) > len(y) else y
-        son = y if len(x) > len(y) else x
-        sup = np.full(len(par) - len(son), np.nan)
-        t = 0
-        for i in range(len(par)):
-            if t < len(sup):
-                if not (par[i] in son):
-                    sup[t] = par[i]
-                    t += 1
-            else:
-                break
-    else:
-        if x.shape[1] == y.shape[1]:
-            par = x if x.shape[0] > y.shape[0] else y
-            son = y if x.shape[0] > y.shape[0] else x
-            suprow = abs(x.shape[0] - y.shape[0])
-            supshape = (suprow, x.shape[1])
-            sup = np.full(supshape, np.nan)
-            t = 0
-            for r in range(par.shape[0]):
-                if t < suprow:
-                    if not (par[r] in son):
-                        sup[t] = par[r]
-                        t += 1
-                else:
-                    break
-        elif x.shape[0] == y.shape[0]:
-            par = x if x.shape[1] > y.shape[1] else y
-            son = y if x.shape[1] > y.shape[1] else x
-            supcols = abs(x.shape[1] - y.shape[1])
-            supshape = (x.shape[0], supcols)
-            sup = np.full(supshape, np.nan)
-            t = 0
-            for c in range(par.shape[1]):
-                if t < supcols:
-                    if not (par[:, c] in son.T):
-                        sup[:, t] = par[:, c]
-                        t += 1
-                else:
-                    break
+    if x.ndim == 1:
+        return _splmtset_1d(x, y)
+    if x.shape[1] == y.shape[1]:
+        return _splmtset_rows(x, y)
+    if x.shape[0] == y.shape[0]:
+        return _splmtset_rows(x.T, y.T).T
+    raise ValueError(f"数组形状不匹配，无法求补集: {x.shape} / {y.shape}")
+
+
+@njit(cache=True)
+def _splmtset_1d(x, y):
+    """一维数组补集：返回较长数组中不在较短数组中的元素"""
+    par = x if len(x) > len(y) else y
+    son = y if len(x) > len(y) else x
+    sup = np.full(len(par) - len(son), np.nan)
+    # 对较短数组排序后二分查找，整体复杂度 O(n log n)；NaN排在末尾且与任何值不相等，视为不在son中
+    son_sorted = np.sort(son)
+    m = len(son_sorted)
+    t = 0
+    for i in range(len(par)):
+        if t < len(sup):
+            v = par[i]
+            k = np.searchsorted(son_sorted, v)
+            if not (k < m and son_sorted[k] == v):
+                sup[t] = v
+                t += 1
+        else:
+            break
+    return sup
+
+
+def _row_keys(arr):
+    """将二维数组的每一行视为一个定长字节串，便于整行比较；-0.0统一为0.0"""
+    arr = np.ascontiguousarray(arr, dtype=np.float64) + 0.
+    return arr.view(np.dtype((np.void, arr.dtype.itemsize * arr.shape[1]))).ravel()
+
+
+def _splmtset_rows(x, y):
+    """二维数组按行求补集：返回行数较多的数组中不在另一数组中的行"""
+    par = x if x.shape[0] > y.shape[0] else y
+    son = y if x.shape[0] > y.shape[0] else x
+    suprow = abs(x.shape[0] - y.shape[0])
+    sup = np.full((suprow, x.shape[1]), np.nan)
+
+    # 以行字节串做集合查找（排序后二分），含NaN的行与任何行都不相等
+    son = son[~np.isnan(son).any(axis=1)]
+    missing = ~np.isin(_row_keys(par), _row_keys(son))
+    rows = par[missing][:suprow]
+    sup[:rows.shape[0]] = rows
     return sup
 
 
-@njit
+@njit(cache=True)
 def array_shift(arr: np.array, n: int):
     """
     将数组沿x轴移动n步
@@ -82,20 +93,42 @@ def array_shift(arr: np.array, n: int):
         n (int): 数组数据移动的步数
 
     Returns:
-        np.array: 数据数组
+        np.array: 数据数组，移出的位置以NaN填充
 
     """
-    x = np.full(arr.shape, np.nan)
-    if n > 0:
-        x[n:] = arr[:-n]
-    elif n < 0:
-        x[:n] = arr[-n:]
+    # 仅分配一次，有效区域直接拷贝，只对移出区域填充NaN
+    size = arr.shape[0]
+    k = min(abs(n), size)
+    x = np.empty(arr.shape)
+    if n >= 0:
+        x[:k] = np.nan
+        x[k:] = arr[:size - k]
     else:
-        x = x
+        x[size - k:] = np.nan
+        x[:size - k] = arr[k:]
     return x
 
 
-@jit
+def array_shift_view(arr: np.array, n: int):
+    """
+    array_shift的零拷贝版本：不构造移动后的数组，返回原数组的视图及其在移动结果中的位置
+
+    Args:
+        arr (np.array): 数据数组
+        n (int): 数组数据移动的步数
+
+    Returns:
+        Tuple[np.array, slice]: (values, valid)，values为arr的视图，
+            满足 array_shift(arr, n)[valid] == values，其余位置为NaN
+
+    """
+    size = arr.shape[0]
+    k = min(abs(n), size)
+    if n >= 0:
+        return arr[:size - k], slice(k, size)
+    return arr[k:], slice(0, size - k)
+
+
 def inverse_matrix(mat):
     """
     计算矩阵的逆矩阵。
@@ -104,21 +137,22 @@ def inverse_matrix(mat):
         mat (numpy.ndarray): 输入的矩阵。
 
     Returns:
-        numpy.ndarray: 输入矩阵的逆矩阵。
-
-    Raises:
-        ValueError: 当矩阵的条件数（condition number）小于 1 / np.finfo(mat.dtype).eps 时，
-            表示矩阵为奇异矩阵，无法求逆，此时会抛出 ValueError 异常。
+        numpy.ndarray: 输入矩阵的逆矩阵；矩阵奇异（或病态）时返回Moore-Penrose伪逆。
 
     Note:
-        使用 numpy.linalg.cond 函数计算矩阵的条件数，当条件数小于 1 / np.finfo(mat.dtype).eps 时，
-        认为矩阵是奇异矩阵，直接返回逆矩阵可能会导致计算不稳定或错误结果。
-        当矩阵不是奇异矩阵时，使用奇异值分解（SVD）来求逆矩阵。
+        先做一次LU分解（getrf），并由LU因子以 O(n²) 估计1-范数条件数（gecon），
+        条件数小于 1 / np.finfo(np.float64).eps 时直接由LU因子求逆（getri）；
+        否则（含非方阵）使用 scipy.linalg.pinv，仅做一次SVD分解，不构造对角矩阵。
     """
-    if np.linalg.cond(mat) < 1 / np.finfo(mat.dtype).eps:
-        return np.linalg.solve(mat, np.eye(mat.shape[1], dtype=float))
-    else:
-        u, s, v = np.linalg.svd(mat)
-        d = np.diag(s)
-        tmp = np.matmul(v, np.linalg.inv(d))
-        return np.matmul(tmp, np.transpose(u))
+    mat = np.asarray(mat, dtype=np.float64)
+    if mat.ndim == 2 and mat.shape[0] == mat.shape[1]:
+        getrf, gecon, getri = lapack.get_lapack_funcs(("getrf", "gecon", "getri"), (mat,))
+        lu, piv, info = getrf(mat)
+        if info == 0:
+            anorm = np.abs(mat).sum(axis=0).max()
+            rcond, _ = gecon(lu, anorm, norm="1")
+            if rcond > np.finfo(np.float64).eps:
+                inv, info = getri(lu, piv)
+                if info == 0:
+                    return inv
+    return linalg.pinv(mat, check_finite=False)
@@ -11,18 +11,253 @@
 7. 均值-条件风险价值(CVaR)投资组合优化
 8. Black-Litterman投资组合优化
 9. 层次风险平价投资组合优化
+10. 滚动协方差增量估计（RollingCov），供各优化函数复用协方差矩阵
+11. 滚动窗口批量求解（min_variance_batch、risk_parity_batch），各调仓期并行计算
 
 这些函数可以帮助进行各种投资组合的构建和优化，适用于不同的投资策略和风险偏好。
 """
 
+from collections import deque
+
 import numpy as np
-from scipy import optimize
+from numba import njit, prange
+from scipy import linalg, optimize, sparse
 import warnings
 
+from .utils import _REDUCE_FASTMATH
+
 warnings.simplefilter("ignore")
 
 
-def min_variance(returns, constraint=None, weight_bounds=(0, 1)):
+def _cov_solve(cov_mat, b):
+    """
+    基于Cholesky分解求解 Σx = b
+
+    Args:
+        cov_mat (numpy.ndarray): 协方差矩阵
+        b (numpy.ndarray): 右端向量或矩阵
+
+    Returns:
+        numpy.ndarray: 解x；协方差矩阵非正定时返回None
+    """
+    try:
+        factor = linalg.cho_factor(cov_mat, check_finite=False)
+    except (linalg.LinAlgError, ValueError):
+        return None
+    return linalg.cho_solve(factor, b, check_finite=False)
+
+
+# SLSQP求解选项：目标函数已归一化，统一收敛容差
+_SLSQP_OPTIONS = {'ftol': 1e-8}
+
+# 单精度协方差路径允许的最大条件数
+_FP32_MAX_COND = 1e5
+
+# 权重和为1的约束（附解析雅可比）
+_BUDGET_CONSTRAINT = {'type': 'eq', 'fun': lambda x: np.sum(x) - 1.0, 'jac': lambda x: np.ones_like(x)}
+
+
+def _complete_rows(returns, validate=True):
+    """
+    转为float64数组并剔除含缺失值的行（等价于DataFrame.dropna），无缺失值时不复制
+
+    Args:
+        returns (DataFrame | numpy.ndarray): 收益率矩阵
+        validate (bool, optional): 是否检查缺失值，默认为True；为False时直接返回float64数组
+
+    Returns:
+        numpy.ndarray: 不含缺失值的收益率矩阵
+    """
+    data = np.asarray(returns, dtype=np.float64)
+    if not validate:
+        return data
+    valid = ~np.isnan(data).any(axis=1)
+    return data if valid.all() else data[valid]
+
+
+def _resolve_cov(returns, cov_mat, validate=True):
+    """
+    返回传入的协方差矩阵；未传入时由收益率矩阵计算样本协方差（自由度n-1，与DataFrame.cov一致）
+
+    中心化后以一次矩阵乘法 XᵀX 计算（numpy对同一数组的转置乘积调用BLAS syrk），
+    代替 dropna -> DataFrame.cov -> values 的多次遍历。
+    """
+    if cov_mat is not None:
+        return np.asarray(cov_mat, dtype=np.float64)
+    data = _complete_rows(returns, validate)
+    centered = data - data.mean(axis=0)
+    return centered.T @ centered / (data.shape[0] - 1)
+
+
+def _cond_estimate(cov_mat):
+    """
+    估计协方差矩阵的1-范数条件数（不小于2-范数条件数）
+
+    Cholesky分解后由LAPACK pocon估计，代价约为SVD（np.linalg.cond）的1/10；矩阵非正定时返回inf。
+    """
+    factor, info = linalg.lapack.dpotrf(cov_mat)
+    if info != 0:
+        return np.inf
+    rcond, info = linalg.lapack.dpocon(factor, np.abs(cov_mat).sum(axis=0).max())
+    return 1.0 / rcond if info == 0 and rcond > 0 else np.inf
+
+
+def _objective_cov(cov_mat, dtype):
+    """
+    目标函数使用的协方差矩阵（连续内存）
+
+    dtype为float32且条件数估计不超过 _FP32_MAX_COND 时存为单精度：迭代中的矩阵-向量乘积读取的数据量减半，
+    结果仍以双精度参与后续计算；病态矩阵单精度误差过大，保持float64。解析解路径始终使用float64。
+    """
+    if np.dtype(dtype) == np.float32 and _cond_estimate(cov_mat) <= _FP32_MAX_COND:
+        return np.ascontiguousarray(cov_mat, dtype=np.float32)
+    return np.ascontiguousarray(cov_mat, dtype=np.float64)
+
+
+def _weight_bounds(n, weight_bounds):
+    """
+    将(min_weight, max_weight)转换为SLSQP的Bounds对象（None表示不限制），代替逐资产重复的边界元组
+
+    Args:
+        n (int): 资产数量
+        weight_bounds (tuple): 权重边界(min_weight, max_weight)
+
+    Returns:
+        scipy.optimize.Bounds: 各资产相同的权重边界
+    """
+    lower, upper = weight_bounds
+    return optimize.Bounds(np.full(n, -np.inf if lower is None else lower, dtype=np.float64),
+                           np.full(n, np.inf if upper is None else upper, dtype=np.float64))
+
+
+def _in_bounds(weights, weight_bounds, tol=1e-12):
+    """判断解析解是否满足权重边界（边界为None表示不限制），含NaN时返回False"""
+    lower, upper = weight_bounds
+    if not np.all(np.isfinite(weights)):
+        return False
+    if lower is not None and np.any(weights < lower - tol):
+        return False
+    if upper is not None and np.any(weights > upper + tol):
+        return False
+    return True
+
+
+class RollingCov:
+    """
+    增量协方差估计器：逐行推入/移出收益率观测，以Welford算法维护均值与离差叉积矩阵，
+    滚动调仓时无需每期对整个窗口重新计算协方差矩阵。
+
+    Args:
+        n_assets (int): 资产数量
+        lookback (int, optional): 滚动窗口长度，默认为None（不限长度，需手动pop）。
+            设置后推入新观测时自动移出最早的观测，并每lookback次更新按窗口数据重算一次以消除累积误差。
+
+    Example:
+        rc = RollingCov(returns.shape[1], lookback=250)
+        for row in returns.values:
+            rc.push(row)
+            if rc.count >= 250:
+                weights = min_variance(returns, cov_mat=rc.cov())
+    """
+
+    def __init__(self, n_assets: int, lookback: int = None):
+        if lookback is not None and lookback < 2:
+            raise ValueError(f"lookback至少为2: {lookback}")
+        self.lookback = lookback
+        self.reset(n_assets)
+
+    def reset(self, n_assets: int = None):
+        """
+        清空已推入的观测；资产池变化时传入新的资产数量
+
+        Args:
+            n_assets (int, optional): 新的资产数量，默认为None（保持不变）
+        """
+        if n_assets is not None:
+            self.n_assets = int(n_assets)
+        self.count = 0
+        self.mean = np.zeros(self.n_assets)
+        self._m2 = np.zeros((self.n_assets, self.n_assets))
+        self._window = deque()
+        self._updates = 0
+
+    def push(self, row):
+        """
+        推入一行观测；含NaN的行被忽略（与优化函数中的dropna一致）
+
+        Args:
+            row (array-like): 长度为n_assets的收益率向量
+
+        Raises:
+            ValueError: 观测长度与资产数量不一致（资产池变化时需先调用reset）
+        """
+        row = self._check(row)
+        if np.isnan(row).any():
+            return
+        self._add(row)
+        if self.lookback is not None:
+            self._window.append(row)
+            if self.count > self.lookback:
+                self._remove(self._window.popleft())
+            self._updates += 1
+            if self._updates >= self.lookback:
+                self._rebuild()
+
+    def pop(self, row):
+        """
+        移出一行此前推入的观测（未设置lookback时使用）
+
+        Args:
+            row (array-like): 长度为n_assets的收益率向量
+        """
+        row = self._check(row)
+        if np.isnan(row).any() or self.count == 0:
+            return
+        self._remove(row)
+
+    def cov(self):
+        """
+        当前窗口的样本协方差矩阵（自由度n-1，与DataFrame.cov一致）
+
+        Returns:
+            numpy.ndarray: 形状为(n_assets, n_assets)的协方差矩阵；观测数不足2时为NaN矩阵
+        """
+        if self.count < 2:
+            return np.full((self.n_assets, self.n_assets), np.nan)
+        return self._m2 / (self.count - 1)
+
+    def _check(self, row):
+        row = np.asarray(row, dtype=np.float64)
+        if row.shape != (self.n_assets,):
+            raise ValueError(f"观测长度与资产数量不一致: {row.shape} / {self.n_assets}，资产池变化时请先调用reset")
+        return row
+
+    def _add(self, row):
+        self.count += 1
+        delta = row - self.mean
+        self.mean += delta / self.count
+        self._m2 += np.outer(delta, row - self.mean)
+
+    def _remove(self, row):
+        self.count -= 1
+        if self.count == 0:
+            self.mean[:] = 0.
+            self._m2[:] = 0.
+            return
+        delta = row - self.mean
+        self.mean -= delta / self.count
+        self._m2 -= np.outer(delta, row - self.mean)
+
+    def _rebuild(self):
+        """按窗口内数据重新计算均值与离差叉积矩阵"""
+        data = np.array(self._window)
+        self.mean = data.mean(axis=0)
+        centered = data - self.mean
+        self._m2 = centered.T @ centered
+        self._updates = 0
+
+
+def min_variance(returns, constraint=None, weight_bounds=(0, 1), cov_mat=None, dtype=np.float64, validate=True):
     """
     最小方差投资组合优化
 
@@ -30,30 +265,47 @@ def min_variance(returns, constraint=None, weight_bounds=(0, 1)):
         returns (DataFrame): 收益率矩阵
         constraint (dict, optional): 约束条件，默认为None。如果提供，应为包含约束条件的字典。
         weight_bounds (tuple, optional): 权重边界，默认为(0, 1)。表示权重可以在0到1之间。
+        cov_mat (numpy.ndarray, optional): 预先计算的协方差矩阵（如RollingCov.cov()），默认为None，此时由returns计算。
+        dtype (numpy.dtype, optional): 优化迭代中协方差矩阵的存储精度，默认为np.float64。
+            资产较多时可设为np.float32以减半内存带宽（条件数超过1e5时自动退回float64）。
+        validate (bool, optional): 是否剔除含缺失值的行，默认为True。调用方已保证数据无缺失值时可设为False，跳过逐行检查。
 
     Returns:
         numpy.ndarray: 最优权重数组
 
     """
     n = returns.shape[1]
-    returns = returns.dropna()
 
     # 计算协方差矩阵
-    cov_mat = returns.cov().values
-
-    # 定义目标函数
+    cov_mat = _resolve_cov(returns, cov_mat, validate)
+
+    # 无额外约束时先取解析解 w = Σ⁻¹1 / (1ᵀΣ⁻¹1)，满足权重边界则直接返回
+    if constraint is None:
+        z = _cov_solve(cov_mat, np.ones(n))
+        if z is not None:
+            weights = z / np.sum(z)
+            if _in_bounds(weights, weight_bounds):
+                return weights
+
+    # 目标函数按平均方差归一化：收益率方差量级通常远小于SLSQP的收敛容差(1e-6)，不归一化时会在初始点附近提前终止
+    # 缩放在迭代前对协方差矩阵一次性完成，每次迭代只需一次矩阵-向量乘积
+    scaled_cov = _objective_cov(cov_mat * (n / np.trace(cov_mat)), dtype)
+
+    # 定义目标函数（同时返回解析梯度，避免SLSQP数值差分）
+    # 梯度需要完整的Σw，以Cholesky因子计算 ‖Lᵀw‖² 需两次三角乘积，并不比一次对称乘积更快
     def objective(weights):
-        portfolio_variance = np.dot(weights.T, np.dot(cov_mat, weights))
-        return portfolio_variance
+        cov_w = np.dot(scaled_cov, weights.astype(scaled_cov.dtype, copy=False)).astype(np.float64, copy=False)
+        portfolio_variance = np.dot(weights, cov_w)
+        return portfolio_variance, 2 * cov_w
 
     # 初始权重
-    initial_weights = np.array([1.0 / n] * n)
+    initial_weights = np.full(n, 1.0 / n)
 
     # 权重约束
-    bounds = tuple(weight_bounds for _ in range(n))
+    bounds = _weight_bounds(n, weight_bounds)
 
     # 权重和为1的约束
-    constraints = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1.0}]
+    constraints = [_BUDGET_CONSTRAINT]
     if constraint is not None:
         constraints.append(constraint)
 
@@ -62,14 +314,17 @@ def min_variance(returns, constraint=None, weight_bounds=(0, 1)):
         objective,
         initial_weights,
         method='SLSQP',
+        jac=True,
         bounds=bounds,
-        constraints=constraints
+        constraints=constraints,
+        options=_SLSQP_OPTIONS
     )
 
     return result['x']
 
 
-def max_sharpe(returns, risk_free_rate=0, constraint=None, weight_bounds=(0, 1)):
+def max_sharpe(returns, risk_free_rate=0, constraint=None, weight_bounds=(0, 1), cov_mat=None, dtype=np.float64,
+               validate=True):
     """
     最大夏普比率投资组合优化
 
@@ -78,33 +333,49 @@ def max_sharpe(returns, risk_free_rate=0, constraint=None, weight_bounds=(0, 1))
         risk_free_rate (float, optional): 无风险利率，默认为0。
         constraint (dict, optional): 约束条件，默认为None。如果提供了约束条件，会添加到优化过程中。
         weight_bounds (tuple, optional): 权重边界，默认为(0, 1)，表示权重在0到1之间。
+        cov_mat (numpy.ndarray, optional): 预先计算的协方差矩阵（如RollingCov.cov()），默认为None，此时由returns计算。
+        dtype (numpy.dtype, optional): 优化迭代中协方差矩阵的存储精度，默认为np.float64。
+            资产较多时可设为np.float32以减半内存带宽（条件数超过1e5时自动退回float64）。
+        validate (bool, optional): 是否剔除含缺失值的行，默认为True。调用方已保证数据无缺失值时可设为False，跳过逐行检查。
 
     Returns:
         numpy.ndarray: 最优权重数组，表示投资组合中各资产的权重。
 
     """
     n = returns.shape[1]
-    returns = returns.dropna()
+    data = _complete_rows(returns, validate)
+
+    # 计算均值和协方差（data已剔除缺失值，无需再次检查）
+    mean_returns = data.mean(axis=0)
+    cov_mat = _resolve_cov(data, cov_mat, validate=False)
+
+    # 无额外约束时先取切点组合解析解 w ∝ Σ⁻¹(μ - rf)，满足权重边界则直接返回
+    if constraint is None:
+        z = _cov_solve(cov_mat, mean_returns - risk_free_rate)
+        if z is not None and np.sum(z) > 0:
+            weights = z / np.sum(z)
+            if _in_bounds(weights, weight_bounds):
+                return weights
 
-    # 计算均值和协方差
-    mean_returns = returns.mean().values
-    cov_mat = returns.cov().values
+    obj_cov = _objective_cov(cov_mat, dtype)
 
-    # 定义目标函数（负夏普比率，因为我们要最小化）
+    # 定义目标函数（负夏普比率，因为我们要最小化；同时返回解析梯度）
     def objective(weights):
-        portfolio_return = np.sum(mean_returns * weights)
-        portfolio_std_dev = np.sqrt(np.dot(weights.T, np.dot(cov_mat, weights)))
-        sharpe_ratio = (portfolio_return - risk_free_rate) / portfolio_std_dev
-        return -sharpe_ratio
+        cov_w = np.dot(obj_cov, weights.astype(obj_cov.dtype, copy=False)).astype(np.float64, copy=False)
+        portfolio_std_dev = np.sqrt(np.dot(weights, cov_w))
+        excess_return = np.dot(mean_returns, weights) - risk_free_rate
+        sharpe_ratio = excess_return / portfolio_std_dev
+        grad = mean_returns / portfolio_std_dev - excess_return * cov_w / portfolio_std_dev ** 3
+        return -sharpe_ratio, -grad
 
     # 初始权重
-    initial_weights = np.array([1.0 / n] * n)
+    initial_weights = np.full(n, 1.0 / n)
 
     # 权重约束
-    bounds = tuple(weight_bounds for _ in range(n))
+    bounds = _weight_bounds(n, weight_bounds)
 
     # 权重和为1的约束
-    constraints = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1.0}]
+    constraints = [_BUDGET_CONSTRAINT]
     if constraint is not None:
         constraints.append(constraint)
 
@@ -113,14 +384,17 @@ def max_sharpe(returns, risk_free_rate=0, constraint=None, weight_bounds=(0, 1))
         objective,
         initial_weights,
         method='SLSQP',
+        jac=True,
         bounds=bounds,
-        constraints=constraints
+        constraints=constraints,
+        options=_SLSQP_OPTIONS
     )
 
     return result['x']
 
 
-def risk_parity(returns, risk_target=None, constraint=None, weight_bounds=(0, 1)):
+def risk_parity(returns, risk_target=None, constraint=None, weight_bounds=(0, 1), cov_mat=None,
+                dtype=np.float64, validate=True):
     """
     风险平价投资组合优化
 
@@ -129,38 +403,36 @@ def risk_parity(returns, risk_target=None, constraint=None, weight_bounds=(0, 1)
         risk_target (float, optional): 目标风险，如果提供，则最终优化出的权重对应的风险会调整到该目标值。默认为None。
         constraint (dict, optional): 额外的约束条件，格式为Scipy的minimize函数接受的约束条件。默认为None。
         weight_bounds (tuple, optional): 权重的边界，格式为(min_weight, max_weight)。默认为(0, 1)。
+        cov_mat (numpy.ndarray, optional): 预先计算的协方差矩阵（如RollingCov.cov()），默认为None，此时由returns计算。
+        dtype (numpy.dtype, optional): 优化迭代中协方差矩阵的存储精度，默认为np.float64。
+            资产较多时可设为np.float32以减半内存带宽（条件数超过1e5时自动退回float64）。
+        validate (bool, optional): 是否剔除含缺失值的行，默认为True。调用方已保证数据无缺失值时可设为False，跳过逐行检查。
 
     Returns:
         np.ndarray: 最优权重数组，形状为(n,)，其中n为资产的数量。
 
     """
     n = returns.shape[1]
-    returns = returns.dropna()
 
-    # 计算协方差矩阵
-    cov_mat = returns.cov().values
+    # 计算协方差矩阵（目标函数使用连续内存的副本）
+    cov_mat = _resolve_cov(returns, cov_mat, validate)
+    obj_cov = _objective_cov(cov_mat, dtype)
 
-    # 定义目标函数
-    def objective(weights):
-        # 计算每个资产的风险贡献
-        portfolio_variance = np.dot(weights.T, np.dot(cov_mat, weights))
-        portfolio_std_dev = np.sqrt(portfolio_variance)
-        marginal_risk = np.dot(cov_mat, weights) / portfolio_std_dev
-        risk_contribution = weights * marginal_risk
+    # 目标函数量级与方差相同，按平均方差归一化以免SLSQP在初始点附近提前终止
+    scale = n / np.trace(cov_mat)
 
-        # 计算风险贡献的方差
-        target_risk_contribution = portfolio_std_dev / n
-        risk_diff = risk_contribution - target_risk_contribution
-        return np.sum(risk_diff ** 2)
+    # 定义目标函数（由jit内核一次性计算目标值与解析梯度）
+    def objective(weights):
+        return _risk_parity_objective(weights, obj_cov, scale)
 
     # 初始权重
-    initial_weights = np.array([1.0 / n] * n)
+    initial_weights = np.full(n, 1.0 / n)
 
     # 权重约束
-    bounds = tuple(weight_bounds for _ in range(n))
+    bounds = _weight_bounds(n, weight_bounds)
 
     # 权重和为1的约束
-    constraints = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1.0}]
+    constraints = [_BUDGET_CONSTRAINT]
     if constraint is not None:
         constraints.append(constraint)
 
@@ -169,8 +441,10 @@ def risk_parity(returns, risk_target=None, constraint=None, weight_bounds=(0, 1)
         objective,
         initial_weights,
         method='SLSQP',
+        jac=True,
         bounds=bounds,
-        constraints=constraints
+        constraints=constraints,
+        options=_SLSQP_OPTIONS
     )
 
     # 如果有目标风险，进行调整
@@ -182,6 +456,274 @@ def risk_parity(returns, risk_target=None, constraint=None, weight_bounds=(0, 1)
     return weights
 
 
+@njit(fastmath=_REDUCE_FASTMATH, cache=True)
+def _risk_parity_objective(weights, cov_mat, scale):
+    """
+    风险平价目标函数及其解析梯度：Σ(RC_i - σ/n)²，RC_i = w_i·(Σw)_i/σ
+
+    两次矩阵-向量乘积与各项归约在同一内核中完成，避免每次迭代生成多个临时数组。
+    梯度：∂RC_i/∂w_j = (δ_ij·(Σw)_i + w_i·Σ_ij)/σ - w_i·(Σw)_i·(Σw)_j/σ³，∂σ/∂w = Σw/σ
+
+    Args:
+        weights (numpy.ndarray): 权重
+        cov_mat (numpy.ndarray): 协方差矩阵
+        scale (float): 目标函数缩放系数
+
+    Returns:
+        tuple: (目标函数值, 梯度)
+    """
+    n = weights.shape[0]
+    cov_w = np.empty(n)
+    var = 0.
+    for i in range(n):
+        acc = 0.
+        for j in range(n):
+            acc += cov_mat[i, j] * weights[j]
+        cov_w[i] = acc
+        var += weights[i] * acc
+    std = np.sqrt(var)
+    target = std / n
+
+    # 风险贡献偏差及其加权值
+    weighted_diff = np.empty(n)
+    value = 0.
+    diff_sum = 0.
+    diff_dot = 0.
+    for i in range(n):
+        diff = weights[i] * cov_w[i] / std - target
+        value += diff * diff
+        diff_sum += diff
+        weighted_diff[i] = diff * weights[i]
+        diff_dot += weighted_diff[i] * cov_w[i]
+    coef = diff_dot / std ** 3 + diff_sum / (n * std)
+
+    grad = np.empty(n)
+    for i in range(n):
+        acc = 0.
+        for j in range(n):
+            acc += cov_mat[i, j] * weighted_diff[j]
+        diff = weights[i] * cov_w[i] / std - target
+        grad[i] = 2 * scale * ((diff * cov_w[i] + acc) / std - coef * cov_w[i])
+    return value * scale, grad
+
+
+@njit(fastmath=_REDUCE_FASTMATH, cache=True)
+def _diversification_objective(weights, cov_mat, vol):
+    """
+    负分散化比率 -σᵀw/√(wᵀΣw) 及其解析梯度，单次矩阵-向量乘积
+
+    Args:
+        weights (numpy.ndarray): 权重
+        cov_mat (numpy.ndarray): 协方差矩阵
+        vol (numpy.ndarray): 各资产波动率
+
+    Returns:
+        tuple: (目标函数值, 梯度)
+    """
+    n = weights.shape[0]
+    cov_w = np.empty(n)
+    var = 0.
+    weighted_vol = 0.
+    for i in range(n):
+        acc = 0.
+        for j in range(n):
+            acc += cov_mat[i, j] * weights[j]
+        cov_w[i] = acc
+        var += weights[i] * acc
+        weighted_vol += vol[i] * weights[i]
+    std = np.sqrt(var)
+
+    grad = np.empty(n)
+    coef = weighted_vol / std ** 3
+    for i in range(n):
+        grad[i] = coef * cov_w[i] - vol[i] / std
+    return -weighted_vol / std, grad
+
+
+def _batch_windows(returns, window, step):
+    """转为连续float64数组并校验窗口参数，返回 (数据, 窗口数)"""
+    data = np.ascontiguousarray(returns, dtype=np.float64)
+    if data.ndim != 2:
+        raise ValueError("returns必须为二维收益率矩阵")
+    if window < 2 or step < 1:
+        raise ValueError("window至少为2，step至少为1")
+    return data, max((data.shape[0] - window) // step + 1, 0)
+
+
+def min_variance_batch(returns, window, step=1):
+    """
+    滚动窗口最小方差组合批量求解
+
+    对每个窗口 returns[k*step : k*step+window] 计算样本协方差并取解析解 w = Σ⁻¹1 / (1ᵀΣ⁻¹1)，
+    各窗口相互独立，在多核上并行求解。不施加权重边界，对应min_variance无约束、不限边界时的结果。
+
+    Args:
+        returns (DataFrame | numpy.ndarray): 收益率矩阵，形状为(T, n)
+        window (int): 窗口长度
+        step (int, optional): 相邻窗口的起点间隔，默认为1
+
+    Returns:
+        numpy.ndarray: 权重矩阵，形状为(窗口数, n)；窗口含缺失值或协方差矩阵非正定时该行为NaN
+    """
+    data, n_windows = _batch_windows(returns, window, step)
+    out = np.empty((n_windows, data.shape[1]))
+    _min_variance_windows(data, window, step, out)
+    return out
+
+
+def risk_parity_batch(returns, window, step=1, max_iter=500, tol=1e-10):
+    """
+    滚动窗口风险平价（等风险贡献）组合批量求解
+
+    以循环坐标下降法（Griveau-Billion等，2013）代替SLSQP：逐个资产求解 w_i·(Σw)_i = σ(w)/n 的正根，
+    迭代收敛后归一化，结果为仅多头的等风险贡献组合；各窗口在多核上并行求解。
+
+    Args:
+        returns (DataFrame | numpy.ndarray): 收益率矩阵，形状为(T, n)
+        window (int): 窗口长度
+        step (int, optional): 相邻窗口的起点间隔，默认为1
+        max_iter (int, optional): 每个窗口的最大迭代轮数，默认为500
+        tol (float, optional): 收敛容差（一轮迭代中权重的最大变化），默认为1e-10
+
+    Returns:
+        numpy.ndarray: 权重矩阵，形状为(窗口数, n)；窗口含缺失值或存在零方差资产时该行为NaN
+    """
+    data, n_windows = _batch_windows(returns, window, step)
+    out = np.empty((n_windows, data.shape[1]))
+    _risk_parity_windows(data, window, step, max_iter, tol, out)
+    return out
+
+
+@njit(fastmath=_REDUCE_FASTMATH, cache=True)
+def _window_cov(data, start, window):
+    """窗口 data[start:start+window] 的样本协方差矩阵（自由度window-1）"""
+    n = data.shape[1]
+    mean = np.zeros(n)
+    for t in range(start, start + window):
+        for j in range(n):
+            mean[j] += data[t, j]
+    for j in range(n):
+        mean[j] /= window
+
+    cov_mat = np.zeros((n, n))
+    dev = np.empty(n)
+    for t in range(start, start + window):
+        for j in range(n):
+            dev[j] = data[t, j] - mean[j]
+        for i in range(n):
+            for j in range(i + 1):
+                cov_mat[i, j] += dev[i] * dev[j]
+    for i in range(n):
+        for j in range(i + 1):
+            cov_mat[i, j] /= window - 1
+            cov_mat[j, i] = cov_mat[i, j]
+    return cov_mat
+
+
+@njit(cache=True)
+def _chol_solve_ones(cov_mat, out):
+    """
+    Cholesky分解求解 Σz = 1 并归一化为权重写入out；矩阵非正定（含NaN）时写入NaN
+
+    Args:
+        cov_mat (numpy.ndarray): 协方差矩阵，分解时被下三角因子覆盖
+        out (numpy.ndarray): 输出权重
+    """
+    n = cov_mat.shape[0]
+    for j in range(n):
+        diag = cov_mat[j, j]
+        for k in range(j):
+            diag -= cov_mat[j, k] * cov_mat[j, k]
+        if not diag > 0:
+            out[:] = np.nan
+            return
+        diag = np.sqrt(diag)
+        cov_mat[j, j] = diag
+        for i in range(j + 1, n):
+            acc = cov_mat[i, j]
+            for k in range(j):
+                acc -= cov_mat[i, k] * cov_mat[j, k]
+            cov_mat[i, j] = acc / diag
+
+    # 前代 Ly = 1，回代 Lᵀz = y
+    for i in range(n):
+        acc = 1.
+        for k in range(i):
+            acc -= cov_mat[i, k] * out[k]
+        out[i] = acc / cov_mat[i, i]
+    total = 0.
+    for i in range(n - 1, -1, -1):
+        acc = out[i]
+        for k in range(i + 1, n):
+            acc -= cov_mat[k, i] * out[k]
+        out[i] = acc / cov_mat[i, i]
+        total += out[i]
+    for i in range(n):
+        out[i] /= total
+
+
+@njit(parallel=True, cache=True)
+def _min_variance_windows(data, window, step, out):
+    """并行求解各窗口的最小方差权重，写入out的对应行"""
+    for k in prange(out.shape[0]):
+        _chol_solve_ones(_window_cov(data, k * step, window), out[k])
+
+
+@njit(cache=True)
+def _risk_parity_ccd(cov_mat, max_iter, tol, out):
+    """
+    循环坐标下降求解等风险贡献权重并归一化写入out；协方差含NaN或存在零方差资产时写入NaN
+
+    第i个坐标的更新为 Σ_ii·w_i² + c_i·w_i - σ/n = 0 的正根，其中 c_i = (Σw)_i - Σ_ii·w_i，
+    更新后增量维护Σw与组合方差。
+    """
+    n = cov_mat.shape[0]
+    for i in range(n):
+        if not cov_mat[i, i] > 0:
+            out[:] = np.nan
+            return
+        for j in range(n):
+            if not np.isfinite(cov_mat[i, j]):
+                out[:] = np.nan
+                return
+
+    # 以波动率倒数为初始权重
+    for i in range(n):
+        out[i] = 1 / np.sqrt(cov_mat[i, i])
+    cov_w = np.dot(cov_mat, out)
+    var = np.dot(out, cov_w)
+
+    budget = 1. / n
+    for _ in range(max_iter):
+        max_change = 0.
+        for i in range(n):
+            sii = cov_mat[i, i]
+            c = cov_w[i] - sii * out[i]
+            new = (np.sqrt(c * c + 4 * sii * budget * np.sqrt(var)) - c) / (2 * sii)
+            delta = new - out[i]
+            if delta != 0.:
+                var += delta * (2 * cov_w[i] + sii * delta)
+                for j in range(n):
+                    cov_w[j] += cov_mat[j, i] * delta
+                out[i] = new
+            max_change = max(max_change, abs(delta))
+        if max_change < tol:
+            break
+
+    total = 0.
+    for i in range(n):
+        total += out[i]
+    for i in range(n):
+        out[i] /= total
+
+
+@njit(parallel=True, cache=True)
+def _risk_parity_windows(data, window, step, max_iter, tol, out):
+    """并行求解各窗口的等风险贡献权重，写入out的对应行"""
+    for k in prange(out.shape[0]):
+        _risk_parity_ccd(_window_cov(data, k * step, window), max_iter, tol, out[k])
+
+
 def equal_weight(returns):
     """
     等权重投资组合
@@ -194,25 +736,28 @@ def equal_weight(returns):
 
     """
     n = returns.shape[1]
-    return np.array([1.0 / n] * n)
+    return np.full(n, 1.0 / n)
 
 
-def equal_risk_contribution(returns, risk_target=None):
+def equal_risk_contribution(returns, risk_target=None, cov_mat=None, validate=True):
     """
     等风险贡献投资组合函数。
 
     Args:
         returns (numpy.ndarray): 收益率矩阵，形状为 (n_assets, n_periods)，其中 n_assets 是资产数量，n_periods 是时间周期数。
         risk_target (float, optional): 目标风险水平。默认为 None，表示不设置目标风险。
+        cov_mat (numpy.ndarray, optional): 预先计算的协方差矩阵（如RollingCov.cov()），默认为None，此时由returns计算。
+        validate (bool, optional): 是否剔除含缺失值的行，默认为True。调用方已保证数据无缺失值时可设为False，跳过逐行检查。
 
     Returns:
         numpy.ndarray: 最优权重向量，长度为 n_assets，表示每个资产的最优配置权重。
 
     """
-    return risk_parity(returns, risk_target)
+    return risk_parity(returns, risk_target, cov_mat=cov_mat, validate=validate)
 
 
-def max_diversification(returns, constraint=None, weight_bounds=(0, 1)):
+def max_diversification(returns, constraint=None, weight_bounds=(0, 1), cov_mat=None, dtype=np.float64,
+                        validate=True):
     """
     最大分散化投资组合优化
 
@@ -220,33 +765,43 @@ def max_diversification(returns, constraint=None, weight_bounds=(0, 1)):
         returns (DataFrame): 收益率矩阵
         constraint (function, optional): 自定义约束条件，默认为None。
         weight_bounds (tuple, optional): 权重边界，默认为(0, 1)。
+        cov_mat (numpy.ndarray, optional): 预先计算的协方差矩阵（如RollingCov.cov()），默认为None，此时由returns计算。
+        dtype (numpy.dtype, optional): 优化迭代中协方差矩阵的存储精度，默认为np.float64。
+            资产较多时可设为np.float32以减半内存带宽（条件数超过1e5时自动退回float64）。
+        validate (bool, optional): 是否剔除含缺失值的行，默认为True。调用方已保证数据无缺失值时可设为False，跳过逐行检查。
 
     Returns:
         ndarray: 最优权重
 
     """
     n = returns.shape[1]
-    returns = returns.dropna()
 
     # 计算协方差矩阵和波动率
-    cov_mat = returns.cov().values
+    cov_mat = _resolve_cov(returns, cov_mat, validate)
     vol = np.sqrt(np.diag(cov_mat))
 
-    # 定义目标函数（负分散化比率，因为我们要最小化）
+    # 无额外约束时先取解析解 w ∝ Σ⁻¹σ，满足权重边界则直接返回
+    if constraint is None:
+        z = _cov_solve(cov_mat, vol)
+        if z is not None and np.sum(z) > 0:
+            weights = z / np.sum(z)
+            if _in_bounds(weights, weight_bounds):
+                return weights
+
+    # 定义目标函数（负分散化比率，因为我们要最小化；由jit内核一次性计算目标值与解析梯度）
+    obj_cov = _objective_cov(cov_mat, dtype)
+
     def objective(weights):
-        portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(cov_mat, weights)))
-        weighted_vol = np.sum(weights * vol)
-        diversification_ratio = weighted_vol / portfolio_vol
-        return -diversification_ratio
+        return _diversification_objective(weights, obj_cov, vol)
 
     # 初始权重
-    initial_weights = np.array([1.0 / n] * n)
+    initial_weights = np.full(n, 1.0 / n)
 
     # 权重约束
-    bounds = tuple(weight_bounds for _ in range(n))
+    bounds = _weight_bounds(n, weight_bounds)
 
     # 权重和为1的约束
-    constraints = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1.0}]
+    constraints = [_BUDGET_CONSTRAINT]
     if constraint is not None:
         constraints.append(constraint)
 
@@ -255,14 +810,16 @@ def max_diversification(returns, constraint=None, weight_bounds=(0, 1)):
         objective,
         initial_weights,
         method='SLSQP',
+        jac=True,
         bounds=bounds,
-        constraints=constraints
+        constraints=constraints,
+        options=_SLSQP_OPTIONS
     )
 
     return result['x']
 
 
-def mean_cvar(returns, alpha=0.05, constraint=None, weight_bounds=(0, 1)):
+def mean_cvar(returns, alpha=0.05, constraint=None, weight_bounds=(0, 1), validate=True):
     """
     均值-条件风险价值(CVaR)投资组合优化
 
@@ -271,31 +828,40 @@ def mean_cvar(returns, alpha=0.05, constraint=None, weight_bounds=(0, 1)):
         alpha (float, optional): 显著性水平，用于计算条件风险价值(CVaR)。默认为0.05。
         constraint (dict, optional): 优化问题的额外约束条件。默认为None。
         weight_bounds (tuple, optional): 权重的上下界。默认为(0, 1)，表示权重必须在0到1之间。
+        validate (bool, optional): 是否剔除含缺失值的行，默认为True。调用方已保证数据无缺失值时可设为False，跳过逐行检查。
 
     Returns:
         numpy.ndarray: 最优权重向量。
 
     """
     n = returns.shape[1]
-    returns = returns.dropna()
-    T = returns.shape[0]
+    data = _complete_rows(returns, validate)
+    T = data.shape[0]
+
+    # 尾部样本数（至少1个，否则CVaR无定义）
+    var_index = max(1, int(alpha * T))
 
-    # 定义目标函数
+    # 无额外约束时按Rockafellar-Uryasev线性规划精确求解，失败时退回SLSQP
+    if constraint is None:
+        weights = _mean_cvar_lp(data, var_index, weight_bounds)
+        if weights is not None:
+            return weights
+
+    # 定义目标函数：部分排序取最差的var_index个收益，无需完整排序
     def objective(weights):
-        portfolio_returns = np.dot(returns, weights)
-        sorted_returns = np.sort(portfolio_returns)
-        var_index = int(alpha * T)
-        cvar = -np.mean(sorted_returns[:var_index])
+        portfolio_returns = np.dot(data, weights)
+        tail = np.partition(portfolio_returns, var_index - 1)[:var_index]
+        cvar = -np.mean(tail)
         return cvar
 
     # 初始权重
-    initial_weights = np.array([1.0 / n] * n)
+    initial_weights = np.full(n, 1.0 / n)
 
     # 权重约束
-    bounds = tuple(weight_bounds for _ in range(n))
+    bounds = _weight_bounds(n, weight_bounds)
 
     # 权重和为1的约束
-    constraints = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1.0}]
+    constraints = [_BUDGET_CONSTRAINT]
     if constraint is not None:
         constraints.append(constraint)
 
@@ -305,13 +871,43 @@ def mean_cvar(returns, alpha=0.05, constraint=None, weight_bounds=(0, 1)):
         initial_weights,
         method='SLSQP',
         bounds=bounds,
-        constraints=constraints
+        constraints=constraints,
+        options=_SLSQP_OPTIONS
     )
 
     return result['x']
 
 
-def black_litterman(returns, market_caps, views=None, view_confidences=None, tau=0.05, risk_aversion=2.5):
+def _mean_cvar_lp(data, var_index, weight_bounds):
+    """
+    以线性规划求解最小CVaR组合（Rockafellar-Uryasev形式）：
+        min ζ + (1/k)·Σs_t,  s.t. s_t ≥ -r_tᵀw - ζ, s_t ≥ 0, Σw = 1
+    k为整数时最优值恰为最差k个组合收益的平均损失，与SLSQP目标函数一致。
+
+    Args:
+        data (numpy.ndarray): 不含缺失值的收益率矩阵，形状为(T, n)
+        var_index (int): 尾部样本数k
+        weight_bounds (tuple): 权重边界
+
+    Returns:
+        numpy.ndarray: 最优权重；求解失败时返回None
+    """
+    T, n = data.shape
+    # 变量顺序：[w (n), ζ (1), s (T)]
+    c = np.concatenate([np.zeros(n), [1.], np.full(T, 1. / var_index)])
+    a_ub = sparse.hstack([sparse.csr_matrix(-data), -np.ones((T, 1)), -sparse.eye(T)], format="csr")
+    b_ub = np.zeros(T)
+    a_eq = np.concatenate([np.ones(n), np.zeros(T + 1)]).reshape((1, -1))
+    bounds = [weight_bounds] * n + [(None, None)] + [(0, None)] * T
+
+    result = optimize.linprog(c, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq, b_eq=[1.], bounds=bounds, method="highs")
+    if not result.success:
+        return None
+    return result.x[:n]
+
+
+def black_litterman(returns, market_caps, views=None, view_confidences=None, tau=0.05, risk_aversion=2.5,
+                    cov_mat=None, validate=True):
     """
     Black-Litterman投资组合优化算法。
 
@@ -322,16 +918,17 @@ def black_litterman(returns, market_caps, views=None, view_confidences=None, tau
         view_confidences (list, optional): 观点的置信度，应与views中的观点一一对应。默认值为None。
         tau (float, optional): 不确定性参数，用于调整市场隐含收益率和投资者观点之间的权重。默认值为0.05。
         risk_aversion (float, optional): 风险厌恶系数，用于调整投资组合的风险偏好。默认值为2.5。
+        cov_mat (numpy.ndarray, optional): 预先计算的协方差矩阵（如RollingCov.cov()），默认为None，此时由returns计算。
+        validate (bool, optional): 是否剔除含缺失值的行，默认为True。调用方已保证数据无缺失值时可设为False，跳过逐行检查。
 
     Returns:
         numpy.ndarray: 最优权重数组，表示每个资产在投资组合中的权重。
 
     """
     n = returns.shape[1]
-    returns = returns.dropna()
 
     # 计算协方差矩阵
-    cov_mat = returns.cov().values
+    cov_mat = _resolve_cov(returns, cov_mat, validate)
 
     # 计算市场隐含收益率
     market_weights = market_caps / np.sum(market_caps)
@@ -341,118 +938,152 @@ def black_litterman(returns, market_caps, views=None, view_confidences=None, tau
     if views is None:
         return market_weights
 
-    # 处理观点
+    # 处理观点：列名到下标的映射只建立一次，逐资产以字典查找代替 columns.get_loc
     k = len(views)
+    col_idx = dict(zip(returns.columns, range(n)))
     P = np.zeros((k, n))
-    q = np.zeros(k)
+    q = np.fromiter(views.keys(), dtype=np.float64, count=k)
 
-    for i, (view, assets) in enumerate(views.items()):
+    for i, assets in enumerate(views.values()):
+        view_row = P[i]
         for asset, weight in assets.items():
-            asset_idx = returns.columns.get_loc(asset)
-            P[i, asset_idx] = weight
-        q[i] = view
+            view_row[col_idx[asset]] = weight
 
     # 观点不确定性矩阵
-    omega = np.diag([1 / conf for conf in view_confidences]) if view_confidences else np.eye(k)
-
-    # 计算后验收益率
-    tau_cov = tau * cov_mat
-    inv_tau_cov = np.linalg.inv(tau_cov)
-    inv_omega = np.linalg.inv(omega)
-
-    post_cov = np.linalg.inv(inv_tau_cov + np.dot(P.T, np.dot(inv_omega, P)))
-    post_ret = np.dot(post_cov, np.dot(inv_tau_cov, pi) + np.dot(P.T, np.dot(inv_omega, q)))
+    if view_confidences is not None and len(view_confidences) > 0:
+        omega = np.diag(1.0 / np.asarray(view_confidences, dtype=np.float64))
+    else:
+        omega = np.eye(k)
+
+    # 计算后验收益率：μ = π + τΣPᵀ(PτΣPᵀ + Ω)⁻¹(q - Pπ)
+    # 与 [(τΣ)⁻¹ + PᵀΩ⁻¹P]⁻¹[(τΣ)⁻¹π + PᵀΩ⁻¹q] 等价，只需求解一个k×k（观点数）的正定方程组，无需三次n×n求逆
+    tau_cov_pt = tau * np.dot(cov_mat, P.T)
+    view_cov = np.dot(P, tau_cov_pt) + omega
+    post_ret = pi + np.dot(tau_cov_pt, linalg.solve(view_cov, q - np.dot(P, pi), assume_a='pos'))
+
+    # 权重和为1约束下的均值方差解析解 w = Σ⁻¹(μ - λ1) / γ，满足[0, 1]边界则直接返回
+    z = _cov_solve(cov_mat, np.column_stack([np.ones(n), post_ret]))
+    if z is not None:
+        lam = (np.sum(z[:, 1]) - risk_aversion) / np.sum(z[:, 0])
+        weights = (z[:, 1] - lam * z[:, 0]) / risk_aversion
+        if _in_bounds(weights, (0, 1)):
+            return weights
 
     # 使用后验收益率和协方差进行均值方差优化
     def objective(weights):
-        portfolio_return = np.sum(post_ret * weights)
-        portfolio_variance = np.dot(weights.T, np.dot(cov_mat, weights))
+        cov_w = np.dot(cov_mat, weights)
+        portfolio_return = np.dot(post_ret, weights)
+        portfolio_variance = np.dot(weights, cov_w)
         utility = portfolio_return - 0.5 * risk_aversion * portfolio_variance
-        return -utility
+        return -utility, -(post_ret - risk_aversion * cov_w)
 
     # 初始权重
     initial_weights = market_weights.copy()
 
     # 权重约束
-    bounds = tuple((0, 1) for _ in range(n))
+    bounds = _weight_bounds(n, (0, 1))
 
     # 权重和为1的约束
-    constraints = [{'type': 'eq', 'fun': lambda x: np.sum(x) - 1.0}]
+    constraints = [_BUDGET_CONSTRAINT]
 
     # 优化
     result = optimize.minimize(
         objective,
         initial_weights,
         method='SLSQP',
+        jac=True,
         bounds=bounds,
-        constraints=constraints
+        constraints=constraints,
+        options=_SLSQP_OPTIONS
     )
 
     return result['x']
 
 
-def hierarchical_risk_parity(returns):
+def hierarchical_risk_parity(returns, cov_mat=None, use_olo=True, validate=True):
     """
     层次风险平价投资组合优化算法。
 
     Args:
         returns (pandas.DataFrame): 收益率矩阵，其中每一列代表一个资产的收益率序列。
+        cov_mat (numpy.ndarray, optional): 预先计算的协方差矩阵（如RollingCov.cov()），默认为None，此时由returns计算。
+        use_olo (bool, optional): 是否对聚类树做最优叶节点排序（optimal_leaf_ordering，复杂度O(n³)），默认为True。
+            设为False时直接使用聚类树的叶节点顺序（即Lopez de Prado原始算法的准对角化顺序），资产较多时显著更快。
+        validate (bool, optional): 是否剔除含缺失值的行，默认为True。调用方已保证数据无缺失值时可设为False，跳过逐行检查。
 
     Returns:
         numpy.ndarray: 最优权重向量，表示每个资产在投资组合中的权重。
 
     """
     n = returns.shape[1]
-    returns = returns.dropna()
-
-    # 计算协方差矩阵和相关性矩阵
-    cov_mat = returns.cov().values
-    corr_mat = returns.corr().values
 
-    # 计算距离矩阵
-    dist = np.sqrt(0.5 * (1 - corr_mat))
+    # 计算协方差矩阵，由协方差就地换算相关性矩阵与距离矩阵，不再生成中间矩阵
+    cov_mat = _resolve_cov(returns, cov_mat, validate)
+    std = np.sqrt(np.diag(cov_mat))
+    dist = cov_mat / np.outer(std, std)
+    np.clip(dist, -1, 1, out=dist)
+    np.subtract(1, dist, out=dist)
+    dist *= 0.5
+    np.sqrt(dist, out=dist)
 
-    # 层次聚类
+    # 层次聚类：以距离矩阵各行为观测计算欧氏距离（“距离的距离”），压缩形式只计算一次，供聚类与叶节点排序共用
     from scipy.cluster import hierarchy
-    link = hierarchy.linkage(dist, 'single')
+    from scipy.spatial.distance import pdist
+    dist_condensed = pdist(dist)
+    del dist
+    link = hierarchy.linkage(dist_condensed, 'single')
 
     # 获取聚类顺序
-    order = hierarchy.leaves_list(hierarchy.optimal_leaf_ordering(link, dist))
+    if use_olo:
+        link = hierarchy.optimal_leaf_ordering(link, dist_condensed)
+    order = hierarchy.leaves_list(link)
 
     # 计算方差
-    var = np.diag(cov_mat)
+    var = np.diag(cov_mat).copy()
 
-    # 初始化权重
-    weights = np.ones(n) / n
+    # 初始化权重并迭代二分求解（各层左右权重之和为1，初始权重取1使最终权重和为1）
+    weights = np.ones(n)
+    _hrp_bisect(order.astype(np.int64), var, weights)
 
-    # 递归二分求解
-    def bisect(cluster, weights):
-        if len(cluster) == 1:
-            return
+    return weights
+
+
+@njit(cache=True)
+def _hrp_bisect(order, var, weights):
+    """
+    层次风险平价的二分权重分配（以栈代替递归，就地更新weights）
+
+    Args:
+        order (numpy.ndarray): 聚类排序后的资产下标
+        var (numpy.ndarray): 各资产方差
+        weights (numpy.ndarray): 初始权重，按二分结果就地缩放
+    """
+    stack = [(0, order.shape[0])]
+    while len(stack) > 0:
+        lo, hi = stack.pop()
+        if hi - lo <= 1:
+            continue
 
         # 二分聚类
-        mid = len(cluster) // 2
-        left_cluster = cluster[:mid]
-        right_cluster = cluster[mid:]
+        mid = lo + (hi - lo) // 2
 
         # 计算子聚类的方差
-        left_var = np.sum(var[left_cluster])
-        right_var = np.sum(var[right_cluster])
+        left_var = 0.
+        for k in range(lo, mid):
+            left_var += var[order[k]]
+        right_var = 0.
+        for k in range(mid, hi):
+            right_var += var[order[k]]
 
         # 按照方差的倒数分配权重
         left_weight = 1 / left_var / (1 / left_var + 1 / right_var)
         right_weight = 1 - left_weight
 
         # 更新权重
-        weights[left_cluster] *= left_weight
-        weights[right_cluster] *= right_weight
-
-        # 递归处理子聚类
-        bisect(left_cluster, weights)
-        bisect(right_cluster, weights)
-
-    # 开始递归
-    bisect(order, weights)
-
-    return weights
+        for k in range(lo, mid):
+            weights[order[k]] *= left_weight
+        for k in range(mid, hi):
+            weights[order[k]] *= right_weight
 
+        stack.append((mid, hi))
+        stack.append((lo, mid))
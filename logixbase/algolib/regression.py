@@ -11,14 +11,19 @@
 这些函数可以帮助进行基本的线性回归分析，计算回归系数，并评估模型的拟合优度。
 """
 import numpy as np
-import scipy.stats as st
 import statsmodels.api as sm
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import linalg
+from scipy.signal import lfilter
+from scipy.special import chdtrc, fdtrc
 
-from numba import njit, jit
+from numba import njit
 from math import sqrt
 
+from .utils import _REDUCE_FASTMATH
 
-@njit
+
+@njit(fastmath=_REDUCE_FASTMATH)
 def regress(y: np.array, x: np.array):
     """
     对y和x进行线性回归，返回斜率、截距和残差。
@@ -31,21 +36,27 @@ def regress(y: np.array, x: np.array):
         tuple: 包含斜率(b1)，截距(b0)和残差(r)的元组。
 
     """
-    mask = np.isfinite(x) & np.isfinite(y)
-    x_ = x[mask]
-    y_ = y[mask]
-
-    sum_xy = 0
-    sum_xx = 0
-    sum_yy = 0
+    # 仅使用x、y均为有限值的样本；逐元素判断代替布尔索引，不复制数组
+    n = x.shape[0]
+    count = 0
+    sum_x = 0.
+    sum_y = 0.
+    for i in range(n):
+        if np.isfinite(x[i]) and np.isfinite(y[i]):
+            sum_x += x[i]
+            sum_y += y[i]
+            count += 1
 
-    x_mean = np.mean(x_)
-    y_mean = np.mean(y_)
+    x_mean = sum_x / count if count > 0 else np.nan
+    y_mean = sum_y / count if count > 0 else np.nan
 
-    for i in range(x_.shape[0]):
-        sum_xy += (x_[i] - x_mean) * (y_[i] - y_mean)
-        sum_xx += pow(x_[i] - x_mean, 2)
-        sum_yy += pow(y_[i] - y_mean, 2)
+    sum_xy = 0.
+    sum_xx = 0.
+    for i in range(n):
+        if np.isfinite(x[i]) and np.isfinite(y[i]):
+            dx = x[i] - x_mean
+            sum_xy += dx * (y[i] - y_mean)
+            sum_xx += dx * dx
 
     if sum_xx != 0:
         b1 = sum_xy / sum_xx
@@ -125,7 +136,7 @@ def regress_full(y, x):
     return (a, t_a), (b, t_b)
 
 
-@njit
+@njit(fastmath=_REDUCE_FASTMATH)
 def r_square(x, y):
     """
     计算x对y线性回归的R方
@@ -141,17 +152,17 @@ def r_square(x, y):
     x_mean = np.mean(x)
     y_mean = np.mean(y)
 
-    ssr = 0
-    x_var = 0
-    y_var = 0
+    ssr = 0.
+    x_var = 0.
+    y_var = 0.
 
     for i in range(x.shape[0]):
         err_x = x[i] - x_mean
         err_y = y[i] - y_mean
 
         ssr += err_x * err_y
-        x_var += err_x ** 2
-        y_var += err_y ** 2
+        x_var += err_x * err_x
+        y_var += err_y * err_y
 
     sst = np.sqrt(x_var * y_var)
 
@@ -187,11 +198,9 @@ def f_stat(y: np.array, y_: np.array, n_freedom: int):
         return (ssr / n_freedom) / (sse / n)
 
 
-@jit
 def f_pvalue(y: np.array, y_: np.array, n_freedom: int):
     """
-    @jit
-    计算F统计量的p值
+    计算F统计量的p值（直接调用F分布生存函数 scipy.special.fdtrc）
 
     Args:
         y (np.array): 实际值数组
@@ -204,7 +213,7 @@ def f_pvalue(y: np.array, y_: np.array, n_freedom: int):
     """
     n = y.shape[0] - n_freedom - 1
     f_value = f_stat(y, y_, n_freedom)
-    p = 1 - st.f.cdf(f_value, n_freedom, n)
+    p = fdtrc(n_freedom, n, f_value)
     return p
 
 
@@ -271,22 +280,20 @@ def ivxlh(yt: np.array, xt: np.array, k: int, print_res: bool = False):
     xt = xt[1:, :]
     y = yt[1:]
 
-    nn, m = xlag.shape
+    # nn: 样本数, l: 预测变量个数
+    nn, l = xlag.shape
     x_ = np.hstack((np.ones((nn, 1)), xlag))
 
     wivx = np.zeros(2)
-    wivx_ind = np.zeros((2, m))
+    wivx_ind = np.zeros((2, l))
 
     # Predictive regression residual estimation
     md = sm.OLS(y, x_)
     res = md.fit()
     epshat = res.resid
 
-    rn = np.zeros((m, m))
-    for i in range(m):
-        md_1 = sm.OLS(xt[:, i], xlag[:, i])
-        res_1 = md_1.fit()
-        rn[i, i] = res_1.params
+    # 各预测变量的无截距AR(1)系数
+    rn = np.diag(np.sum(xt * xlag, axis=0) / np.sum(xlag * xlag, axis=0))
 
     # autoregressive residual estimation
     u = xt - xlag.dot(rn)
@@ -296,65 +303,40 @@ def ivxlh(yt: np.array, xt: np.array, k: int, print_res: bool = False):
 
     # covariance matrix estimation(predictive regression)
     covepshat = epshat.dot(epshat) / nn
-    covu = np.zeros((m, m))
-    if len(u.shape) == 1:
-        u = u.reshape((len(u), 1))
-    for t in range(nn):
-        covu = covu + u[t:(t + 1), :].T.dot(u[t:(t + 1), :])
 
     # covariance matrix estimation (autoregression)
-    covu = covu / nn
-    covuhat = np.zeros((1, m))
-    for j in range(m):
-        covuhat[0, j] = np.sum(epshat * u[:, j])
+    covu = u.T.dot(u) / nn
 
     # covariance matrix between 'epshat' and 'u'
-    covuhat = covuhat.T / nn
+    covuhat = u.T.dot(epshat).reshape((l, 1)) / nn
 
+    # Newey-West长期协方差：m为截断滞后阶数，各阶滞后叉积以矩阵乘法计算
     m = int(np.floor(np.power(nn, 1 / 3)))
-    uu = np.zeros((m, m))
-    for h in range(m):
-        a = np.zeros((m, m))
-        for s in range(nn - h - 1):
-            t = s + h + 1
-            a = a + u[t:t + 1, :].T.dot(u[t - h - 1:t - h, :])
-        uu = uu + (1 - (h + 1) / (1 + m)) * a
+    uu = np.zeros((l, l))
+    residue = np.zeros(l)
+    for h in range(1, m + 1):
+        weight = 1 - h / (1 + m)
+        uu = uu + weight * u[h:, :].T.dot(u[:-h, :])
+        residue = residue + weight * epshat[:-h].dot(u[h:, :])
 
     uu = uu / nn
     omegauu = covu + uu + uu.T
 
-    q = np.zeros((m, m))
-    for h in range(m):
-        p = np.zeros((nn - h, m))
-        for t in range(nn - h - 1):
-            t = t + h + 1
-            p[t - h, :] = u[t, :] * epshat[t - h - 1]
-        q[h, :] = (1 - (h + 1) / (1 + m)) * p.sum(axis=0)
+    residue = residue / nn
+    omegaeu = covuhat + residue.reshape((l, 1))
 
-    residue = q.sum(axis=0) / nn
-    omegaeu = covuhat + residue.reshape((len(residue), 1))
-
-    # instrument construction
+    # instrument construction: z{t} = rz * z{t-1} + dx{t}，rz为标量乘单位阵，按列一阶递推滤波
     n = nn - k + 1
-    rz = (1 - 1 / np.power(nn, 0.95)) * np.eye(m)
+    rz = 1 - 1 / np.power(nn, 0.95)
     diffx = xt - xlag
-    z = np.zeros((nn, m))
-    z[0, :] = diffx[0, :]
-    for i in range(nn - 1):
-        i = i + 1
-        z[i, :] = z[i - 1:i, :].dot(rz) + diffx[i, :]
+    z_full = lfilter([1.], [1., -rz], diffx, axis=0)
 
-    z = np.vstack((np.zeros((1, m)), z[0:n - 1, :]))
+    z = np.vstack((np.zeros((1, l)), z_full[0:n - 1, :]))
+    zz = np.vstack((np.zeros((1, l)), z_full[0:nn - 1, :]))
 
-    zz = np.vstack((np.zeros((1, m)), z[0:nn - 1, :]))
-
-    zk = np.zeros((n, m))
-    for i in range(n):
-        zk[i, :] = zz[i:i + k, :].sum(axis=0)
-
-    yy = np.zeros((n, 1))
-    for i in range(n):
-        yy[i] = y[i:i + k].sum()
+    # 长度为k的滑动窗口求和（共n个窗口）
+    zk = sliding_window_view(zz, k, axis=0).sum(axis=-1)
+    yy = sliding_window_view(y, k).sum(axis=-1).reshape((n, 1))
 
     if k == 1:
         md = sm.OLS(yy, x_)
@@ -365,33 +347,46 @@ def ivxlh(yt: np.array, xt: np.array, k: int, print_res: bool = False):
     aols = res.params
     apval = res.pvalues
 
-    x_k = np.zeros((n, m))
-    for i in range(n):
-        x_k[i, :] = xlag[i:i + k, :].sum(axis=0)
+    x_k = sliding_window_view(xlag, k, axis=0).sum(axis=-1)
 
-    meanx_k = x_k.mean(axis=0)
     y_t = yy - yy.mean()
-    x_t = np.zeros((n, m))
-    for j in range(m):
-        x_t[:, j] = x_k[:, j] - meanx_k[j] * np.ones(n)
-
-    aivx = np.matmul(y_t.T.dot(z), np.linalg.pinv(x_t.T.dot(z)))
+    x_t = x_k - x_k.mean(axis=0)
+
+    # A_ivx = (yᵀz)(xᵀz)⁻¹：Z'X的LU分解只做一次，供A_ivx与Q共用；奇异时退回伪逆
+    zx = z.T.dot(x_t)
+    zx_lu = linalg.lu_factor(zx, check_finite=False)
+    zx_singular = not np.all(np.diag(zx_lu[0]))
+    if zx_singular:
+        zx_pinv = np.linalg.pinv(zx)
+        aivx = y_t.T.dot(z).dot(zx_pinv.T)
+    else:
+        aivx = linalg.lu_solve(zx_lu, z.T.dot(y_t), check_finite=False).T
     meanz_k = zk.mean(axis=0)
     meanz_k = meanz_k.reshape((1, len(meanz_k)))
 
-    f_m = covepshat - omegaeu.T.dot(np.linalg.inv(omegauu)).dot(omegaeu)
+    # Ω_uu为对称半正定的长期协方差矩阵：以Cholesky分解求解 Ω_uu⁻¹Ω_eu，非正定时退回一般求解
+    try:
+        omega_solve = linalg.cho_solve(linalg.cho_factor(omegauu, lower=True), omegaeu)
+    except linalg.LinAlgError:
+        omega_solve = linalg.solve(omegauu, omegaeu)
+    f_m = covepshat - omegaeu.T.dot(omega_solve)
     m_ = zk.T.dot(zk) * covepshat - n * meanz_k.T.dot(meanz_k) * f_m
 
-    h_ = np.eye(m)
-    aa = h_.dot(np.linalg.pinv(z.T.dot(x_t))).dot(m_)
-    bb = np.linalg.pinv(x_t.T.dot(z)).dot(h_.T)
-    q_ = aa.dot(bb)
+    # Q = (Z'X)⁻¹ M (X'Z)⁻¹（约束矩阵H为单位阵），M对称，故 Q = G(GM)ᵀ，G = (Z'X)⁻¹
+    if zx_singular:
+        q_ = zx_pinv.dot(m_).dot(zx_pinv.T)
+    else:
+        q_ = linalg.lu_solve(zx_lu, linalg.lu_solve(zx_lu, m_, check_finite=False).T, check_finite=False)
 
-    wivx[0] = h_.dot(aivx.T).T.dot(np.linalg.pinv(q_)).dot(h_).dot(aivx.T)
-    wivx[1] = 1 - st.chi2.cdf(wivx[0], m)
+    # Wald统计量 A_ivx Q⁻¹ A_ivxᵀ，以对称求解代替伪逆
+    try:
+        wivx[0] = aivx.dot(linalg.solve(q_, aivx.T, assume_a='sym', check_finite=False)).item()
+    except linalg.LinAlgError:
+        wivx[0] = aivx.dot(np.linalg.pinv(q_)).dot(aivx.T).item()
+    wivx[1] = chdtrc(l, wivx[0])
 
     wivx_ind[0, :] = aivx / np.sqrt(np.diag(q_)).T
-    wivx_ind[1, :] = 1 - st.chi2.cdf(np.power(wivx_ind[0, :], 2), 1)
+    wivx_ind[1, :] = chdtrc(1, np.power(wivx_ind[0, :], 2))
 
     # IVX estimator of Intercept
     mu_ivx = yy.mean() - aivx.dot(xt_mean)
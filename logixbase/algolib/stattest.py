@@ -4,6 +4,10 @@ import numpy as np
 from statsmodels.tsa.stattools import adfuller
 
 
+# 分布名 -> 累积分布函数，首次使用时解析并缓存，避免每次检验按名称查找分布对象
+_KS_CDF = {}
+
+
 def kstest(data: np.array, dist: str = 'norm'):
     """
     对输入数据进行假设分布的Kolmogorov-Smirnov检验
@@ -15,23 +19,29 @@ def kstest(data: np.array, dist: str = 'norm'):
     Returns:
         Tuple[float, float]: 包含Kolmogorov-Smirnov检验的统计量和p值的元组
     """
-    t, p = st.kstest(data, cdf=dist.lower())
+    name = dist.lower()
+    cdf = _KS_CDF.get(name)
+    if cdf is None:
+        cdf = _KS_CDF[name] = getattr(st.distributions, name).cdf
+    t, p = st.kstest(data, cdf)
 
     return t, p
 
 
-def adfuller_test(data: np.array):
+def adfuller_test(data: np.array, maxlag: int = None, regression: str = 'c', autolag: str = 'AIC'):
     """
     对给定的数据进行ADF（Augmented Dickey-Fuller）单位根检验。
 
     Args:
         data (np.array): 需要进行ADF检验的时间序列数据。
+        maxlag (int, optional): 最大滞后阶数，默认为None（按 12*(nobs/100)^{1/4} 确定）。
+        regression (str, optional): 回归中的确定性项，'c'、'ct'、'ctt'或'n'，默认为'c'。
+        autolag (str, optional): 滞后阶数选择准则，默认为'AIC'。
+            设为None时直接使用maxlag阶滞后，跳过逐阶回归比较，适用于对大量短序列重复检验。
 
     Returns:
         tuple: ADF检验的结果，包括检验统计量、p值、滞后阶数、使用的观测值数量、临界值和置信区间等。
 
     """
-    results = adfuller(data)
+    results = adfuller(data, maxlag=maxlag, regression=regression, autolag=autolag)
     return results
-
-
@@ -14,10 +14,10 @@
 
 import math
 import numpy as np
+from numba import njit
 from scipy import optimize
-from scipy.special import erfi
+from scipy.special import erfi, ndtr
 import scipy.stats as st
-from statsmodels.tsa.arima.model import ARIMA
 
 from .regression import regress
 
@@ -47,6 +47,7 @@ def ou_process_zscore(data):
     return score
 
 
+@njit(cache=True)
 def cuscore(data):
     """
     计算CUSUM统计量
@@ -58,26 +59,35 @@ def cuscore(data):
         float: CUSUM统计量
 
     """
+    # 对时间 t = 1..N 回归的斜率：Σ(t - t̄) = 0，Σ(t - t̄)² = N(N² - 1) / 12，无需构造时间序列与残差
     size = data.shape[0]
-    time = np.arange(1, size + 1, 1)
-
-    b, a, resi = regress(data, time)
-
-    s = np.sum((data - b * time) * time)
+    t_mean = (size + 1) / 2
+    s_td = 0.
+    for i in range(size):
+        s_td += (i + 1 - t_mean) * data[i]
+    # 单个样本时斜率无定义，与原回归实现一致取0，结果即为data[0]
+    b = s_td / (size * (size * size - 1) / 12) if size > 1 else 0.
+
+    s = 0.
+    for i in range(size):
+        t = i + 1.
+        s += (data[i] - b * t) * t
 
     return s
 
 
 def estimate_ou_para(x, dt):
     """
-    使用ARIMA模型估计包含Ornstein-Uhlenbeck过程的随机微分方程参数
+    估计包含Ornstein-Uhlenbeck过程的随机微分方程参数
 
-    使用ARIMA模型对输入数据进行拟合，以估计Ornstein-Uhlenbeck过程的参数。
     假设随机微分方程如下：
     St = Xt + Mt; Xt表示OU过程; Mt表示非平稳过程
     dXt = -alpha * Xt * dt + eta * dWt; dMt = gamma * dt + theta * dZt
     其中，Wt和Zt是独立的高斯过程，Corr(Wt, Zt) = 0。
 
+    将X视为零均值AR(1)过程 X[t] = φ·X[t-1] + ε[t]，以最小二乘闭式解（条件极大似然）估计φ，
+    代替ARIMA(1, 0, 0)的卡尔曼滤波数值优化。
+
     Args:
         x (array-like): 输入数据。
         dt (float): 时间步长。
@@ -86,13 +96,17 @@ def estimate_ou_para(x, dt):
         tuple: 包含三个元素的元组，依次为alpha、eta和d_w。
 
     """
-    # 用ARIMA拟合X来获取alpha, eta
-    mdl_arma_x = ARIMA(x, order=(1, 0, 0))
-    with mdl_arma_x.fix_params({'const': 0}):
-        mdl_arma_x_fit = mdl_arma_x.fit()
-
-    alpha = (1 - mdl_arma_x_fit.params[1]) / dt
-    residual = mdl_arma_x_fit.resid
+    # 零均值AR(1)的闭式解：φ = Σx[t-1]x[t] / Σx[t-1]²
+    x = np.asarray(x, dtype=np.float64)
+    x_lag = x[:-1]
+    x_cur = x[1:]
+    phi = np.dot(x_lag, x_cur) / np.dot(x_lag, x_lag)
+
+    # 残差与输入等长：首个残差取 x[0] - 0（与ARIMA的首期预测误差一致）
+    alpha = (1 - phi) / dt
+    residual = np.empty_like(x)
+    residual[0] = x[0]
+    residual[1:] = x_cur - phi * x_lag
     eta = np.std(residual)
     d_w = residual / eta
 
@@ -117,39 +131,44 @@ def estimate_ns_para(m, dw, dt, init_para: list = None):
     if init_para is None:
         init_para = [0.001, 0.1]
 
+    # 非平稳过程的增量 dM 与参数无关，只计算一次；dZ = (dM - gamma * dt) / theta 是dM的仿射变换，
+    # 排序只需做一次（theta为负时顺序反转）
+    m = np.asarray(m, dtype=np.float64)
+    d_m = np.zeros(m.shape[0])
+    d_m[1:] = m[1:] - m[:-1]
+    d_m_sorted = np.sort(d_m)
+
+    # OU过程白噪声的KS统计量与参数无关，只计算一次
+    d_w_ks = st.kstest(dw, 'norm')[0]
+
     def helper(param):
-        """辅助函数"""
-        return calc_loglik(param, m, dw, dt)
-
-    def calc_loglik(param, x, d_w, d_t):
-        """计算对数似然"""
-        # 拟合非平稳随机微分方程的白噪声: dMt = gamma * dt + theta * dZt
-        d_z = fit(param, x, d_t)
-        # 计算似然变量
-        d_w_ks = st.kstest(d_w, 'norm')[0]
-        d_z_ks = st.kstest(d_z, 'norm')[0]
-        # 计算最大对数似然指标
-        mloglik = d_w_ks * d_z_ks
-
-        return mloglik
-
-    def fit(param, s, dts):
-        """拟合非平稳随机微分方程的白噪声: dMt = gamma * dt + theta * dZt"""
+        """计算对数似然：拟合非平稳随机微分方程的白噪声 dMt = gamma * dt + theta * dZt，并计算最大对数似然指标"""
         (gam, the) = param
-        t = len(s)
-        d_z = np.full((t,), np.nan)
+        d_z = (d_m_sorted - gam * dt) / the
+        if np.signbit(the):
+            d_z = d_z[::-1]
+        return d_w_ks * _kstest_norm_sorted(d_z)
 
-        d_m = np.zeros((t,))
-        d_m[1:] = s[1:] - s[:-1]
+    gamma, theta = optimize.fmin(helper, init_para)
 
-        for i in range(t):
-            d_z[i] = (d_m[i] - gam * dts) / the
+    return gamma, theta
 
-        return d_z
 
-    gamma, theta = optimize.fmin(helper, init_para)
+def _kstest_norm_sorted(x):
+    """
+    已排序样本对标准正态分布的双侧Kolmogorov-Smirnov统计量（与scipy.stats.kstest的统计量一致）
 
-    return gamma, theta
+    Args:
+        x (np.ndarray): 升序排列的样本
+
+    Returns:
+        float: KS统计量
+    """
+    n = x.shape[0]
+    cdf = ndtr(x)
+    d_plus = (np.arange(1., n + 1) / n - cdf).max()
+    d_minus = (cdf - np.arange(0., n) / n).max()
+    return max(d_plus, d_minus)
 
 
 def time_distribution(zscores, thres, exit_thres):
@@ -171,37 +190,109 @@ def time_distribution(zscores, thres, exit_thres):
     if not (isinstance(thres, (int, float)) and isinstance(exit_thres, (int, float))):
         raise ValueError("Thresholds must be numeric")
 
-    time_dist = np.zeros((zscores.shape[0], 4))
-    cols = {1: 0, -1: 1, 0: 2}
+    return _time_distribution_kernel(np.asarray(zscores, dtype=np.float64), float(thres), float(exit_thres))
+
+
+@njit(cache=True)
+def _time_distribution_kernel(zscores, thres, exit_thres):
+    """
+    time_distribution的状态机内核：逐个z分数判断状态切换并累计各状态持续时间
+
+    Args:
+        zscores (np.ndarray): z分数数组（float64）
+        thres (float): 进入阈值
+        exit_thres (float): 退出阈值
+
+    Returns:
+        np.ndarray: 时间分布矩阵，列依次为多头（status=1）、空头（status=-1）、空仓持续时间及其合计
+    """
+    n = zscores.shape[0]
+    time_dist = np.zeros((n, 4))
+
+    # 状态（-1、0、1）对应的列，以status+1为下标查表
+    cols = np.array([1, 2, 0])
     trigger = 0
     status = 0
-    round_start = 0
     count = 1
+    col = 2
 
-    for i, zscore in enumerate(zscores):
-        col = cols[status]
+    for i in range(n):
+        zscore = zscores[i]
+        col = cols[status + 1]
 
         if status == 0:
-            change_status = (abs(zscore) >= thres)
+            change_status = abs(zscore) >= thres
         else:
-            change_status = (abs(zscore) <= exit_thres) or (status * zscore >= thres)
+            change_status = abs(zscore) <= exit_thres or status * zscore >= thres
 
         if change_status:
             time_dist[trigger, col] += count
-            status = (abs(zscore) >= thres) * -np.sign(zscore)
+            if abs(zscore) >= thres:
+                status = -1 if zscore > 0 else (1 if zscore < 0 else 0)
+            else:
+                status = 0
             count = 1
 
-            if status == round_start and trigger < time_dist.shape[0] - 1:
+            # 回到空仓状态即完成一轮
+            if status == 0 and trigger < n - 1:
                 trigger += 1
-                round_start = status
         else:
             count += 1
 
-        if i + 1 == zscores.shape[0]:
-            time_dist[trigger, col] = count
+    time_dist[trigger, col] = count
+
+    for i in range(trigger + 1):
+        time_dist[i, 3] = time_dist[i, 0] + time_dist[i, 1] + time_dist[i, 2]
+    return time_dist[:trigger + 1]
+
+
+def _stationary_u_error(b1, b2, alpha, eta):
+    """
+    计算解析期望中的平稳分布项 pi * (erfi(b2*sqrt(alpha)/eta) - erfi(b1*sqrt(alpha)/eta))
+
+    标量erfi本身开销很小，主要成本在于标量上的numpy调用，因此缩放系数以math.sqrt计算一次后复用。
+    """
+    scale = math.sqrt(alpha) / eta
+    return math.pi * (erfi(b2 * scale) - erfi(b1 * scale))
 
-    time_dist[:, 3] = np.sum(time_dist[:, :3], axis=1)
-    return time_dist[:trigger+1] if trigger < time_dist.shape[0] else time_dist
+
+@njit(cache=True)
+def _tita_moments(tita, col, sub_col, const, gamma):
+    """
+    单次遍历时间分布矩阵，同时累计期望收益与波动率所需的全部统计量
+
+    记 d = tita[:, col] - tita[:, sub_col]（sub_col < 0 时 d = tita[:, col]），t = tita[:, 3]，
+    w = (const + gamma * d) / t。w的样本方差以首行取值为偏移量累计一、二阶和，避免大均值下的抵消误差。
+
+    Returns:
+        tuple: (E[1/t], E[gamma*d/t], Var[w], E[d/t²])
+    """
+    n = tita.shape[0]
+    if n == 0:
+        return np.nan, np.nan, np.nan, np.nan
+    has_sub = sub_col >= 0
+    shift = const + gamma * (tita[0, col] - (tita[0, sub_col] if has_sub else 0.))
+    shift /= tita[0, 3]
+
+    s_inv = 0.
+    s_gamma_d = 0.
+    s_d_inv2 = 0.
+    s_w = 0.
+    s_w2 = 0.
+    for i in range(n):
+        inv = 1. / tita[i, 3]
+        d = tita[i, col] - (tita[i, sub_col] if has_sub else 0.)
+        s_inv += inv
+        s_gamma_d += gamma * d * inv
+        s_d_inv2 += d * inv * inv
+
+        w = (const + gamma * d) * inv - shift
+        s_w += w
+        s_w2 += w * w
+
+    # 单行时样本方差无定义，与np.var(ddof=1)一致返回nan
+    var_w = (s_w2 - s_w * s_w / n) / (n - 1) if n > 1 else np.nan
+    return s_inv / n, s_gamma_d / n, var_w, s_d_inv2 / n
 
 
 def calc_exp_num(b1, b2, b3, c, gamma, theta, tita):
@@ -221,14 +312,13 @@ def calc_exp_num(b1, b2, b3, c, gamma, theta, tita):
         tuple: 期望收益u和波动率v的元组
 
     """
-    e_tita = np.mean(1 / tita[:, 3])
-    e_tita_diff = np.mean(gamma * (tita[:, 0] - tita[:, 1]) / tita[:, 3])
+    const = b2 - b1 - 2 * b3 - 2 * c
+    e_tita, e_tita_diff, var_tita_diff, _ = _tita_moments(np.asarray(tita, dtype=np.float64), 0, 1, const, gamma)
 
-    u = (b2 - b1 - 2 * b3 - 2 * c) * e_tita + e_tita_diff
+    u = const * e_tita + e_tita_diff
 
     v_tita = (theta ** 2) * e_tita
-    v_tita_diff = ((b2 - b1 - 2 * b3 - 2 * c) + gamma * (tita[:, 0] - tita[:, 1])) / tita[:, 3]
-    vol = ((v_tita_diff - np.mean(v_tita_diff)) ** 2).sum() / (len(v_tita_diff) - 1) + v_tita
+    vol = var_tita_diff + v_tita
 
     return u, vol
 
@@ -256,16 +346,16 @@ def calc_exp_analytic(b1, b2, b3, c, params, tita):
     """
     alpha, eta, gamma, theta = params
 
-    stationary_u_error = math.pi * (erfi(b2 * np.sqrt(alpha) / eta) - erfi(b1 * np.sqrt(alpha) / eta))
-    u_1 = alpha * (b2 - b1 - 2 * b3 - 2 * c) / stationary_u_error
-    e_tita_diff = np.mean(gamma * (tita[:, 0] - tita[:, 1]) / tita[:, 3])
+    stationary_u_error = _stationary_u_error(b1, b2, alpha, eta)
+    const = b2 - b1 - 2 * b3 - 2 * c
+    u_1 = alpha * const / stationary_u_error
+    _, e_tita_diff, var_tita_diff, _ = _tita_moments(np.asarray(tita, dtype=np.float64), 0, 1, const, gamma)
 
     u = u_1 + e_tita_diff
 
-    v_tita_diff = ((b2 - b1 - 2 * b3 - 2 * c) + gamma * (tita[:, 0] - tita[:, 1])) / tita[:, 3]
     noise_v = alpha * (theta ** 2) / stationary_u_error
 
-    v = ((v_tita_diff - np.mean(v_tita_diff)) ** 2).sum() / (len(v_tita_diff) - 1) + noise_v
+    v = var_tita_diff + noise_v
 
     return u, v
 
@@ -288,14 +378,14 @@ def calc_exp_num_st(xt, b3, c, gamma, theta, tita, tita_col):
     Returns:
     tuple: 返回一个包含期望收益u和波动率v的元组。
     """
-    e_tita = np.mean(1 / tita[:, 3])
-    e_tita_gamma = np.mean(gamma * tita[:, tita_col] / tita[:, 3])
+    const = xt - b3 - c
+    e_tita, e_tita_gamma, var_tita_diff, _ = _tita_moments(np.asarray(tita, dtype=np.float64), tita_col, -1,
+                                                           const, gamma)
 
-    u = (xt - b3 - c) * e_tita + e_tita_gamma
+    u = const * e_tita + e_tita_gamma
 
     v_tita = (theta ** 2) * e_tita
-    v_tita_diff = (xt - b3 - c + gamma * tita[:, tita_col]) / tita[:, 3]
-    vol = ((v_tita_diff - np.mean(v_tita_diff)) ** 2).sum() / (len(v_tita_diff) - 1) + v_tita
+    vol = var_tita_diff + v_tita
 
     return u, vol
 
@@ -326,16 +416,17 @@ def calc_exp_analytic_st(xt, b1, b2, b3, c, params, tita, tita_col):
     """
     alpha, eta, gamma, theta = params
 
-    stationary_u_error = math.pi * (erfi(b2 * np.sqrt(alpha) / eta) - erfi(b1 * np.sqrt(alpha) / eta))
-    u_1 = alpha * (abs(abs(xt) - abs(b3)) - c) / stationary_u_error
-    e_tita_gamma = np.mean(gamma * (tita[:, tita_col]) / tita[:, 3])
+    stationary_u_error = _stationary_u_error(b1, b2, alpha, eta)
+    const = abs(abs(xt) - abs(b3)) - c
+    u_1 = alpha * const / stationary_u_error
+    _, e_tita_gamma, var_tita_gamma, e_tita_inv2 = _tita_moments(np.asarray(tita, dtype=np.float64), tita_col, -1,
+                                                                 const, gamma)
 
     u = u_1 + e_tita_gamma
 
-    v_tita_gamma = ((abs(abs(xt) - abs(b3)) - c) + gamma * (tita[:, tita_col])) / tita[:, 3]
-    noise_v = (theta ** 2) * np.mean(tita[:, tita_col] / (tita[:, 3] ** 2))
+    noise_v = (theta ** 2) * e_tita_inv2
 
-    v = ((v_tita_gamma - np.mean(v_tita_gamma)) ** 2).sum() / (len(v_tita_gamma) - 1) + noise_v
+    v = var_tita_gamma + noise_v
 
     return u, v
 
@@ -13,8 +13,7 @@
 
 import numpy as np
 import math
-from numba import jit, njit
-from .regression import regress
+from numba import jit, njit, prange
 from .basestat import sorted_rank
 
 
@@ -33,38 +32,225 @@ def rolling_calculation(input_data: np.ndarray, how: str, window: int, min_data:
         min_periods (int, optional): 开始计算所需的最小周期数，默认为10。如果为None，则使用窗口大小作为最小周期数。
 
     Returns:
-        np.ndarray: 计算结果数组，形状与输入数组相同，包含计算得到的滚动统计量。
+        np.ndarray: 计算结果数组，形状与输入数组相同，包含计算得到的滚动统计量。输入数组不会被修改。
 
     """
-    raw_data = input_data.copy().astype(float)
+    # 已是float64时不复制
+    raw_data = np.asarray(input_data, dtype=np.float64)
 
     if min_periods is None:
         min_periods = window
     shape = len(raw_data.shape)
     start = np.where(raw_data == raw_data[np.isfinite(raw_data)][0])[0][0] + min_periods
 
-    result = np.full(raw_data.shape, np.nan)
-    # 对于向量输入的滚动计算：仅考虑沿列的情况
+    method = how.upper()
+    # 均值、标准差、总和、计数、最大值、最小值：单次遍历增量维护窗口统计量，复杂度O(N)，与窗口长度无关
+    # 其他方法：逐窗口调用对应的统计内核；方法编码在循环外解析一次
+    if method in _ROLLING_MOMENTS:
+        kind, method_id = _KIND_MOMENTS, _ROLLING_MOMENTS[method]
+    elif method in _ROLLING_EXTREMES:
+        kind, method_id = _KIND_EXTREME, _ROLLING_EXTREMES[method]
+    else:
+        kind, method_id = _KIND_FUNC, _METHOD_ID.get(method, -1)
+
+    # 向量输入仅沿列计算；多维输入按列主序排列后逐列并行计算，使每列在内存中连续
+    first = max(start - 1, 0)
     if shape == 1:
-        for i in range(start - 1, len(raw_data)):
-            data = raw_data[max(0, i - window + 1):(i + 1)]
-            if np.sum(np.isfinite(data)) < min_data:
-                continue
-            else:
-                result[i] = func(data, how)
-    # 对于多维输入的滚动计算：考虑沿列/沿行的情况
-    elif shape > 1:
-        for j in range(raw_data.shape[1]):
-            for i in range(start - 1, raw_data.shape[0]):
-                data = raw_data[max(0, i - window + 1):(i + 1), j]
-                if np.sum(np.isfinite(data)) < min_data or np.isnan(data[-1]):
-                    continue
-                else:
-                    result[i, j] = func(data, how)
+        result = np.full(raw_data.shape, np.nan)
+        _rolling_column(raw_data, window, min_data, first, kind, method_id, result)
+    else:
+        raw_data = np.asfortranarray(raw_data)
+        result = np.full(raw_data.shape, np.nan, order='F')
+        _rolling_columns(raw_data, window, min_data, first, kind, method_id, result)
     return result
 
 
-@njit
+# rolling_calculation增量内核支持的方法及其编码
+_ROLLING_MOMENTS = {'MEAN': 0, 'STD': 1, 'SUM': 2, 'COUNT': 3}
+_ROLLING_EXTREMES = {'MAX': 1, 'MIN': -1}
+
+# rolling_calculation的内核类别
+_KIND_MOMENTS = 0
+_KIND_EXTREME = 1
+_KIND_FUNC = 2
+
+
+@njit(cache=True)
+def _rolling_column(x, window, min_data, first, kind, method_id, out):
+    """按内核类别对单列数据进行滚动计算，结果写入out"""
+    if kind == _KIND_MOMENTS:
+        _rolling_moments(x, window, min_data, first, method_id, out)
+    elif kind == _KIND_EXTREME:
+        _rolling_extreme(x, window, min_data, first, method_id, out)
+    else:
+        _rolling_func(x, window, min_data, first, method_id, out)
+
+
+@njit(parallel=True, cache=True)
+def _rolling_columns(x, window, min_data, first, kind, method_id, out):
+    """多列数据的滚动计算：各列相互独立，按列并行"""
+    for j in prange(x.shape[1]):
+        _rolling_column(x[:, j], window, min_data, first, kind, method_id, out[:, j])
+
+
+# 单次移出使离差平方和缩小至该比例以下时（如极端值移出窗口），增量结果的相对误差可达 eps / 比例，需立即重算
+_M2_REBUILD_RATIO = 1e-6
+
+
+@njit(inline='always')
+def _moments_add(value, count, total, comp, shift, mean, m2, run, last):
+    """
+    有限值移入窗口：个数加一，总和以Kahan补偿求和累计，均值与离差平方和以Welford公式相对平移量shift更新，
+    同时维护末尾连续相同有限值的个数run（其末值为last）
+
+    Returns:
+        tuple: (count, total, comp, mean, m2, run, last)
+    """
+    count += 1
+    run = run + 1 if value == last else 1
+    step = value - comp
+    tmp = total + step
+    comp = (tmp - total) - step
+    delta = value - shift - mean
+    mean += delta / count
+    m2 += delta * (value - shift - mean)
+    return count, tmp, comp, mean, m2, run, value
+
+
+@njit(inline='always')
+def _moments_remove(old, count, total, comp, shift, mean, m2):
+    """
+    有限值移出窗口：_moments_add的逆运算，窗口内已无有限值时全部清零。
+    离差平方和单步缩小至原值的_M2_REBUILD_RATIO以下时，增量相减的抵消误差已不可忽略，标记需按窗口数据重算。
+
+    Returns:
+        tuple: (count, total, comp, mean, m2, stale)
+    """
+    count -= 1
+    if count == 0:
+        return 0, 0., 0., 0., 0., False
+    step = -old - comp
+    tmp = total + step
+    comp = (tmp - total) - step
+    delta = old - shift - mean
+    mean -= delta / count
+    m2_new = max(m2 - delta * (old - shift - mean), 0.)
+    return count, tmp, comp, mean, m2_new, m2_new < m2 * _M2_REBUILD_RATIO
+
+
+@njit(inline='always')
+def _moments_rebuild(x, start, stop, count):
+    """
+    按窗口 x[start:stop] 的有限值重算总和与离差平方和，并将平移量shift更新为窗口均值，消除增量更新的累积误差
+
+    Returns:
+        tuple: (total, comp, shift, mean, m2)
+    """
+    total = 0.
+    for k in range(start, stop):
+        if np.isfinite(x[k]):
+            total += x[k]
+    shift = total / count
+    m2 = 0.
+    for k in range(start, stop):
+        if np.isfinite(x[k]):
+            m2 += (x[k] - shift) ** 2
+    return total, 0., shift, 0., m2
+
+
+@njit(inline='always')
+def _moments_std(count, m2, run, ddof):
+    """
+    窗口标准差：末尾连续相同有限值的个数不少于窗口有限值个数时，窗口内取值全部相同，直接取0，避免增量误差
+    """
+    return 0. if run >= count else np.sqrt(m2 / (count - ddof))
+
+
+@njit(cache=True)
+def _rolling_moments(x, window, min_data, first, method_id, out):
+    """
+    滚动均值/标准差/总和/计数：窗口移入、移出时增量更新有限值的个数、总和（Kahan补偿求和）与
+    离差平方和（Welford公式），避免逐窗口重新求和；每window步重算一次，均摊复杂度仍为O(1)
+
+    窗口有效条件与func一致：有限值个数不少于min_data且不少于2，且窗口末值不为NaN。
+
+    Args:
+        x (np.ndarray): 一维数据
+        window (int): 窗口大小
+        min_data (int): 窗口计算所需的最小有效数据数量
+        first (int): 开始输出的位置
+        method_id (int): 0-均值，1-标准差，2-总和，3-计数
+        out (np.ndarray): 输出数组，仅写入有效窗口的位置
+    """
+    count, total, comp, shift, mean, m2 = 0, 0., 0., 0., 0., 0.
+    run, last = 0, np.nan
+    for i in range(x.shape[0]):
+        value = x[i]
+        if np.isfinite(value):
+            count, total, comp, mean, m2, run, last = _moments_add(value, count, total, comp, shift, mean, m2,
+                                                                   run, last)
+        j = i - window
+        stale = False
+        if j >= 0 and np.isfinite(x[j]):
+            count, total, comp, mean, m2, stale = _moments_remove(x[j], count, total, comp, shift, mean, m2)
+        if (stale or (i + 1) % window == 0) and count > 0:
+            total, comp, shift, mean, m2 = _moments_rebuild(x, i - window + 1, i + 1, count)
+
+        if i < first or count < min_data or count < 2 or np.isnan(value):
+            continue
+        if method_id == 0:
+            out[i] = total / count
+        elif method_id == 1:
+            out[i] = _moments_std(count, m2, run, 1)
+        elif method_id == 2:
+            out[i] = total
+        else:
+            out[i] = count
+
+
+@njit(cache=True)
+def _rolling_extreme(x, window, min_data, first, sign, out):
+    """
+    滚动最大值（sign=1）/最小值（sign=-1）：以单调队列维护窗口内有限值的下标，每个元素至多入队、出队一次
+
+    Args:
+        x (np.ndarray): 一维数据
+        window (int): 窗口大小
+        min_data (int): 窗口计算所需的最小有效数据数量
+        first (int): 开始输出的位置
+        sign (int): 1-最大值，-1-最小值
+        out (np.ndarray): 输出数组，仅写入有效窗口的位置
+    """
+    n = x.shape[0]
+    queue = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    count = 0
+    for i in range(n):
+        value = x[i]
+        if np.isfinite(value):
+            count += 1
+            while tail > head and sign * x[queue[tail - 1]] <= sign * value:
+                tail -= 1
+            queue[tail] = i
+            tail += 1
+
+        j = i - window
+        if j >= 0 and np.isfinite(x[j]):
+            count -= 1
+        while tail > head and queue[head] <= j:
+            head += 1
+
+        if i < first or count < min_data or count < 2 or np.isnan(value):
+            continue
+        out[i] = x[queue[head]]
+
+
+# func支持的方法及其编码，调用方解析一次后以整数分派，避免在jit内核中逐次比较字符串
+_METHOD_ID = {'MEAN': 0, 'STD': 1, 'MAX': 2, 'MIN': 3, 'SUM': 4, 'COUNT': 5, 'MEDIAN': 6,
+              'Z_SCORE': 7, 'QUANTILE': 8, 'BETA': 9, 'RESIDUAL': 10, 'RANK': 11}
+
+
 def func(data: np.array, method: str):
     """
     根据指定方法计算统计量。
@@ -89,42 +275,129 @@ def func(data: np.array, method: str):
         float: 计算结果，如果输入数据无效或方法无效，则返回NaN。
 
     """
-    stat = np.nan
+    return _func_dispatch(np.asarray(data, dtype=np.float64), _METHOD_ID.get(method.upper(), -1))
+
+
+@njit(cache=True)
+def _func_dispatch(data, method_id):
+    """按方法编码调用对应的统计内核；末值为NaN、有效值不足2个或方法无效时返回NaN"""
+    if np.isnan(data[-1]):
+        return np.nan
     mask = np.isfinite(data)
     tmp = data[mask]
-
-    if np.isnan(data[-1]) or tmp.shape[0] < 2:
+    if tmp.shape[0] < 2:
         return np.nan
 
-    if method.upper() == 'MEAN':
-        stat = np.mean(tmp)
-    elif method.upper() == 'STD':
-        stat = np.sqrt(((tmp - np.mean(tmp)) ** 2).sum() / (len(tmp) - 1))
-    elif method.upper() == 'MAX':
-        stat = np.max(tmp)
-    elif method.upper() == 'MIN':
-        stat = np.min(tmp)
-    elif method.upper() == 'SUM':
-        stat = np.sum(tmp)
-    elif method.upper() == 'COUNT':
-        stat = tmp.shape[0]
-    elif method.upper() == 'MEDIAN':
-        stat = np.median(tmp)
-    elif method.upper() == 'Z_SCORE':
-        stdev = np.sqrt(np.sum(((tmp - np.mean(tmp)) ** 2)) / (len(tmp) - 1))
-        stat = (tmp[-1] - np.mean(tmp)) / stdev if stdev != 0 else np.nan
-    elif method.upper() == 'QUANTILE':
-        stat = tmp[tmp < tmp[-1]].shape[0] / (len(tmp) - 1)
-    elif method.upper() == 'BETA':
-        time_array = np.arange(1, len(data) + 1)
-        stat = regress(tmp, time_array[mask])[0]
-    elif method.upper() == 'RESIDUAL':
-        time_array = np.arange(1, len(data) + 1)
-        stat = regress(tmp, time_array[mask])[2][-1]
-    elif method.upper() == 'RANK':
-        stat = sorted_rank(tmp)[-1]
-
-    return stat
+    if method_id == 0:
+        return np.mean(tmp)
+    elif method_id == 1:
+        return _f_std(tmp)
+    elif method_id == 2:
+        return np.max(tmp)
+    elif method_id == 3:
+        return np.min(tmp)
+    elif method_id == 4:
+        return np.sum(tmp)
+    elif method_id == 5:
+        return float(tmp.shape[0])
+    elif method_id == 6:
+        return np.median(tmp)
+    elif method_id == 7:
+        return _f_z_score(tmp)
+    elif method_id == 8:
+        return _f_quantile(tmp)
+    elif method_id == 9:
+        return _f_time_regress(data, False)
+    elif method_id == 10:
+        return _f_time_regress(data, True)
+    elif method_id == 11:
+        return sorted_rank(tmp)[-1]
+    return np.nan
+
+
+@njit(cache=True)
+def _f_std(tmp):
+    """样本标准差（自由度n-1）"""
+    mean = np.mean(tmp)
+    ssd = 0.
+    for v in tmp:
+        ssd += (v - mean) ** 2
+    return np.sqrt(ssd / (tmp.shape[0] - 1))
+
+
+@njit(cache=True)
+def _f_z_score(tmp):
+    """最后一个有效值的Z分数，标准差为0时返回NaN"""
+    stdev = _f_std(tmp)
+    return (tmp[-1] - np.mean(tmp)) / stdev if stdev != 0 else np.nan
+
+
+@njit(cache=True)
+def _f_quantile(tmp):
+    """最后一个有效值的分位数：严格小于末值的个数 / (n - 1)"""
+    last = tmp[-1]
+    below = 0
+    for v in tmp:
+        below += v < last
+    return below / (tmp.shape[0] - 1)
+
+
+@njit(cache=True)
+def _f_time_regress(data, residual):
+    """
+    有效值对时间序号（有效值在窗口中的位置，从1开始）的线性回归，直接遍历窗口数据，不构造时间序列与残差数组
+
+    Args:
+        data (np.ndarray): 窗口数据，末值须为有限值
+        residual (bool): True返回末值的残差，False返回斜率
+    """
+    count = 0
+    sum_t = 0.
+    sum_y = 0.
+    for i in range(data.shape[0]):
+        if np.isfinite(data[i]):
+            sum_t += i + 1
+            sum_y += data[i]
+            count += 1
+    t_mean = sum_t / count
+    y_mean = sum_y / count
+
+    sum_ty = 0.
+    sum_tt = 0.
+    for i in range(data.shape[0]):
+        if np.isfinite(data[i]):
+            dt = i + 1 - t_mean
+            sum_ty += dt * (data[i] - y_mean)
+            sum_tt += dt * dt
+    b1 = sum_ty / sum_tt if sum_tt != 0 else 0.
+
+    if not residual:
+        return b1
+    b0 = y_mean - b1 * t_mean
+    return data[-1] - (b1 * data.shape[0] + b0)
+
+
+@njit(cache=True)
+def _rolling_func(x, window, min_data, first, method_id, out):
+    """
+    逐窗口调用_func_dispatch的滚动计算，窗口内有限值个数少于min_data时跳过
+
+    Args:
+        x (np.ndarray): 一维数据
+        window (int): 窗口大小
+        min_data (int): 窗口计算所需的最小有效数据数量
+        first (int): 开始输出的位置
+        method_id (int): 方法编码，见_METHOD_ID
+        out (np.ndarray): 输出数组，仅写入满足条件的位置
+    """
+    for i in range(first, x.shape[0]):
+        data = x[max(0, i - window + 1):(i + 1)]
+        count = 0
+        for v in data:
+            count += np.isfinite(v)
+        if count < min_data:
+            continue
+        out[i] = _func_dispatch(data, method_id)
 
 
 @njit
@@ -142,18 +415,28 @@ def bootstrap_dt(ts_len: int, total_ts_len: int, max_overlap: int, min_len: int)
         ndarray: 二维数组，其中每一列记录每个样本的起始和结束位置
 
     """
-    mask = np.ones(total_ts_len)
-    mask[total_ts_len - min_len + 1:] = 0
-    array_a = np.arange(total_ts_len)
+    # 可选起点集合：free[:k]为当前可选起点，pos[p]为起点p在free中的位置（已排除为-1）。
+    # 等概率抽取后以末尾元素覆盖被排除的起点，每个起点至多被排除一次，总复杂度O(N)。
+    n_free = min(max(total_ts_len - min_len + 1, 0), total_ts_len)
+    free = np.arange(n_free)
+    pos = np.arange(n_free)
+    k = n_free
+    overlap = max(max_overlap, 1)
 
-    mx = np.zeros((mask.shape[0], 2))
+    mx = np.zeros((n_free, 2))
 
     count = 0
-    while np.any(mask):
-        random_num = np.random.choice(array_a[mask == 1])
-        forbidden_range = np.arange(max(0, random_num - max_overlap + 1),
-                                    min(total_ts_len, random_num + max_overlap - 1 + 1))
-        mask[forbidden_range] = 0
+    while k > 0:
+        random_num = free[np.random.randint(0, k)]
+        for p in range(max(0, random_num - overlap + 1), min(n_free, random_num + overlap)):
+            j = pos[p]
+            if j < 0:
+                continue
+            k -= 1
+            last = free[k]
+            free[j] = last
+            pos[last] = j
+            pos[p] = -1
         mx[count, 0] = random_num
         mx[count, 1] = min(random_num + ts_len, total_ts_len)
         count += 1
@@ -161,7 +444,7 @@ def bootstrap_dt(ts_len: int, total_ts_len: int, max_overlap: int, min_len: int)
     return mx
 
 
-@jit
+@njit
 def ewma_vol(input_ret, lambda_para):
     """
     计算指数加权移动平均（EWMA）波动率。
@@ -174,16 +457,15 @@ def ewma_vol(input_ret, lambda_para):
         float: 计算得到的EWMA波动率。
 
     """
-    raw_ret = input_ret.copy()
-    size = len(raw_ret)
-    avg = np.mean(raw_ret)
-
-    e = np.arange(size - 1, -1, -1)
-    r = np.repeat(lambda_para, size)
-    vec_lambda = np.power(r, e)
+    avg = np.mean(input_ret)
 
-    sxxewm = (np.power(raw_ret - avg, 2) * vec_lambda).sum()
-    vart = sxxewm / vec_lambda.sum()
+    # 权重 λ^(n-1-i) 以Horner递推累加：每步先乘λ再加当期项，无需构造权重向量
+    sxxewm = 0.
+    norm = 0.
+    for i in range(input_ret.shape[0]):
+        sxxewm = sxxewm * lambda_para + (input_ret[i] - avg) ** 2
+        norm = norm * lambda_para + 1.
+    vart = sxxewm / norm
     vol = math.sqrt(vart)
 
     return vol
@@ -202,51 +484,116 @@ def ewma(x, lamb):
         float: EWMA值
 
     """
-    size = int(len(x))
+    # 权重 λ^(n-1-i) 以Horner递推累加，加权和与权重和在同一次遍历中完成
+    acc = 0.
+    norm = 0.
+    for i in range(x.shape[0]):
+        acc = acc * lamb + x[i]
+        norm = norm * lamb + 1.
+    v = acc / norm
 
-    e = np.arange(size - 1, -1, -1)
-    r = np.ones((size,)) * lamb
-    vec_lambda = r ** e
+    return v
 
-    v = np.sum(x * vec_lambda / np.sum(vec_lambda))
 
-    return v
+# future_calculation支持的方法及其编码
+_FUTURE_METHOD_ID = {'std': 0, 'max': 1, 'min': 2, 'sum': 3, 'mean': 4}
 
 
-@njit
 def future_calculation(input_data: np.ndarray, window: int, how: str):
     """
     在未来窗口上计算统计量
 
+    第i个结果为 input_data[i+1:i+1+window] 中有限值的统计量，最后window个位置为NaN。
+    各方法均单次遍历增量维护窗口统计量，复杂度O(N)，与窗口长度无关。
+
     Args:
         input_data (np.ndarray): 输入数据数组
         window (int): 窗口大小
         how (str): 计算方法，可选 'std', 'max', 'min', 'sum', 'mean'
 
     Returns:
-        np.ndarray: 计算结果数组
-
-    """
-    raw_data = input_data.copy()
-    result = np.full(raw_data.shape[0], np.nan)
-
-    for i in range(result.shape[0] - window):
-        data = raw_data[(i + 1):(i + 1 + window)]
-        data = data[np.isfinite(data)]
-        if how == 'std':
-            result[i] = np.sqrt(((data - np.mean(data)) ** 2).sum() / (len(data) - 1))
-        elif how == 'max':
-            result[i] = np.max(data)
-        elif how == 'min':
-            result[i] = np.min(data)
-        elif how == 'sum':
-            result[i] = np.sum(data)
-        elif how == 'mean':
-            result[i] = np.mean(data)
+        np.ndarray: 计算结果数组。输入数组不会被修改。
+
+    """
+    result = np.full(input_data.shape[0], np.nan)
+    method_id = _FUTURE_METHOD_ID.get(how, -1)
+    if method_id in (1, 2):
+        _future_extreme(input_data, window, 1 if method_id == 1 else -1, result)
+    elif method_id >= 0:
+        _future_moments(input_data, window, method_id, result)
 
     return result
 
 
+@njit(cache=True)
+def _future_moments(x, window, method_id, out):
+    """
+    未来窗口的标准差（样本标准差）/总和/均值：按以第i+window个元素结尾的滚动窗口增量计算，结果写入out[i]。
+    总和以Kahan补偿求和、离差平方和以Welford公式更新，每window步按窗口数据重算一次。
+
+    Args:
+        x (np.ndarray): 一维数据
+        window (int): 窗口大小
+        method_id (int): 0-标准差，3-总和，4-均值
+        out (np.ndarray): 输出数组
+    """
+    count, total, comp, shift, mean, m2 = 0, 0., 0., 0., 0., 0.
+    run, last = 0, np.nan
+    for e in range(x.shape[0]):
+        value = x[e]
+        if np.isfinite(value):
+            count, total, comp, mean, m2, run, last = _moments_add(value, count, total, comp, shift, mean, m2,
+                                                                   run, last)
+        j = e - window
+        stale = False
+        if j >= 0 and np.isfinite(x[j]):
+            count, total, comp, mean, m2, stale = _moments_remove(x[j], count, total, comp, shift, mean, m2)
+        if (stale or (e + 1) % window == 0) and count > 0:
+            total, comp, shift, mean, m2 = _moments_rebuild(x, e - window + 1, e + 1, count)
+
+        # 窗口 x[e-window+1:e+1] 为第e-window个位置的未来窗口
+        if j < 0:
+            continue
+        if method_id == 0:
+            if count >= 2:
+                out[j] = _moments_std(count, m2, run, 1)
+        elif method_id == 3:
+            out[j] = total
+        elif count > 0:
+            out[j] = total / count
+
+
+@njit(cache=True)
+def _future_extreme(x, window, sign, out):
+    """
+    未来窗口的最大值（sign=1）/最小值（sign=-1）：以单调队列维护窗口内有限值的下标，结果写入out[i]；
+    窗口内无有限值时保持NaN
+
+    Args:
+        x (np.ndarray): 一维数据
+        window (int): 窗口大小
+        sign (int): 1-最大值，-1-最小值
+        out (np.ndarray): 输出数组
+    """
+    n = x.shape[0]
+    queue = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    for e in range(n):
+        value = x[e]
+        if np.isfinite(value):
+            while tail > head and sign * x[queue[tail - 1]] <= sign * value:
+                tail -= 1
+            queue[tail] = e
+            tail += 1
+
+        j = e - window
+        while tail > head and queue[head] <= j:
+            head += 1
+        if j >= 0 and tail > head:
+            out[j] = x[queue[head]]
+
+
 @njit
 def calculate_rolling_mean_returns(data: np.ndarray, window: int) -> np.ndarray:
     """
@@ -263,9 +610,10 @@ def calculate_rolling_mean_returns(data: np.ndarray, window: int) -> np.ndarray:
     size = data.shape[0]
     target = np.full(size, np.nan)
 
-    for i in range(window, size):
-        d_ = data[:i+1]
-        target[i - window] = np.nanmean(d_[-window:])
+    # target[i - window] 为截至i的窗口均值，由滚动统计一次求出
+    if size > window:
+        mean, _ = _rolling_nan_stats(data, window)
+        target[:size - window] = mean[window:]
 
     return target
 
@@ -288,10 +636,10 @@ def log_mean_ret(close: np.ndarray, prev_close: np.ndarray, window: int):
     size = close.shape[0]
     target = np.full(size, np.nan)
 
-    for i in range(window, size):
-        close_ = close[:i+1]
-        prev_ = prev_close[:i+1]
-        target[i - window] = np.nanmean(np.log(close_[-window:]) - np.log(prev_[-window:]))
+    # 对数收益率只计算一次，再求滚动均值
+    if size > window:
+        mean, _ = _rolling_nan_stats(np.log(close) - np.log(prev_close), window)
+        target[:size - window] = mean[window:]
     return target
 
 
@@ -314,19 +662,14 @@ def log_mean_ret_riskadj(close: np.ndarray, prev_close: np.ndarray, window: int)
 
     window_ = max(50, int(window * 2))
 
-    for i in range(window, size):
-        close_ = close[:i+1]
-        prev_ = prev_close[:i+1]
+    # 对数收益率只计算一次；截至i的近window期均值，除以截至i-window_的window期标准差（即长度为window_+window的区间的前window期）
+    log_ret = np.log(close) - np.log(prev_close)
+    mean, std = _rolling_nan_stats(log_ret, window)
 
-        if close_.shape[0] < window_ + window:
-            continue
-
-        log_ret = np.log(close_[-window_ - window:]) - np.log(prev_[-window_ - window:])
-        std = np.nanstd(log_ret[-window_ - window:window])
-        log_ret = log_ret[-window:]
-
-        if np.isfinite(std) and std != 0:
-            res = np.nanmean(log_ret) / std
+    for i in range(max(window, window_ + window - 1), size):
+        std_ = std[i - window_]
+        if np.isfinite(std_) and std_ != 0:
+            res = mean[i] / std_
             res = np.sign(res) * min(np.abs(res), 3)
 
             target[i - window] = res
@@ -334,7 +677,68 @@ def log_mean_ret_riskadj(close: np.ndarray, prev_close: np.ndarray, window: int)
     return target
 
 
-@jit
+@njit(cache=True)
+def _rolling_nan_stats(x, window):
+    """
+    滚动窗口的 nanmean 与 nanstd（总体标准差），单次遍历增量维护，复杂度O(N)
+
+    与 np.nanmean/np.nanstd 的语义一致：忽略NaN；窗口含inf时均值为±inf（正负inf同时存在为NaN），标准差为NaN。
+    有限值的总和以Kahan补偿求和、离差平方和以Welford公式随窗口移入移出更新，每window步按窗口数据重算一次。
+
+    Args:
+        x (np.ndarray): 一维数据
+        window (int): 窗口大小
+
+    Returns:
+        tuple: (均值数组, 标准差数组)，第i个元素对应窗口 x[i-window+1:i+1]，不足一个窗口的位置为NaN
+    """
+    size = x.shape[0]
+    mean_out = np.full(size, np.nan)
+    std_out = np.full(size, np.nan)
+
+    count, total, comp, shift, mean, m2 = 0, 0., 0., 0., 0., 0.
+    run, last = 0, np.nan
+    n_pos = 0
+    n_neg = 0
+    for i in range(size):
+        value = x[i]
+        if np.isfinite(value):
+            count, total, comp, mean, m2, run, last = _moments_add(value, count, total, comp, shift, mean, m2,
+                                                                   run, last)
+        elif value > 0:
+            n_pos += 1
+        elif value < 0:
+            n_neg += 1
+
+        j = i - window
+        stale = False
+        if j >= 0:
+            old = x[j]
+            if np.isfinite(old):
+                count, total, comp, mean, m2, stale = _moments_remove(old, count, total, comp, shift, mean, m2)
+            elif old > 0:
+                n_pos -= 1
+            elif old < 0:
+                n_neg -= 1
+
+        if (stale or (i + 1) % window == 0) and count > 0:
+            total, comp, shift, mean, m2 = _moments_rebuild(x, i - window + 1, i + 1, count)
+
+        if i < window - 1:
+            continue
+        if n_pos > 0 and n_neg > 0:
+            continue
+        if n_pos > 0:
+            mean_out[i] = np.inf
+        elif n_neg > 0:
+            mean_out[i] = -np.inf
+        elif count > 0:
+            mean_out[i] = total / count
+            std_out[i] = _moments_std(count, m2, run, 0)
+
+    return mean_out, std_out
+
+
 def hurst(ts):
     """
     计算Hurst指数，用于分析时间序列数据的长期记忆性。
@@ -351,17 +755,46 @@ def hurst(ts):
         float: Hurst指数。
 
     """
+    ts = np.asarray(ts, dtype=np.float64)
     # 创建滞后值范围
     max_lag = min(int(len(ts) * 0.9), 100)
-    lags = range(2, max_lag)
-    # 计算滞后差分的方差数组
-    tau = [np.sqrt(np.std(np.subtract(ts[lag:], ts[:-lag]))) for lag in lags]
+    lags = np.arange(2, max_lag)
+    # 计算滞后差分的方差数组（各滞后阶数并行计算，不生成差分数组）
+    tau = _hurst_tau(ts, lags)
     # 使用线性拟合来估计Hurst指数
     poly = np.polyfit(np.log(lags), np.log(tau), 1)
     # 返回多项式拟合输出中的Hurst指数
     return poly[0] * 2.0
 
 
+@njit(parallel=True, cache=True)
+def _hurst_tau(ts, lags):
+    """
+    各滞后阶数差分序列 ts[lag:] - ts[:-lag] 的标准差的平方根
+
+    Args:
+        ts (np.ndarray): 时间序列
+        lags (np.ndarray): 滞后阶数
+
+    Returns:
+        np.ndarray: 与lags等长的结果数组
+    """
+    tau = np.empty(lags.shape[0])
+    for k in prange(lags.shape[0]):
+        lag = lags[k]
+        n = ts.shape[0] - lag
+        total = 0.
+        for i in range(n):
+            total += ts[i + lag] - ts[i]
+        mean = total / n
+        ssd = 0.
+        for i in range(n):
+            d = ts[i + lag] - ts[i] - mean
+            ssd += d * d
+        tau[k] = np.sqrt(np.sqrt(ssd / n))
+    return tau
+
+
 @njit
 def kalman_filter(z: np.array, n_iter=20):
     """
@@ -377,25 +810,22 @@ def kalman_filter(z: np.array, n_iter=20):
     """
     """Kalman filter"""
     noise = 1e-6
-    x_hat = np.zeros(n_iter)
-    x_hat_minus = np.zeros(n_iter)
-
-    p = np.zeros(n_iter)
-    p[0] = 1.0
-    p_minus = np.zeros(n_iter)
-    k = np.zeros(n_iter)
-
     r = 0.1 ** 2
-    a = 1
-    h = 1
+    x_hat = np.zeros(n_iter)
 
+    # 状态转移与观测系数均为1，增益k与协方差p只依赖步数、与观测值无关：以标量递推，
+    # p在浮点意义下收敛（不再变化）后增益固定为稳态值，此后仅更新状态
+    p = 1.0
+    k = 0.
+    steady = False
     for i in range(1, n_iter):
-        x_hat_minus[i] = a * x_hat[i - 1]
-        p_minus[i] = a * p[i - 1] + noise
-
-        k[i] = p_minus[i] / (p_minus[i] + r)
-        x_hat[i] = x_hat_minus[i] + k[i] * (z[i] - h * x_hat_minus[i])
-        p[i] = (1 - k[i] * h) * p_minus[i]
+        if not steady:
+            p_minus = p + noise
+            k = p_minus / (p_minus + r)
+            p_next = (1 - k) * p_minus
+            steady = p_next == p
+            p = p_next
+        x_hat[i] = x_hat[i - 1] + k * (z[i] - x_hat[i - 1])
 
     return x_hat
 
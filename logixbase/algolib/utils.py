@@ -12,39 +12,25 @@ import numpy as np
 from numba import njit
 
 
-@njit
+# 无NaN判断的归约内核使用的fastmath选项：允许重排求和顺序以便向量化，但保留NaN/Inf语义（不启用nnan/ninf）
+_REDUCE_FASTMATH = {"reassoc", "contract"}
+
+
 def cumsum(array, axis=0):
     """
     计算累积和。
 
     Args:
         array (np.ndarray): 输入数组。
-        axis (int, optional): 计算轴，0为列，1为行。默认为0。
+        axis (int, optional): 计算轴，0为列，1为行。默认为0。一维数组或单列二维数组固定沿0轴累积。
 
     Returns:
-        np.ndarray: 累积和数组。
+        np.ndarray: 累积和数组（float64）。
 
     """
-    y = np.full(array.shape, np.nan)
-    if np.array(array.shape).shape[0] == 1 or y.shape[1] == 1:
-        x = 0
-        for i in range(array.shape[0]):
-            x = x + array[i]
-            y[i] = x
-    else:
-        if axis == 0:
-            for j in range(array.shape[1]):
-                x = 0
-                for i in range(array.shape[0]):
-                    x = x + array[i, j]
-                    y[i, j] = x
-        elif axis == 1:
-            for i in range(array.shape[0]):
-                x = 0
-                for j in range(array.shape[1]):
-                    x = x + array[i, j]
-                    y[i, j] = x
-    return y
+    if array.ndim == 1 or array.shape[1] == 1:
+        axis = 0
+    return np.cumsum(array, axis=axis, dtype=np.float64)
 
 
 @njit
@@ -67,22 +53,24 @@ def normal_pdf(x, mu, sigma):
     return pdf
 
 
-@njit
+# ASCII数字字节，digit_num以bytes.translate一次删除后按长度差计数
+_ASCII_DIGITS = b"0123456789"
+
+
 def digit_num(string):
     """
     统计字符串中数字的个数。
 
     Args:
-        string (str): 输入字符串。
+        string (str | bytes): 输入字符串。
 
     Returns:
         int: 字符串中数字的个数。
 
     """
-    num = 0
-    for i in string:
-        if i.isdigit():
-            num += 1
-    return num
-
-
+    if isinstance(string, str):
+        # 非ASCII字符串保留str.isdigit的Unicode语义
+        if not string.isascii():
+            return sum(map(str.isdigit, string))
+        string = string.encode("ascii")
+    return len(string) - len(string.translate(None, _ASCII_DIGITS))
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
+import ast
 import os
 import shutil
 import sys
 import py_compile
 from typing import Union
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from importlib.util import (spec_from_file_location, module_from_spec)
 from distutils.core import setup
@@ -25,6 +27,100 @@ Execute in CMD with:
 """
 
 
+def _scan(root):
+    """
+    递归遍历目录下的文件，跳过__pycache__文件夹
+
+    基于os.scandir，文件类型取自DirEntry缓存的信息，无需对每个条目额外stat；
+    与os.walk一致，每个文件夹的条目先完整列出再返回，遍历过程中增删文件不影响本层结果，且不进入符号链接文件夹。
+
+    Args:
+        root: 根目录
+
+    Yields:
+        os.DirEntry: 文件条目
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name != "__pycache__" and not entry.is_symlink():
+                    stack.append(entry.path)
+            else:
+                yield entry
+
+
+def _clean_build_dir(path) -> bool:
+    """
+    自底向上单次遍历编译结果目录：去除文件名中的多余标签（如 a.cpython-39-x86_64.pyd -> a.pyd），
+    删除__pycache__文件夹，并删除清理后为空的文件夹
+
+    Args:
+        path: 目录路径
+
+    Returns:
+        bool: 该目录是否已被删除
+    """
+    with os.scandir(path) as it:
+        entries = list(it)
+    empty = True
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name == "__pycache__":
+                shutil.rmtree(entry.path)
+            elif not _clean_build_dir(entry.path):
+                empty = False
+            continue
+        empty = False
+        ele = entry.name.split(".")
+        if len(ele) > 2:
+            os.rename(entry.path, os.path.join(path, ele[0] + "." + ele[-1]))
+    if empty:
+        os.rmdir(path)
+    return empty
+
+
+def _defines_cc(source: bytes):
+    """
+    静态判断源码是否在模块顶层定义 cc = CC(...)
+
+    Returns:
+        bool: 可能定义时为True（源码无法解析时同样返回True，由导入过程给出错误）
+    """
+    if b"pycc" not in source and b"CC(" not in source:
+        return False
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return True
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        else:
+            continue
+        if not any(isinstance(t, ast.Name) and t.id == "cc" for t in targets):
+            continue
+        func = node.value.func if isinstance(node.value, ast.Call) else None
+        if (isinstance(func, ast.Name) and func.id == "CC") or (isinstance(func, ast.Attribute) and func.attr == "CC"):
+            return True
+    return False
+
+
+def _unlink(path):
+    """删除文件，文件不存在时忽略"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
 class BuildProject(OPP):
     """
     Compile all project files to .pyc / .pyd
@@ -35,6 +131,9 @@ class BuildProject(OPP):
         self._cfg_path: Union[Path, str] = Path(config_path)
         self._save_path: Union[Path, str] = Path(save_path)
         self._project_name: str = ""                        # 项目名称
+        self._except_set: frozenset = frozenset()           # 跳过编译的文件集合
+        self._pyc_set: frozenset = frozenset()              # 编译为.pyc的文件集合
+        self._clear_set: frozenset = frozenset()            # 编译结果中不包含的文件集合
 
         cfg = read_config(self._cfg_path).get(self._task.lower(), {})
         if not cfg:
@@ -48,12 +147,16 @@ class BuildProject(OPP):
         self._skip_file: list = []                          # 被指定跳过的文件夹/文件
 
     def parse_config(self):
-        self._project_name = self.cfg.path.split("\\")[-1]
+        self._project_name = Path(self.cfg.path).name
         if not self.cfg.module:
             self.cfg.module = self._project_name
         self.cfg.except_file = self._parse_all_file(self.cfg.except_file)
         self.cfg.pyc_file = self._parse_all_file(self.cfg.pyc_file)
         self.cfg.clear_file = self._parse_all_file(self.cfg.clear_file)
+        # 逐文件判断归属时使用集合查找
+        self._except_set = frozenset(self.cfg.except_file)
+        self._pyc_set = frozenset(self.cfg.pyc_file)
+        self._clear_set = frozenset(self.cfg.clear_file)
 
     def _parse_all_file(self, files: list):
         """"""
@@ -62,7 +165,7 @@ class BuildProject(OPP):
             dir_ = Path(self.cfg.path).joinpath(k)
 
             if dir_.is_dir():
-                res.extend([Path(r).joinpath(i) for (r, v, j) in os.walk(dir_) for i in j])
+                res.extend([Path(entry.path) for entry in _scan(dir_)])
             elif dir_.is_file():
                 res.append(dir_)
 
@@ -80,24 +183,14 @@ class BuildProject(OPP):
 
     def gen_new_dir(self, raw_dir, new_dir):
         """Get new directory with same structure as raw dir"""
-        parts = list(Path(str(new_dir).split(self._project_name)[0]).parts)
-        structure = self.get_structure(raw_dir)
-        new_parts = parts[1:] + list(structure)
-        res = Path(parts[0])
-        for k in new_parts:
-            if k != "\\":
-                res = res.joinpath(k)
-        return res
-
-    def get_structure(self, raw_dir):
-        """Get structure from directory"""
-        structure = Path(raw_dir).parts
-        structure = structure[structure.index(self._project_name):]
-        return structure
+        return Path(new_dir).joinpath(Path(raw_dir).relative_to(self.cfg.path))
 
     @staticmethod
     def check_cc(file: Path):
         """Check whether to use numba.pycc.CC to compile pyd"""
+        # Only import files that statically define a module-level CC object
+        if not _defines_cc(file.read_bytes()):
+            return None
         spec = spec_from_file_location(file.name.split(".")[0], location=file)
         mod = module_from_spec(spec)
         spec.loader.exec_module(mod)
@@ -107,44 +200,41 @@ class BuildProject(OPP):
         """Setup targets"""
         build_to = self._save_path.joinpath(self._project_name)
 
-        for (root, folders, files) in os.walk(self.cfg.path):
-            # Skip cache folder
-            if Path(root).parts[-1] == "__pycache__":
+        # Cache folders are skipped by the walker
+        for entry in _scan(self.cfg.path):
+            file = entry.name
+            file_dir = Path(entry.path)
+            new_dir = self.gen_new_dir(file_dir, build_to)
+            _unlink(file_dir.parent.joinpath(file.split(".")[0] + ".c"))
+            # File not contained from built project
+            if file_dir in self._clear_set:
                 continue
-            for file in files:
-                file_dir = Path(root).joinpath(file)
-                new_dir = self.gen_new_dir(file_dir, build_to)
-                if os.path.exists(Path(root).joinpath(file.split(".")[0] + ".c")):
-                    os.remove(Path(root).joinpath(file.split(".")[0] + ".c"))
-                # File not contained from built project
-                if file_dir in self.cfg.clear_file:
-                    continue
-                # File kept but no compilation required
-                elif (file_dir in self.cfg.except_file) or (not file.endswith(".py")):
-                    self._skip_file.append((file_dir, new_dir))
-                # __ini__ files always compiled to pyc
-                elif (file == "__init__.py") or (file_dir in self.cfg.pyc_file):
-                    new_dir = Path(str(new_dir).replace(".py", ".pyc"))
-                    self._use_pyc.append((file_dir, new_dir))
-                # Compile pyd files
+            # File kept but no compilation required
+            elif (file_dir in self._except_set) or (not file.endswith(".py")):
+                self._skip_file.append((file_dir, new_dir))
+            # __ini__ files always compiled to pyc
+            elif (file == "__init__.py") or (file_dir in self._pyc_set):
+                new_dir = Path(str(new_dir).replace(".py", ".pyc"))
+                self._use_pyc.append((file_dir, new_dir))
+            # Compile pyd files
+            else:
+                cc = self.check_cc(file_dir)
+                # Numba file, use numba.pycc.CC to compile pyd
+                if cc is not None:
+                    cc.raw_output_dir = str(cc.output_dir)
+                    cc.output_dir = str(new_dir.parent)
+                    self._use_nbcc.append(cc)
+                # Non-numba file, use Cython to compile pyd
                 else:
-                    cc = self.check_cc(file_dir)
-                    # Numba file, use numba.pycc.CC to compile pyd
-                    if cc is not None:
-                        cc.raw_output_dir = str(cc.output_dir)
-                        cc.output_dir = str(new_dir.parent)
-                        self._use_nbcc.append(cc)
-                    # Non-numba file, use Cython to compile pyd
-                    else:
-                        structure = self.get_structure(str(file_dir).replace(".py", ""))
-                        mod = ".".join(self.cfg.module.split(".") + list(structure[1:]))
-                        # mod = ".".join(structure)
-                        # mod = structure[-1]
-                        ext = Extension(name=mod,
-                                        sources=[str(file_dir)],
-                                        )
-                        ext.output_dir = str(new_dir.parent)
-                        self._use_cython.append(ext)
+                    structure = file_dir.relative_to(self.cfg.path).with_suffix("").parts
+                    mod = ".".join(self.cfg.module.split(".") + list(structure))
+                    # mod = ".".join(structure)
+                    # mod = structure[-1]
+                    ext = Extension(name=mod,
+                                    sources=[str(file_dir)],
+                                    )
+                    ext.output_dir = str(new_dir.parent)
+                    self._use_cython.append(ext)
         print(f"编译任务准备就绪: Cython {len(self._use_cython)} | Numba.pycc {len(self._use_nbcc)} |"
               f" Pyc {len(self._use_pyc)}")
 
@@ -157,31 +247,40 @@ class BuildProject(OPP):
         # Compile Cython pyd
         print("========================")
         print(f"执行Cython编译任务：总计 {len(self._use_cython)}...")
+        # Translate all sources in one cythonize call (parallel across sources), then build each output
+        # folder with a single setup call whose C compilation runs in parallel (build_ext -j)
+        workers = os.cpu_count() or 1
+        src_dirs = list({str(Path(ext.sources[0]).parent) for ext in self._use_cython})
+        sys.path.extend(src_dirs)
+        modules = {}
+        if self._use_cython:
+            modules = {m.name: m for m in cythonize(self._use_cython, nthreads=workers)}
+        groups = {}
         for ext in self._use_cython:
-            source_ = Path(ext.sources[0])
-            sys.path.append(str(source_.parent))
+            groups.setdefault(ext.output_dir, []).append(ext)
+        for output_dir, exts in groups.items():
             # Compile
-            options = {"script_args": ["build_ext", f"--build-lib={ext.output_dir}"],
-                       "ext_modules": cythonize(ext)
+            options = {"script_args": ["build_ext", f"--build-lib={output_dir}", "-j", str(workers)],
+                       "ext_modules": [modules[ext.name] for ext in exts]
                        }
             setup(**options)
-            sys.path.remove(str(source_.parent))
             # Clear .c file
-            c_path = source_.parent.joinpath(source_.name.replace(".py", ".c"))
-            if os.path.exists(c_path):
-                os.remove(c_path)
+            for ext in exts:
+                source_ = Path(ext.sources[0])
+                _unlink(source_.parent.joinpath(source_.name.replace(".py", ".c")))
             # Rename file and move to right structure
-            now_dir = Path(ext.output_dir)
-            for k in ext.name.split(".")[:-1]:
-                now_dir = now_dir.joinpath(k)
-            files = os.listdir(now_dir)
-            for file in files:
-                ele = file.split(".")
-                new_name = ele[0] + "." + ele[-1]
-                file_now = Path(now_dir).joinpath(new_name)
-                os.rename(Path(now_dir).joinpath(file), file_now)
-                shutil.move(file_now, Path(ext.output_dir).joinpath(new_name))
-            print(f"Cython编译任务执行完毕: {ext.sources[0]}")
+            for now_dir in {Path(output_dir).joinpath(*ext.name.split(".")[:-1]) for ext in exts}:
+                files = os.listdir(now_dir)
+                for file in files:
+                    ele = file.split(".")
+                    new_name = ele[0] + "." + ele[-1]
+                    file_now = Path(now_dir).joinpath(new_name)
+                    os.rename(Path(now_dir).joinpath(file), file_now)
+                    shutil.move(file_now, Path(output_dir).joinpath(new_name))
+            for ext in exts:
+                print(f"Cython编译任务执行完毕: {ext.sources[0]}")
+        for src_dir in src_dirs:
+            sys.path.remove(src_dir)
         # Compile numba pyd
         print("========================")
         print(f"执行Numba.pycc编译任务：总计 {len(self._use_nbcc)}...")
@@ -195,10 +294,13 @@ class BuildProject(OPP):
 
         print("========================")
         print(f"执行Pyc编译任务：{len(self._use_pyc)}...")
-        # Execute compiling pyc
-        for file in self._use_pyc:
-            py_compile.compile(file[0], file[1])
-            print(f"子任务完成: {file}")
+        # Execute compiling pyc in worker processes
+        if self._use_pyc:
+            workers = min(len(self._use_pyc), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                sources, targets = zip(*self._use_pyc)
+                for file, _ in zip(self._use_pyc, pool.map(py_compile.compile, sources, targets)):
+                    print(f"子任务完成: {file}")
 
     def stop(self):
         """清理被编译项目中的临时文件"""
@@ -207,32 +309,20 @@ class BuildProject(OPP):
             shutil.rmtree(build_dir)
         print("已清理build文件夹")
         # Remove .c files
-        for (root, folder, files) in os.walk(self.cfg.path):
-            for file in files:
-                if file.endswith(".c"):
-                    c_path = Path(root).joinpath(file)
-                    os.remove(c_path)
+        for entry in _scan(self.cfg.path):
+            if entry.name.endswith(".c"):
+                _unlink(entry.path)
         print("已清理.c文件")
-        # Remove redundant name tag
+        # Remove redundant name tag, cache files and empty folders in one pass
+        # (before copying no-compile files, whose names must be kept as is)
         root = self._save_path.joinpath(self._project_name)
-        for (k, v, j) in os.walk(root):
-            for i in j:
-                raw = Path(k).joinpath(i)
-                ele = i.split(".")
-                file = Path(k).joinpath(ele[0] + "." + ele[-1])
-                os.rename(raw, file)
+        if root.is_dir():
+            _clean_build_dir(root)
         print("已清理临时文件")
+        print("已清理缓存文件")
         # Copy no-compile files
         for (file, new_file) in self._skip_file:
             if not os.path.exists(new_file.parent):
                 os.makedirs(new_file.parent, exist_ok=True)
             shutil.copyfile(file, new_file)
         print("已复制无需编译文件")
-        # Remove cache files
-        for (r, dirs, f) in os.walk(root, topdown=False):
-            for k in dirs:
-                if k == "__pycache__":
-                    shutil.rmtree(Path(r).joinpath(k))
-            if not f:
-                shutil.rmtree(r)
-        print("已清理缓存文件")
@@ -2,6 +2,10 @@ from multiprocessing import Manager, Event, Value
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+import os
+import queue
+import signal
+import threading
 import time
 
 
@@ -9,20 +13,39 @@ from ..protocol import OperationProtocol as OPP
 
 
 class HotReloader(OPP):
-    def __init__(self, config_path: Path, loader):
+    """
+    配置文件热更新管理器。
+    基于 watchdog 的系统级文件事件（inotify / ReadDirectoryChangesW / FSEvents）监听配置目录，
+    连续触发的文件事件在 debounce 秒内合并为一次重载；POSIX 系统下主进程还可通过 SIGHUP 手动触发重载。
+    Args:
+        config_path (Path): 配置文件或配置文件夹路径，为文件时监听其所在目录以捕获编辑器的原子替换保存。
+        loader (ConfigLoader): 配置加载器实例。
+        debounce (float, optional): 文件事件合并等待时间（秒），默认为0.3。
+        suffixes (tuple, optional): 监听文件夹时响应的配置文件后缀，为空时响应全部文件事件。
+        ack_timeout (float, optional): 多进程模式下等待全部子进程确认更新的最长时间（秒），默认为5.0。
+    """
+    def __init__(self, config_path: Path, loader, debounce: float = 0.3, suffixes: tuple = (),
+                 ack_timeout: float = 5.0):
         self.config_path = Path(config_path)
 
         self.loader = loader
+        self.debounce = debounce
+        self.suffixes = tuple(suffixes)
+        self.ack_timeout = ack_timeout
         self._share_data: Manager.Event = None
         self._share_event: Event = None
         self._share_response: Manager.Queue = None
         self._proxy_num: Value = None
         self._logger = None
+        self._snapshot: dict = {}                   # 最近一次写入共享字典的配置，用于本进程内比较差异
 
         self._observer = None
         self._handler = None
         self._callbacks = []
-        self._last_reload_time = 0
+        self._timer: threading.Timer = None
+        self._timer_lock = threading.Lock()
+        self._prev_sighup = None
+        self._watch_file = None
 
     def INFO(self, msg: str):
         if self._logger is not None:
@@ -48,78 +71,171 @@ class HotReloader(OPP):
         self._logger = logger
 
     def start(self):
-        self._share_data.update(self.loader.config.model_dump())
+        self._snapshot = self.loader.config.model_dump()
+        self._share_data.update(self._snapshot)
         self._handler = self._build_handler()
         self._observer = Observer()
-        self._observer.schedule(self._handler, str(self.config_path), recursive=True)
+        if self.config_path.is_dir():
+            self._watch_file = None
+            self._observer.schedule(self._handler, str(self.config_path), recursive=True)
+        else:
+            self._watch_file = os.path.normcase(str(self.config_path.absolute()))
+            self._observer.schedule(self._handler, str(self.config_path.parent), recursive=False)
         self._observer.start()
+        self._install_sighup()
         self.INFO("文件监听已启动")
 
     def join(self):
         pass
 
     def stop(self):
+        self._restore_sighup()
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
         if self._observer:
             self._observer.stop()
             self._observer.join()
             self.INFO("文件监听已停止")
 
+    def _install_sighup(self):
+        """POSIX 系统下注册 SIGHUP 信号，用于手动触发配置重载（仅主线程可注册信号）"""
+        if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+            return
+        self._prev_sighup = signal.signal(signal.SIGHUP, lambda signum, frame: self.schedule_reload("SIGHUP"))
+
+    def _restore_sighup(self):
+        if self._prev_sighup is not None:
+            signal.signal(signal.SIGHUP, self._prev_sighup)
+            self._prev_sighup = None
+
+    def _is_watched(self, path: str) -> bool:
+        """监听单个配置文件时，仅响应该文件本身的事件；监听文件夹时，仅响应配置文件后缀的事件（忽略编辑器交换文件、隐藏文件及__pycache__等）"""
+        if self._watch_file is None:
+            head, name = os.path.split(path)
+            if name.startswith(".") or "__pycache__" in head.replace("\\", "/").split("/"):
+                return False
+            return not self.suffixes or os.path.splitext(name)[1] in self.suffixes
+        return os.path.normcase(os.path.abspath(path)) == self._watch_file
+
+    def schedule_reload(self, source: str):
+        """
+        登记一次配置重载，debounce 时间内的后续事件将重新计时，最终合并为一次重载。
+        Args:
+            source (str): 触发来源（文件路径或信号名称）。
+        Returns:
+            None
+        """
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._reload, args=(source,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _reload(self, source: str):
+        try:
+            self.INFO(f"监听到文件变更: {source}")
+            new_instance = self.loader.load()
+            new_cfg = new_instance.model_dump()
+            is_diff = self._print_diffs(new_cfg)
+
+            if not is_diff:
+                self.INFO("配置文件夹出现更新，但未识别到有效更改，请确认更改文件是否正确")
+                return
+            # 单次update写入共享字典；仅在模块被删除时逐个移除，避免clear后子进程读到空字典
+            for module_name in self._snapshot.keys() - new_cfg.keys():
+                self._share_data.pop(module_name, None)
+            self._share_data.update(new_cfg)
+            self._snapshot = new_cfg
+            self._drain_ack()
+            self._share_event.set()
+
+            for cb in self._callbacks:
+                try:
+                    cb()
+                except Exception as e:
+                    self.ERROR(f"[主进程回调错误] {cb.__name__}: {e}")
+        except Exception as e:
+            self.ERROR(f"[热更新失败] {e}")
+        finally:
+            # 确保在多进程模式下所有子进程都接收到最新的配置并执行回调
+            if self._proxy_num.value > 0 and self._share_event.is_set():
+                self._wait_ack(self._proxy_num.value)
+            self._share_event.clear()
+
+    def _drain_ack(self):
+        """清空上次重载中超时后才到达的子进程确认，避免计入本次重载"""
+        if self._proxy_num.value <= 0:
+            return
+        try:
+            while True:
+                self._share_response.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _wait_ack(self, expected: int):
+        """等待子进程确认接收配置更新，总等待时间不超过ack_timeout，超时后记录错误并停止等待"""
+        deadline = time.monotonic() + self.ack_timeout
+        for count in range(expected):
+            try:
+                self._share_response.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.ERROR(f"[热更新确认超时] 已确认子进程 {count}/{expected}")
+                return
+
     def _build_handler(self):
         manager = self
 
         class ChangeHandler(FileSystemEventHandler):
             def on_modified(self, event):
-                if event.is_directory:
-                    return
+                self._dispatch(event.src_path, event.is_directory)
 
-                if time.time() - manager._last_reload_time < 1.0:
-                    return
-                manager._last_reload_time = time.time()
+            def on_created(self, event):
+                self._dispatch(event.src_path, event.is_directory)
 
-                try:
-                    manager.INFO(f"监听到文件变更: {event.src_path}")
-                    new_instance = manager.loader.load(manager.config_path)
-                    is_diff = manager._print_diffs(new_instance.model_dump())
-
-                    if not is_diff:
-                        manager.INFO("配置文件夹出现更新，但未识别到有效更改，请确认更改文件是否正确")
-                        return
-                    manager._share_data.clear()
-                    manager._share_data.update(new_instance.model_dump())
-                    manager._share_event.set()
-
-                    for cb in manager._callbacks:
-                        try:
-                            cb()
-                        except Exception as e:
-                            manager.ERROR(f"[主进程回调错误] {cb.__name__}: {e}")
-                except Exception as e:
-                    manager.ERROR(f"[热更新失败] {e}")
-                finally:
-                    # 确保在多进程模式下所有子进程都接收到最新的配置并执行回调
-                    if manager._proxy_num.value > 0:
-                        count = 0
-                        while count < manager._proxy_num.value:
-                            manager._share_response.get()
-                            count += 1
-                    manager._share_event.clear()
+            def on_moved(self, event):
+                # 编辑器通常先写入临时文件再重命名覆盖原文件
+                self._dispatch(event.dest_path, event.is_directory)
+
+            @staticmethod
+            def _dispatch(path: str, is_directory: bool):
+                if is_directory or not manager._is_watched(path):
+                    return
+                manager.schedule_reload(path)
 
         return ChangeHandler()
 
     def _print_diffs(self, new_cfg: dict):
+        """与本地快照比较配置差异并输出（含模块、字段的新增与删除），不访问跨进程的共享字典"""
+        shared = self._snapshot
+        if new_cfg == shared:
+            return False
         diff = False
-        shared = self._share_data
-        for module_name in shared.keys():
-            if module_name not in new_cfg:
+        for module_name in shared.keys() - new_cfg.keys():
+            self.INFO(f"[配置变更] 删除模块: {module_name}")
+            diff = True
+        for module_name, new_module in new_cfg.items():
+            if module_name not in shared:
+                self.INFO(f"[配置变更] 新增模块: {module_name}, 值: {new_module}")
+                diff = True
                 continue
-            old_module: dict = shared[module_name]
-            new_module: dict = new_cfg[module_name]
-            for field in old_module.keys():
-                if field not in new_module:
-                    continue
-                old_val = old_module[field]
-                new_val = new_module[field]
-                if old_val != new_val:
-                    self.INFO(f"[配置变更] 模块: {module_name}, 字段: {field}, 旧值: {old_val}, 新值: {new_val}")
+            old_module = shared[module_name]
+            if old_module == new_module:
+                continue
+            if not isinstance(old_module, dict) or not isinstance(new_module, dict):
+                self.INFO(f"[配置变更] 模块: {module_name}, 旧值: {old_module}, 新值: {new_module}")
+                diff = True
+                continue
+            for field in old_module.keys() - new_module.keys():
+                self.INFO(f"[配置变更] 模块: {module_name}, 删除字段: {field}, 旧值: {old_module[field]}")
+                diff = True
+            for field, new_val in new_module.items():
+                if field not in old_module:
+                    self.INFO(f"[配置变更] 模块: {module_name}, 新增字段: {field}, 新值: {new_val}")
+                    diff = True
+                elif old_module[field] != new_val:
+                    self.INFO(f"[配置变更] 模块: {module_name}, 字段: {field}, 旧值: {old_module[field]}, 新值: {new_val}")
                     diff = True
         return diff
@@ -1,5 +1,9 @@
+import os
+import ast
+import copy
 import yaml
 import uuid
+import functools
 import multiprocessing as mp
 import configparser
 from pathlib import Path
@@ -14,6 +18,11 @@ from .hotreloader import HotReloader
 
 from ..protocol import OperationProtocol as OPP, LoaderProtocol as LDP, IdentityProtocol as IDP
 
+# 优先使用LibYAML的C解析器，未安装时退回纯Python实现
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 EXT_LOADERS = {
     ".py": lambda f: load_py_config(f),
@@ -97,10 +106,9 @@ class ConfigLoader(OPP, LDP, IDP):
         Raises:
             ValueError: 如果在 self.schema_cls 中未声明模块且未在注册表中注册该模块，则抛出 ValueError 异常。
         """
-        module_map = get_type_hints(self.schema_cls)
-        for k, v in module_map.items():
-            if k.lower() == module_name.lower():
-                return v
+        schema = _module_schemas(self.schema_cls).get(module_name.lower())
+        if schema is not None:
+            return schema
         if module_name.lower() in self._registry_schema:
             return self._registry_schema[module_name.lower()]
         return None
@@ -167,7 +175,7 @@ class ConfigLoader(OPP, LDP, IDP):
             # 将实例添加到schema_data中
             schema_data[module] = instance
         # 获取schema_cls中所有需要的类型提示的键，并将其转换为小写
-        required_modules = [k.lower() for k in get_type_hints(self.schema_cls).keys()]
+        required_modules = list(_module_schemas(self.schema_cls))
         # 找出schema_data中缺失的模块
         missing = [m for m in required_modules if m not in schema_data]
         # 使用schema_data中的数据实例化schema_cls
@@ -236,7 +244,7 @@ class ConfigLoader(OPP, LDP, IDP):
 
         if not self._hot_manager:
             # 创建HotReloader实例
-            self._hot_manager = HotReloader(self.config_path, self)
+            self._hot_manager = HotReloader(self.config_path, self, suffixes=tuple(EXT_LOADERS))
             self._hot_manager.bind_share(self._share_data, self._share_event, self._share_response, self._proxy_num,
                                          self._logger)
             self._hot_manager.start()
@@ -306,6 +314,21 @@ class ConfigLoader(OPP, LDP, IDP):
         return self.proxy.json(indent=2, ensure_ascii=False)
 
 
+@functools.lru_cache(maxsize=None)
+def _type_hints(cls) -> dict:
+    """解析并缓存类的类型注解，每个Schema类仅解析一次；返回结果不可修改"""
+    return get_type_hints(cls)
+
+
+@functools.lru_cache(maxsize=None)
+def _module_schemas(cls) -> dict:
+    """小写模块名 -> 对应的Schema类，大小写重复时保留先声明者"""
+    schemas = {}
+    for k, v in _type_hints(cls).items():
+        schemas.setdefault(k.lower(), v)
+    return schemas
+
+
 def create_schema(cfg_dict: dict, schema: Type[BaseModel]):
     """
     根据配置字典创建指定类型的Schema实例。
@@ -321,7 +344,7 @@ def create_schema(cfg_dict: dict, schema: Type[BaseModel]):
     # 初始化一个空字典用于存储类型化的数据
     typed_data = {}
     # 遍历schema类的类型提示
-    for field, field_type in get_type_hints(schema).items():
+    for field, field_type in _type_hints(schema).items():
         # 如果字段在配置字典中存在，则进行类型化处理
         if field in cfg_dict:
             typed_data[field] = normalize_value(cfg_dict[field], field_type, field)
@@ -366,10 +389,19 @@ def read_config(config_path: Union[str, Path]):
     """
     file = Path(config_path)
     loader = EXT_LOADERS[file.suffix]
-    raw_data = loader(file)
+    # 以(路径, 修改时间, 大小)为键缓存解析结果，未修改的文件在重载时无需重新解析；
+    # merge_dicts会原地修改嵌套字典，因此返回缓存结果的深拷贝
+    stat = os.stat(file)
+    raw_data = copy.deepcopy(_parse_config(str(file.absolute()), stat.st_mtime_ns, stat.st_size, loader))
     result: Dict[str, dict] = {k.lower(): {i: j for (i, j) in v.items()} for (k, v) in raw_data.items()}
     return result
 
+
+@functools.lru_cache(maxsize=256)
+def _parse_config(path: str, mtime_ns: int, size: int, loader: Callable) -> dict:
+    """解析配置文件，结果按文件路径、修改时间与大小缓存"""
+    return loader(Path(path))
+
 def load_py_config(file_path: Path) -> dict:
     """
     从指定的Python文件中加载配置，返回一个包含配置项的字典。
@@ -429,8 +461,7 @@ def load_yaml_config(file_path: Path) -> dict:
         dict: 包含YAML配置信息的字典。如果文件不存在或解析失败，将返回一个空字典。
 
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return yaml.load(Path(file_path).read_bytes(), Loader=_YamlLoader) or {}
 
 
 def merge_dicts(base: dict, override: dict) -> dict:
@@ -453,6 +484,44 @@ def merge_dicts(base: dict, override: dict) -> dict:
     return base
 
 
+def _to_bool(value):
+    text = str(value).lower()
+    if text in ("1", "true"):
+        return True
+    elif text in ("0", "false"):
+        return False
+    raise ValueError(f"非法布尔值: {value}")
+
+
+def _to_int(value):
+    return int(str(value).replace(",", ""))
+
+
+def _to_float(value):
+    return float(str(value).replace(",", ""))
+
+
+def _to_str(value):
+    value = str(value).strip().replace("%", "%%")
+    # 形如 1e5 的科学计数法字符串转换为数值
+    if "e" in value.lower() and all([i.isdigit() for i in value.split("e")]):
+        value = ast.literal_eval(value)
+    return value
+
+
+def _to_dict(value):
+    value = ast.literal_eval(value) if not isinstance(value, dict) else value
+    return {k.strip(): v for k, v in value.items()}
+
+
+def _to_list(value):
+    return ast.literal_eval(value) if not isinstance(value, list) else value
+
+
+# 期望类型 -> 标准化函数；字符串形式的字典、列表仅按字面量解析，不执行任意代码
+_NORMALIZERS = {bool: _to_bool, int: _to_int, float: _to_float, str: _to_str, dict: _to_dict, list: _to_list}
+
+
 def normalize_value(value, expected_type, field_name=""):
     """
     对输入的值进行类型校验和标准化处理。
@@ -469,29 +538,11 @@ def normalize_value(value, expected_type, field_name=""):
         ValueError: 如果值的类型不符合期望的类型或转换过程中发生错误，则引发此异常。
 
     """
+    # 泛型注解（如List[int]）不是type实例，原样返回
+    normalizer = _NORMALIZERS.get(expected_type) if isinstance(expected_type, type) else None
+    if normalizer is None:
+        return value
     try:
-        if expected_type == bool:
-            if str(value).lower() in ["1", "true"]:
-                return True
-            elif str(value).lower() in ["0", "false"]:
-                return False
-            else:
-                raise ValueError(f"非法布尔值: {value}")
-        elif expected_type == int:
-            return int(str(value).replace(",", ""))
-        elif expected_type == float:
-            return float(str(value).replace(",", ""))
-        elif expected_type == str:
-            value = str(value).strip().replace("%", "%%")
-            if all([i.isdigit() for i in value.split("e")]) and "e" in value.lower():
-                value = eval(value)
-            return value
-        elif expected_type == dict:
-            value = eval(value) if not isinstance(value, dict) else value
-            return {k.strip(): v for k, v in value.items()}
-        elif expected_type == list:
-            return eval(value) if not isinstance(value, list) else value
-        else:
-            return value
+        return normalizer(value)
     except Exception as e:
         raise ValueError(f"字段[{field_name}] 类型校验失败: {e}")
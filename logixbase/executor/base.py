@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import uuid
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Callable, Iterable, List, Union
 from . import context as ctx
 from .payload import TaskEnvelope
 
@@ -128,6 +128,43 @@ class BaseExecutor(ABC, OPP, IDP):
 
         return task_id
 
+    def submit_many(self, func: Callable, param_iter: Iterable, task_name: Union[str, Callable]=None,
+                    **kwargs) -> List[str]:
+        """
+        批量提交同一任务函数的多组参数，函数路径仅解析一次，任务列表与状态表一次性写入。
+        Args:
+            func (Callable): 要执行的任务函数。
+            param_iter (Iterable): 参数组合迭代器，每个元素为一组位置参数（非tuple元素视为单个参数）。
+            task_name (Union[str, Callable], optional): 任务名称。传入可调用对象时以每组位置参数调用，逐个生成任务名称；
+                                                        如果未提供，则默认使用任务函数的名称。默认为None。
+            **kwargs: 所有任务共用的关键字参数。
+        Returns:
+            List[str]: 按提交顺序排列的任务唯一标识符列表。
+        """
+        name = task_name or func.__name__
+        name_of = name if callable(name) else None
+        if self.mode != "thread":
+            func = f"{getattr(func, '__module__', 'unknown')}.{getattr(func, '__name__', 'anonymous')}"
+
+        task_ids = []
+        names = []
+        envelopes = []
+        for args in param_iter:
+            if not isinstance(args, tuple):
+                args = (args,)
+            if name_of is not None:
+                name = name_of(*args)
+            self._task_counter += 1
+            task_id = self._gen_task_id(name)
+            task_ids.append(task_id)
+            names.append(name)
+            envelopes.append(TaskEnvelope(task_id=task_id, func=func, args=args, kwargs=kwargs).serialize())
+
+        self.task_id_map.update((task_id, (name, func)) for task_id, name in zip(task_ids, names))
+        self.tasks.extend(envelopes)
+        self._statuses.update((task_id, "pending") for task_id in task_ids)
+
+        return task_ids
 
     def _gen_task_id(self, name):
         """
@@ -48,7 +48,7 @@ class Coordinator(OPP):
         task_mode (str, optional): 函数执行逻辑，默认为hybrid，支持的模式包括 once / loop / hybrid
         **kwargs:
             - thread: max_worker
-            - process: max_worker / maxtasksperchild / batch_size
+            - process: max_worker / maxtasksperchild / batch_size / in_flight_per_worker
     Raises:
         ValueError: 如果输入的模式不在支持的模式列表中时抛出。
     """
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 import os
+import sys
+import math
 from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
 import matplotlib.pyplot as plt
 import json
 import pandas as pd
@@ -13,6 +17,7 @@ from .process import ProcessExecutor
 from .thread import ThreadExecutor
 from .task import Task, TaskRegistry
 from .base import BaseExecutor
+from .payload import import_func_from_path
 
 
 class MultiTaskExecutor(BaseExecutor):
@@ -26,7 +31,7 @@ class MultiTaskExecutor(BaseExecutor):
         mode (str, optional): 模式，默认为 'process'。支持的模式包括 'process', 'pool', 'thread'。
         **kwargs:
             - thread: max_worker
-            - process: max_worker / maxtasksperchild / batch_size
+            - process: max_worker / maxtasksperchild / batch_size / in_flight_per_worker
     Raises:
         ValueError: 如果输入的模式不在支持的模式列表中时抛出。
     """
@@ -34,7 +39,8 @@ class MultiTaskExecutor(BaseExecutor):
         super().__init__(mode)
 
         if self.mode in ("process", "pool"):
-            kwargs = {k: v for k, v in kwargs.items() if k in ("max_workers", "maxtasksperchild", "batch_size")}
+            kwargs = {k: v for k, v in kwargs.items() if k in ("max_workers", "maxtasksperchild", "batch_size",
+                                                             "in_flight_per_worker")}
             self.executor = ProcessExecutor(mode, **kwargs)
         elif self.mode == 'thread':
             kwargs = {k: v for k, v in kwargs.items() if k in ("max_workers",)}
@@ -53,6 +59,89 @@ class MultiTaskExecutor(BaseExecutor):
         self.task_registry.register(task)
         return task_id
 
+    def submit_many(self, func, param_iter, group=None, tags=None, task_name=None, **kwargs):
+        """
+        批量提交同一任务函数的多组参数。
+        Args:
+            func (Callable): 要执行的任务函数。
+            param_iter (Iterable): 参数组合迭代器，每个元素为一组位置参数。
+            group (str, optional): 所有任务所属的组名。
+            tags (Union[List[str], Callable], optional): 任务标签。传入可调用对象时以每组位置参数调用，逐个生成标签；
+                                                         否则为所有任务共用的标签。
+            task_name (Union[str, Callable], optional): 任务名称。传入可调用对象时以每组位置参数调用，逐个生成任务名称；
+                                                        默认使用任务函数的名称。
+            **kwargs: 所有任务共用的关键字参数。
+        Returns:
+            List[str]: 任务ID列表。
+        """
+        param_list = [args if isinstance(args, tuple) else (args,) for args in param_iter]
+        task_ids = self.executor.submit_many(func, param_list, task_name=task_name, **kwargs)
+        for task_id, args in zip(task_ids, param_list):
+            task_tags = tags(*args) if callable(tags) else tags
+            self.task_registry.register(Task(task_id, func, args, kwargs, group=group, tags=task_tags))
+        return task_ids
+
+    def map_numpy(self, func, *arrays: np.ndarray, chunk_size: int = None, group=None, tags=None,
+                  task_name=None) -> np.ndarray:
+        """
+        将向量化函数按行分块并行映射到一组等长数组上，并按原顺序拼接各分块结果。
+        进程模式下输入数组只复制一次至共享内存，各工作进程直接映射对应分块，不再逐元素序列化参数；
+        线程模式下直接传入数组切片。
+        注意：该方法会立即 start 并 join，已提交但尚未执行的任务会一并执行。
+        Args:
+            func (Callable): 向量化函数，接收与 arrays 一一对应的数组分块，返回与分块等长的数组。
+            *arrays (np.ndarray): 输入数组，首维长度须一致。
+            chunk_size (int, optional): 单个分块的行数，默认按工作进程（线程）数均分。
+            group (str, optional): 分块任务所属的组名。
+            tags (List[str], optional): 分块任务的标签。
+            task_name (str, optional): 任务名称，默认使用函数名称。
+        Returns:
+            np.ndarray: 各分块结果按顺序拼接后的数组。
+        Raises:
+            ValueError: 未传入数组或数组长度不一致时抛出。
+            RuntimeError: 存在执行失败的分块时抛出。
+        """
+        if not arrays:
+            raise ValueError("请至少传入一个数组")
+        arrays = [np.ascontiguousarray(arr) for arr in arrays]
+        size = len(arrays[0])
+        if any(len(arr) != size for arr in arrays):
+            raise ValueError("输入数组长度不一致")
+        if not size:
+            return np.asarray(func(*arrays))
+
+        chunk_size = chunk_size or math.ceil(size / max(1, self.executor.max_workers))
+        bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+        task_name = task_name or func.__name__
+
+        blocks = []
+        try:
+            if self.mode == "thread":
+                params = [tuple(arr[start:stop] for arr in arrays) for start, stop in bounds]
+                task_ids = self.submit_many(func, params, group=group, tags=tags, task_name=task_name)
+            else:
+                specs = []
+                for arr in arrays:
+                    block = SharedMemory(create=True, size=max(arr.nbytes, 1))
+                    blocks.append(block)
+                    np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)[:] = arr
+                    specs.append((block.name, arr.shape, arr.dtype.str))
+                func_path = f"{func.__module__}.{func.__name__}"
+                params = [(func_path, specs, start, stop) for start, stop in bounds]
+                task_ids = self.submit_many(_shared_array_task, params, group=group, tags=tags, task_name=task_name)
+
+            self.start()
+            results = self.join()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        failed = [task_id for task_id in task_ids if results.get(task_id) is None]
+        if failed:
+            raise RuntimeError(f"分块任务执行失败: {failed}")
+        return np.concatenate([np.asarray(results[task_id]) for task_id in task_ids])
+
     def start(self):
         self.executor.start()
         self._started = True
@@ -272,3 +361,36 @@ class MultiTaskExecutor(BaseExecutor):
             print("任务标签统计:", self.summary_by_tag())
             print("--- 任务详细统计 ---")
             pprint(summary)
+
+
+def _shared_array_task(func_path: str, specs: list, start: int, stop: int, **kwargs):
+    """
+    工作进程中执行的分块任务：映射共享内存中的输入数组，对 [start, stop) 分块调用向量化函数。
+    Args:
+        func_path (str): 向量化函数的导入路径。
+        specs (list): 各输入数组的共享内存描述 (name, shape, dtype)。
+        start (int): 分块起始行。
+        stop (int): 分块结束行（不含）。
+        **kwargs: 共享上下文注入的参数，原样传递给向量化函数。
+    Returns:
+        np.ndarray: 分块计算结果（已复制，不引用共享内存）。
+    """
+    func = import_func_from_path(func_path)
+    # 共享内存由主进程创建并负责unlink；3.13+ 挂载时不再登记至 resource_tracker
+    if sys.version_info >= (3, 13):
+        blocks = [SharedMemory(name=name, track=False) for name, _, _ in specs]
+    else:
+        blocks = [SharedMemory(name=name) for name, _, _ in specs]
+    views = []
+    try:
+        views = [np.ndarray(shape, dtype=dtype, buffer=block.buf)[start:stop]
+                 for block, (_, shape, dtype) in zip(blocks, specs)]
+        return np.array(func(*views, **kwargs))
+    finally:
+        views.clear()
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # 异常回溯仍引用分块视图时，映射随视图回收释放
+                pass
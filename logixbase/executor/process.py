@@ -1,24 +1,41 @@
 # -*- coding: utf-8 -*-
 from multiprocessing import Pool
+import os
 import time
 import traceback
 import psutil
+import threading
 import multiprocessing as mp
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker
+from collections import deque
+from typing import Union
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from .context import init_worker, get_context_kwargs, global_context
 from .base import BaseExecutor
 from .payload import TaskEnvelope, import_func_from_path
 
 
+# 进程池无法再接收任务时提交抛出的异常：
+# Pool 关闭后 apply_async 抛出 ValueError，ProcessPoolExecutor 损坏后 submit 抛出 BrokenProcessPool
+_POOL_UNUSABLE = (ValueError, BrokenProcessPool)
+
 
 class ProcessExecutor(BaseExecutor):
     """
     多进程任务执行器。
+    进程池在首次 start 时创建，并在多次 start / join（如 retry_failed、rerun_cancelled）之间复用，
+    直到调用 stop 或重新绑定共享上下文时才关闭，避免每批任务重复创建进程池的 fork + import 开销；
+    进程池已关闭或因工作进程异常退出而损坏时，start 提交首个任务失败后重建一次进程池并重试。
+    任务以滑动窗口方式提交：进程池中最多保持 in_flight_per_worker * max_workers（且不超过 batch_size）个在途任务，
+    每个任务完成时立即补充下一个，使每个工作进程在执行当前任务的同时总有一个已序列化待执行的任务。
+    补充提交在进程池回调中执行，提交失败时记录异常并由 join 抛出。
     Args:
         max_workers (int, optional): 最大工作进程数，默认为 CPU 核心数减一。
-        maxtasksperchild (int, optional): 每个子进程最多执行的任务数，默认为 1。
-        batch_size (int, optional): 每个批次的大小，默认为 100。
+        maxtasksperchild (int, optional): 每个子进程最多执行的任务数，默认为 1；传入 None 时子进程常驻复用。
+        batch_size (int, optional): 进程池中在途任务数的上限，默认为 100。
+        in_flight_per_worker (int, optional): 每个工作进程的在途任务数，默认为 2。
     Returns:
         None
     """
@@ -26,17 +43,75 @@ class ProcessExecutor(BaseExecutor):
                  mode: str = "pool",
                  max_workers: int=mp.cpu_count() - 1,
                  maxtasksperchild: int=1,
-                 batch_size: int=100):
+                 batch_size: int=100,
+                 in_flight_per_worker: int=2):
         super().__init__(mode)
 
         self.max_workers = min(max_workers, mp.cpu_count() - 1)
         if mode != "pool":
             self.max_workers = min(60, self.max_workers)
         self.maxtasksperchild = maxtasksperchild
-        self.batch_size = batch_size
+        self.batch_size = max(1, batch_size)
+        self.in_flight_per_worker = max(1, in_flight_per_worker)
+
+        self._task_queue: deque = deque()
+        self._futures = []
+        self._submit_cond = threading.Condition()
+        self._total = 0
+        self._submit_error: Union[BaseException, None] = None
+        self._pool: Union[Pool, ProcessPoolExecutor, None] = None
+
+    def bind_share(self, **kwargs):
+        if self._context is not None and self._context.to_kwargs() == kwargs:
+            return
+        super().bind_share(**kwargs)
+        # 共享上下文通过进程池initializer注入，重新绑定后需重建进程池
+        self._shutdown_pool()
+
+    def _get_pool(self) -> Union[Pool, ProcessPoolExecutor]:
+        """
+        获取常驻进程池，不存在时按当前模式创建。
+        Returns:
+            Union[Pool, ProcessPoolExecutor]: 当前执行器持有的进程池。
+        """
+        if self._pool is None:
+            # 先于工作进程启动 resource_tracker，使工作进程共用主进程的 tracker：
+            # 否则工作进程挂载共享内存（如 map_numpy）时会各自启动 tracker，退出时报告泄漏并重复 unlink
+            if os.name == "posix":
+                resource_tracker.ensure_running()
+            if self.mode == "pool":
+                self._pool = Pool(
+                    processes=self.max_workers,
+                    initializer=init_worker,
+                    initargs=(self._context,),
+                    maxtasksperchild=self.maxtasksperchild
+                )
+            else:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_worker,
+                                                 initargs=(self._context,))
+        return self._pool
+
+    def _shutdown_pool(self):
+        """
+        关闭并释放常驻进程池。
+        Returns:
+            无
+        """
+        # 先解除引用并唤醒等待中的 join，关闭过程中触发的完成回调不再向该进程池提交任务
+        with self._submit_cond:
+            pool, self._pool = self._pool, None
+            self._submit_cond.notify_all()
+        if pool is None:
+            return
+        if self.mode == "pool":
+            pool.close()
+            pool.join()
+        else:
+            pool.shutdown()
 
-        self._task_queue = []
-        self._futures_batches = []
+    def stop(self):
+        self._shutdown_pool()
+        super().stop()
 
     def start(self):
         self.reset_tracking()
@@ -44,55 +119,93 @@ class ProcessExecutor(BaseExecutor):
         if not self.tasks:
             return
 
-        self._task_queue = list(self.tasks)
-        self._futures_batches = []
-
-        if self.mode == "pool":
-            while self._task_queue:
-                current_batch = self._task_queue[:self.batch_size]
-                self._task_queue = self._task_queue[self.batch_size:]
-
-                pool = Pool(
-                    processes=self.max_workers,
-                    initializer=init_worker,
-                    initargs=(self._context,),
-                    maxtasksperchild=self.maxtasksperchild
-                )
-                futures = [pool.apply_async(_pool_worker, args=(task,)) for task in current_batch]
-                self._futures_batches.append((pool, futures))
-        else:
-            pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_worker, initargs=(self._context,))
-            self._futures_batches.append(pool)
-            for task in self._task_queue:
-                future = pool.submit(_pool_worker, task)
-                self._futures_batches.append(future)
+        with self._submit_cond:
+            self._task_queue = deque(self.tasks)
+            self._futures = []
+            self._total = len(self.tasks)
+            self._submit_error = None
+
+        self._get_pool()
+        self._submit_next()
+        if isinstance(self._submit_error, _POOL_UNUSABLE):
+            # 常驻进程池已关闭（Pool 抛出 ValueError）或已损坏（BrokenProcessPool），重建一次后重试；
+            # 重建须在锁外进行，进程池关闭时仍可能触发需要获取该锁的完成回调
+            with self._submit_cond:
+                self._submit_error = None
+            self._shutdown_pool()
+            self._get_pool()
+            self._submit_next()
+        for _ in range(min(self._total, self.in_flight_per_worker * self.max_workers, self.batch_size) - 1):
+            self._submit_next()
 
         self._started = True
 
-    def join(self, return_results=True):
+    def _submit_next(self, *_):
+        """
+        从待执行队列中取出下一个任务提交至进程池，同时作为任务完成回调以补充在途任务。
+        回调中的异常会被进程池吞掉，因此提交失败时记录异常并停止提交，由 join 抛出。
+        Returns:
+            无
+        """
+        with self._submit_cond:
+            if not self._task_queue or self._pool is None or self._submit_error is not None:
+                return
+            task = self._task_queue.popleft()
+            try:
+                if self.mode == "pool":
+                    future = self._pool.apply_async(_pool_worker, args=(task,),
+                                                    callback=self._submit_next, error_callback=self._submit_next)
+                else:
+                    future = self._pool.submit(_pool_worker, task)
+                    future.add_done_callback(self._submit_next)
+            except BaseException as e:
+                # 任务放回队首，进程池重建后可重新提交
+                self._task_queue.appendleft(task)
+                self._submit_error = e
+            else:
+                self._futures.append(future)
+            self._submit_cond.notify_all()
+
+    def _wait_future(self, index: int):
+        """
+        等待第 index 个任务提交完成并返回其 future；提交失败或进程池已关闭时抛出异常。
+        Args:
+            index (int): 任务的提交序号。
+        Returns:
+            Union[AsyncResult, Future]: 对应任务的 future。
+        """
+        with self._submit_cond:
+            self._submit_cond.wait_for(lambda: len(self._futures) > index
+                                       or self._submit_error is not None or self._pool is None)
+            if len(self._futures) > index:
+                return self._futures[index]
+            error = self._submit_error
+        if error is None:
+            raise RuntimeError(f"进程池已关闭，剩余 {self._total - index} 个任务未提交")
+        raise error
 
-        if self.mode == "pool":
-            for pool, futures in self._futures_batches:
-                for future in futures:
+    def join(self, return_results=True):
+        try:
+            for i in range(self._total):
+                future = self._wait_future(i)
+                if self.mode == "pool":
                     task_id, result, elapsed, mem_used = future.get()
-                    self._statuses[task_id] = "done" if result is not None else "error"
-                    self._elapsed[task_id] = elapsed
-                    self._memory_usage[task_id] = mem_used
-                    if return_results:
-                        self._results[task_id] = result
-                pool.close()
-                pool.join()
-        else:
-            if self._futures_batches:
-                pool = self._futures_batches.pop(0)
-                for future in as_completed(self._futures_batches):
+                else:
                     task_id, result, elapsed, mem_used = future.result()
-                    self._statuses[task_id] = "done" if result is not None else "error"
-                    self._elapsed[task_id] = elapsed
-                    self._memory_usage[task_id] = mem_used
-                    if return_results:
-                        self._results[task_id] = result
-                pool.shutdown()
+                self._statuses[task_id] = "done" if result is not None else "error"
+                self._elapsed[task_id] = elapsed
+                self._memory_usage[task_id] = mem_used
+                if return_results:
+                    self._results[task_id] = result
+        except BrokenProcessPool:
+            # 工作进程异常退出，进程池已不可用，关闭后由下次 start 重建
+            self._shutdown_pool()
+            raise
+        finally:
+            with self._submit_cond:
+                self._task_queue.clear()
+                self._futures = []
+                self._total = 0
 
         return self._results if return_results else None
 
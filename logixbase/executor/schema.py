@@ -7,3 +7,4 @@ class ExecutorConfig(BaseModel):
     max_workers: int = Field(default=60, description="最大使用CPU数量")
     batch_size: int = Field(default=100, description="每个批次的执行任务数量")
     maxtasksperchild: int = Field(default=1, description="每个子进程最多执行的任务数")
+    in_flight_per_worker: int = Field(default=2, description="每个工作进程的在途任务数")
@@ -310,6 +310,45 @@ class SqlServerFeeder(BaseFeeder):
 
         return info_data
 
+    def asset_info_many(self, requests: List[tuple], use_schema: bool = False):
+        """
+        批量查询多组资产信息：相同资产类型及信息类型的请求合并为一次查询，再按各请求的合约列表拆分结果
+        Args:
+            requests (List[tuple]): 查询请求列表，每个元素为 (asset, info, ticker)，ticker 为 None 时查询全部合约
+            use_schema (bool): 是否将结果转换为信息数据结构（仅适用于basic信息）
+        Returns:
+            list: 与 requests 顺序一致的查询结果
+        """
+        groups = defaultdict(list)
+        for i, (asset, info, ticker) in enumerate(requests):
+            groups[(asset.lower(), info.lower())].append((i, ticker))
+
+        results = [None] * int(len(requests))
+        for (asset, info), members in groups.items():
+            tickers = [ticker for _, ticker in members]
+            # 任一请求查询全部合约时，合并查询不加合约过滤
+            merged = None if any(not t for t in tickers) else list(dict.fromkeys(sum(map(list, tickers), [])))
+            data = self.asset_info(asset, info, ticker=merged)
+            if data is None:
+                continue
+            for i, ticker in members:
+                sub = data if int(len(members)) == 1 else self._filter_info(asset, data, ticker)
+                if use_schema and info == "basic":
+                    sub = self.create_info_schema(asset, sub)
+                results[i] = sub
+        return results
+
+    @staticmethod
+    def _filter_info(asset: str, data: pd.DataFrame, ticker: list = None):
+        """按与查询语句一致的合约/品种条件，从合并查询结果中筛选单个请求的数据"""
+        if not ticker:
+            return data
+        product_lst, ticker_lst = parse_ticker(asset, ticker)
+        mask = data["Ticker"].str.upper().isin(ticker_lst)
+        if asset == "future" and product_lst:
+            mask |= data["Product"].str.upper().isin([x.split('_')[0] for x in product_lst])
+        return data.loc[mask].reset_index(drop=True)
+
     def future_info_basic(self, ticker: list = None):
         query = """
                 SELECT [Ticker], [Instrument] AS [Instrument], [Product], [Exchange], 
@@ -1,6 +1,6 @@
-from .core import LogManager
+from .core import LogManager, INFO, DEBUG, WARNING, ERROR, CRITICAL
 from .decorator import auto_log
 from .schema import LoggerConfig
 
 
-__all__ = ['LogManager', 'auto_log', 'LoggerConfig']
\ No newline at end of file
+__all__ = ['LogManager', 'auto_log', 'LoggerConfig', 'INFO', 'DEBUG', 'WARNING', 'ERROR', 'CRITICAL']
\ No newline at end of file
@@ -2,7 +2,7 @@ import os
 import threading
 import multiprocessing as mp
 from pathlib import Path
-from typing import Union
+from typing import Union, Optional
 import uuid
 from typing import get_type_hints
 
@@ -21,14 +21,13 @@ class LogManager(OPP, IDP):
     __started = False
 
     @staticmethod
-    def get_instance(config: Union[LoggerConfig, dict]):
+    def get_instance(config: Optional[Union[LoggerConfig, dict]] = None):
         """
         获取 LogManager 的单例实例。
-        如果传入 use_multiprocess 参数，则使用该参数决定日志写入模式，
-        否则采用配置文件中的默认设置。
+        首次调用时按传入配置创建实例（未传入则使用默认配置），此后直接返回已创建的实例。
         """
         if LogManager.__instance is None:
-            LogManager.__instance = LogManager(config)
+            LogManager.__instance = LogManager(config if config is not None else LoggerConfig())
         return LogManager.__instance
 
     def __init__(self, config: Union[LoggerConfig, dict]):
@@ -127,3 +126,29 @@ class LogManager(OPP, IDP):
             print(formatted)
         else:
             self.log_writer.enqueue(formatted)
+
+
+
+def INFO(message: str, log_id: str = None):
+    """使用全局日志管理器记录 INFO 日志"""
+    LogManager.get_instance().log("INFO", message, log_id)
+
+
+def DEBUG(message: str, log_id: str = None):
+    """使用全局日志管理器记录 DEBUG 日志"""
+    LogManager.get_instance().log("DEBUG", message, log_id)
+
+
+def WARNING(message: str, log_id: str = None):
+    """使用全局日志管理器记录 WARNING 日志"""
+    LogManager.get_instance().log("WARNING", message, log_id)
+
+
+def ERROR(message: str, log_id: str = None):
+    """使用全局日志管理器记录 ERROR 日志"""
+    LogManager.get_instance().log("ERROR", message, log_id)
+
+
+def CRITICAL(message: str, log_id: str = None):
+    """使用全局日志管理器记录 CRITICAL 日志"""
+    LogManager.get_instance().log("CRITICAL", message, log_id)
@@ -1,21 +1,101 @@
 import time
+import inspect
+import functools
 import traceback
 from .core import LogManager
 
 
+# 按函数签名生成的包装函数模板：参数列表与日志文本在装饰时固化，调用时无需 *args/**kwargs 打包解包
+_WRAPPER_TEMPLATE = """
+def wrapper({params}):
+    _lm = _get_instance()
+    _lm.log("INFO", _msg_start, log_id=_log_id)
+    _t0 = _now()
+    try:
+        _r = _fn({call})
+    except Exception as _e:
+        _lm.log("ERROR", f"{{_msg_error}}{{_e}}\\n{{_format_exc()}}", log_id=_log_id)
+        raise
+    _lm.log("INFO", _msg_done % (_now() - _t0), log_id=_log_id)
+    return _r
+"""
+
+# 模板内部使用的名称，与被装饰函数参数重名时退回通用包装
+_RESERVED = {"_lm", "_t0", "_r", "_e", "_fn", "_get_instance", "_now", "_format_exc",
+             "_log_id", "_msg_start", "_msg_done", "_msg_error"}
+
+
+def _specialize(func, namespace: dict):
+    """根据函数签名生成专用包装函数，签名无法解析时返回 None"""
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError):
+        return None
+
+    params, call = [], []
+    has_var_pos = False
+    for i, (name, param) in enumerate(sig.parameters.items()):
+        if name in _RESERVED:
+            return None
+        kind = param.kind
+        if kind is param.KEYWORD_ONLY and not has_var_pos:
+            params.append("*")
+            has_var_pos = True
+
+        if kind is param.VAR_POSITIONAL:
+            params.append(f"*{name}")
+            call.append(f"*{name}")
+            has_var_pos = True
+            continue
+        if kind is param.VAR_KEYWORD:
+            params.append(f"**{name}")
+            call.append(f"**{name}")
+            continue
+
+        if param.default is param.empty:
+            params.append(name)
+        else:
+            default_name = f"_default_{i}"
+            namespace[default_name] = param.default
+            params.append(f"{name}={default_name}")
+        call.append(f"{name}={name}" if kind is param.KEYWORD_ONLY else name)
+
+        if kind is param.POSITIONAL_ONLY:
+            following = list(sig.parameters.values())[i + 1:]
+            if not following or following[0].kind is not param.POSITIONAL_ONLY:
+                params.append("/")
+
+    code = _WRAPPER_TEMPLATE.format(params=", ".join(params), call=", ".join(call))
+    exec(compile(code, f"<auto_log {func.__qualname__}>", "exec"), namespace)
+    return namespace["wrapper"]
+
+
 def auto_log(func):
-    def wrapper(*args, **kwargs):
-        lm = LogManager.get_instance()
-        log_id = f"{func.__module__}.{func.__name__}"
-        start_time = time.time()
-        lm.log("INFO", f"函数 {func.__name__} 开始执行。", log_id=log_id)
-        try:
-            result = func(*args, **kwargs)
-            elapsed = time.time() - start_time
-            lm.log("INFO", f"函数 {func.__name__} 执行完毕，耗时 {elapsed:.3f} 秒。", log_id=log_id)
-            return result
-        except Exception as e:
-            err_msg = f"函数 {func.__name__} 异常: {str(e)}\n{traceback.format_exc()}"
-            lm.log("ERROR", err_msg, log_id=log_id)
-            raise
-    return wrapper
+    log_id = f"{func.__module__}.{func.__name__}"
+    namespace = {
+        "_fn": func,
+        "_get_instance": LogManager.get_instance,
+        "_now": time.perf_counter,
+        "_format_exc": traceback.format_exc,
+        "_log_id": log_id,
+        "_msg_start": f"函数 {func.__name__} 开始执行。",
+        "_msg_done": f"函数 {func.__name__} 执行完毕，耗时 %.3f 秒。",
+        "_msg_error": f"函数 {func.__name__} 异常: ",
+    }
+    wrapper = _specialize(func, namespace)
+
+    if wrapper is None:
+        def wrapper(*args, **kwargs):
+            lm = LogManager.get_instance()
+            start_time = time.perf_counter()
+            lm.log("INFO", namespace["_msg_start"], log_id=log_id)
+            try:
+                result = func(*args, **kwargs)
+                lm.log("INFO", namespace["_msg_done"] % (time.perf_counter() - start_time), log_id=log_id)
+                return result
+            except Exception as e:
+                err_msg = f"{namespace['_msg_error']}{str(e)}\n{traceback.format_exc()}"
+                lm.log("ERROR", err_msg, log_id=log_id)
+                raise
+
+    return functools.update_wrapper(wrapper, func)
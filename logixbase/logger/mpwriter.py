@@ -1,62 +1,162 @@
 import multiprocessing as mp
+from multiprocessing import util
 import os
-import datetime
+import queue
+import threading
+import weakref
+from collections import deque
 from datetime import date, datetime, timedelta
 
 
 from .schema import LoggerConfig
 
 
+# 子进程首次写日志时初始化本地缓冲区的锁
+_BUFFER_INIT_LOCK = threading.Lock()
+
+
 class MPLogWriter:
+    """
+    多进程日志写入器。
+    创建写入器的进程（主进程）内，各线程的日志直接放入本地 SimpleQueue，由写入线程落盘，不经过任何跨进程队列；
+    仅当首个子进程接入（写入器被序列化传递或发生 fork）时，才惰性创建跨进程共享队列及转发线程。
+    子进程先将日志写入本进程的缓冲区，由后台线程按 batch_interval 定时、或在缓冲区达到 batch_size 时
+    批量推送至共享队列，每批日志只发生一次跨进程通信。
+    """
     def __init__(self, config: LoggerConfig):
         self.config: LoggerConfig = config
 
-        # 使用 multiprocessing.Queue 来传递日志消息
-        mgr = mp.Manager()
-        self.log_queue = mgr.Queue()
-        self.stop_event = mgr.Event()
-        # 在主进程中创建日志写入进程
-        self.worker_process = None
+        # 主进程内的日志队列：线程间传递，无需跨进程通信
+        self.log_queue = queue.SimpleQueue()
+        self.stop_event = threading.Event()
+        # 跨进程共享队列，首个子进程接入时创建
+        self.mp_queue = None
+        self.worker = None
+
+        self._owner_pid = os.getpid()
+        self._attach_lock = threading.Lock()
+        self._manager = None
+        self._relay = None
+
+        self._pid = None
+        self._buffer = None
+        self._flush_lock = None
+        self._flush_stop = None
+        self._flusher = None
+
+        if hasattr(os, "register_at_fork"):
+            # fork 方式创建的子进程不经过序列化，需在 fork 前准备好共享队列
+            ref = weakref.ref(self)
+            os.register_at_fork(before=lambda: (ref() is not None) and ref().attach_process())
+
+    def __getstate__(self):
+        # 写入器被传递至子进程：确保共享队列已创建
+        self.attach_process()
+        # 本地队列、缓冲区与各线程仅属于当前进程，不随实例传递至子进程
+        state = self.__dict__.copy()
+        state.update(log_queue=None, stop_event=None, worker=None, _attach_lock=None, _manager=None, _relay=None,
+                     _pid=None, _buffer=None, _flush_lock=None, _flush_stop=None, _flusher=None)
+        return state
+
+    def attach_process(self):
+        """在主进程中创建跨进程共享队列及转发线程（仅首次调用生效）"""
+        if self.mp_queue is not None or os.getpid() != self._owner_pid:
+            return
+        with self._attach_lock:
+            if self.mp_queue is not None:
+                return
+            # 先占位，避免创建 Manager 时触发的 fork 钩子重复进入
+            self.mp_queue = False
+            self._manager = mp.Manager()
+            self.mp_queue = self._manager.Queue()
+            self._relay = threading.Thread(target=self._relay_loop, daemon=True)
+            self._relay.start()
+
+    def _relay_loop(self):
+        """将子进程推送的日志批次转发至主进程本地队列"""
+        while True:
+            batch = self.mp_queue.get()
+            if batch is None:
+                break
+            self.log_queue.put(batch)
+
+    def _init_local_buffer(self):
+        """初始化当前进程的日志缓冲区及后台刷新线程"""
+        with _BUFFER_INIT_LOCK:
+            if self._pid == os.getpid():
+                return
+            self._buffer = deque()
+            self._flush_lock = threading.Lock()
+            self._flush_stop = threading.Event()
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+            # 进程退出前推送缓冲区中剩余的日志
+            util.Finalize(self, self.flush, exitpriority=10)
+            self._pid = os.getpid()
+
+    def _flush_loop(self):
+        while not self._flush_stop.wait(self.config.batch_interval):
+            self.flush()
+
+    def flush(self):
+        """将当前（子）进程缓冲区中的日志作为一个批次推送至共享队列"""
+        if self._pid != os.getpid():
+            return
+        with self._flush_lock:
+            size = len(self._buffer)
+            if not size:
+                return
+            batch = [self._buffer.popleft() for _ in range(size)]
+            self.mp_queue.put(batch)
 
     def enqueue(self, log_message: str):
-        """将日志消息放入队列"""
-        self.log_queue.put(log_message)
+        """主进程内直接放入本地队列；子进程放入本进程缓冲区，批量推送"""
+        if os.getpid() == self._owner_pid:
+            self.log_queue.put(log_message)
+            return
+        if self._pid != os.getpid():
+            self._init_local_buffer()
+        self._buffer.append(log_message)
+        if len(self._buffer) >= self.config.batch_size:
+            self.flush()
 
     def start(self):
-        """启动日志写入进程"""
-        self.worker_process = mp.Process(target=self._process_queue, daemon=True)
-        self.worker_process.start()
+        """启动日志写入线程"""
+        self.worker = threading.Thread(target=self._process_queue, daemon=True)
+        self.worker.start()
 
     def _process_queue(self):
-        """在独立的进程中处理队列中的日志并写入文件"""
+        """在写入线程中处理队列中的日志并写入文件"""
         current_date = date.today()
         rotation_index = 0
         current_log_file = self._get_log_filename(current_date, rotation_index)
         log_file = open(current_log_file, "a", encoding="utf-8")
 
         while True:
-            log_message = self.log_queue.get()
-
-            if date.today() != current_date:
-                log_file.close()
-                current_date = date.today()
-                rotation_index = 0
-                current_log_file = self._get_log_filename(current_date, rotation_index)
-                log_file = open(current_log_file, "a", encoding="utf-8")
-                self._cleanup_old_logs()
-            else:
-                if log_file.tell() >= self.config.rotation_size * 1024 * 1024:
+            item = self.log_queue.get()
+            if item is None:
+                break
+            # 主进程日志为单条消息，子进程日志为批次
+            batch = item if isinstance(item, list) else (item,)
+
+            for log_message in batch:
+                if date.today() != current_date:
                     log_file.close()
-                    rotation_index += 1
+                    current_date = date.today()
+                    rotation_index = 0
                     current_log_file = self._get_log_filename(current_date, rotation_index)
                     log_file = open(current_log_file, "a", encoding="utf-8")
-            log_file.write(log_message + "\n")
+                    self._cleanup_old_logs()
+                else:
+                    if log_file.tell() >= self.config.rotation_size * 1024 * 1024:
+                        log_file.close()
+                        rotation_index += 1
+                        current_log_file = self._get_log_filename(current_date, rotation_index)
+                        log_file = open(current_log_file, "a", encoding="utf-8")
+                log_file.write(log_message + "\n")
+                if self.config.to_console:
+                    print(eval(log_message)["timestamp"], eval(log_message)["message"])
             log_file.flush()
-            if self.config.to_console:
-                print(eval(log_message)["timestamp"], eval(log_message)["message"])
-
-            if self.stop_event.is_set() and self.log_queue.empty():
-                break
 
         log_file.close()
 
@@ -81,5 +181,16 @@ class MPLogWriter:
                     print(f"删除旧日志文件 {file_path} 时出错：{e}")
 
     def join(self):
-        """等待日志写入进程结束"""
-        self.worker_process.join()
+        """推送剩余日志并等待日志写入线程结束"""
+        self.flush()
+        if self._flush_stop is not None:
+            self._flush_stop.set()
+        if os.getpid() != self._owner_pid:
+            return
+        if self._relay is not None:
+            # 子进程日志均已转发后再结束写入线程
+            self.mp_queue.put(None)
+            self._relay.join()
+            self._manager.shutdown()
+        self.log_queue.put(None)
+        self.worker.join()
@@ -6,9 +6,11 @@ from .constant import LogLevel, LogFormat
 
 class LoggerConfig(BaseModel):
     log_path: Path = Field(default="./logs", description="日志保存路径")
-    log_level: LogLevel = Field(default="DEBUG", description="日志级别")
-    log_format: LogFormat = Field(default="json", description="日志文件类型")
+    log_level: LogLevel = Field(default=LogLevel.DEBUG, description="日志级别")
+    log_format: LogFormat = Field(default=LogFormat.JSON, description="日志文件类型")
     max_days: int = Field(default=7, description="日志保存天数")
     to_console: bool = Field(default=True, description="是否打印日志")
     rotation_size: float = Field(default=10, description="最大单一日志文件大小（MB)")
     multiprocess: bool = Field(default=True, description="是否开启多进程支持")
+    batch_size: int = Field(default=256, description="多进程模式下单批推送的最大日志条数")
+    batch_interval: float = Field(default=0.05, description="多进程模式下日志批量推送间隔（秒）")
@@ -12,7 +12,8 @@ class LogWriter(threading.Thread):
         super().__init__(daemon=True)
         self.config: LoggerConfig = config
 
-        self.log_queue = queue.Queue()
+        # 单进程内无需跨进程传递，使用无内部锁竞争的 SimpleQueue
+        self.log_queue = queue.SimpleQueue()
         self.stop_event = threading.Event()
 
     def enqueue(self, log_message: str):
@@ -16,6 +16,22 @@ def read_version() -> str:
         raise RuntimeError("Cannot find version in pyproject.toml")
     return m.group(1)
 
+
+def aot_extensions() -> list:
+    """
+    algolib 数值内核的预编译扩展（numba.pycc）。
+    需在已安装项目依赖的环境中构建（python -m build --no-isolation）；依赖缺失或编译环境不可用时跳过，
+    安装后的包自动退回 jit 版本。
+    """
+    try:
+        from logixbase.algolib._algolib_aot import build_cc
+        return [build_cc().distutils_extension()]
+    except Exception as e:
+        print(f"[setup] 跳过 algolib AOT 编译: {e}")
+        return []
+
+
 setup(
     version=read_version(),
+    ext_modules=aot_extensions(),
 )